@@ -0,0 +1,216 @@
+import statistics
+import tempfile
+import platform
+import argparse
+import pathlib
+import logging
+import psutil
+import time
+import copy
+import json
+import sys
+import os
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+FAKE_QPROP_DIRECTORY = pathlib.Path(__file__).resolve().parent / 'fake_qprop'
+
+sys.path.insert(0, str(ROOT))
+
+from components.RunConfiguration import RunConfiguration
+from components.MaximumTakeOffMassOptimizer import MaximumTakeOffMassOptimizer
+from components.OptimizerSettings import OptimizerSettings
+from components.utils.thrust_sources import ThrustSource
+from components.utils.simulation_engines import SimulationEngine
+from components.utils.search_methods import SearchMethod
+
+RESULTS_FORMAT_VERSION = 1
+
+EXAMPLE_CONFIGURATION = {
+    'propeller_file': str(ROOT / 'propeller_files' / 'apc14x10e'),
+    'motor_file': str(ROOT / 'motor_files' / 'CobraCM2217-26'),
+    'timestep_size': 0.1,
+    'mass_range': [0.1, 2.0],
+    'arithmetic_precision': None,
+    'takeoff_displacement': 100.0,
+    'setpoint_parameters': {
+        'velocity': None,
+        'voltage': 8.4,
+        'dbeta': None,
+        'current': None,
+        'torque': None,
+        'thrust': None,
+        'pele': None,
+        'rpm': None
+    },
+    'aerodynamic_forces': {
+        'fluid_density': 1.225,
+        'true_airspeed': None,
+        'drag_coefficient': 0.1,
+        'reference_area': 0.075,
+        'acceleration_gravity': 9.81,
+        'lift_coefficient': 1.0
+    }
+}
+
+SCENARIOS = {
+    f'{thrust_source.value}-{simulation_engine.value}-{search_method.value}-dt={timestep_size}': (timestep_size, thrust_source, simulation_engine, search_method)
+    for thrust_source, simulation_engine, search_method, timestep_sizes in [
+        (ThrustSource.CACHE, SimulationEngine.PROCESS, SearchMethod.GRID, (0.1, 0.01)),
+        (ThrustSource.CACHE, SimulationEngine.VECTORIZED, SearchMethod.GRID, (0.1,)),
+        (ThrustSource.SURROGATE, SimulationEngine.PROCESS, SearchMethod.GRID, (0.1, 0.01)),
+        (ThrustSource.SURROGATE, SimulationEngine.VECTORIZED, SearchMethod.GRID, (0.1, 0.01)),
+        (ThrustSource.TABLE, SimulationEngine.PROCESS, SearchMethod.GRID, (0.1, 0.01, 0.001)),
+        (ThrustSource.TABLE, SimulationEngine.VECTORIZED, SearchMethod.GRID, (0.1, 0.01, 0.001)),
+        (ThrustSource.TABLE, SimulationEngine.VECTORIZED, SearchMethod.ROOT, (0.1, 0.01, 0.001))
+    ]
+    for timestep_size in timestep_sizes
+}
+
+def get_cpu_time(process: psutil.Process) -> float:
+    cpu_time = 0.0
+    for measured_process in [process] + process.children(recursive=True):
+        try:
+            cpu_times = measured_process.cpu_times()
+        except psutil.NoSuchProcess:
+            continue
+        cpu_time += cpu_times.user + cpu_times.system + cpu_times.children_user + cpu_times.children_system
+    return cpu_time
+
+def get_call_count(call_log_path: pathlib.Path) -> int:
+    return call_log_path.stat().st_size if call_log_path.exists() else 0
+
+def run_scenario(scenario: str, n_workers: int, masses_per_epoch: int, call_log_path: pathlib.Path) -> dict:
+    timestep_size, thrust_source, simulation_engine, search_method = SCENARIOS[scenario]
+    run_configuration = RunConfiguration(pathlib.Path(f'{scenario}.json'), {**copy.deepcopy(EXAMPLE_CONFIGURATION), 'timestep_size': timestep_size}, scenario)
+
+    optimizer = MaximumTakeOffMassOptimizer(
+        n_workers,
+        OptimizerSettings(
+            thrust_source=thrust_source,
+            simulation_engine=simulation_engine,
+            masses_per_epoch=masses_per_epoch,
+            search_method=search_method,
+            refresh_rate=0,
+            plot_results=False
+        )
+    )
+    try:
+        process = psutil.Process()
+        start_calls = get_call_count(call_log_path)
+        start_cpu_time = get_cpu_time(process)
+        start_time = time.perf_counter()
+        result_state, optimal_dynamics_model = optimizer.run(run_configuration)
+        wall_time = time.perf_counter() - start_time
+        cpu_time = get_cpu_time(process) - start_cpu_time
+        qprop_calls = get_call_count(call_log_path) - start_calls
+    finally:
+        optimizer.close()
+
+    return {
+        'scenario': scenario,
+        'result': result_state.name,
+        'mtom': None if optimal_dynamics_model is None else round(float(optimal_dynamics_model.mass), run_configuration.arithmetic_precision),
+        'wall_time': wall_time,
+        'cpu_time': cpu_time,
+        'cpu_utilization': cpu_time / wall_time,
+        'qprop_calls': qprop_calls,
+        'epochs': optimizer.n_epochs
+    }
+
+def get_summary(runs: list[dict]) -> dict:
+    return {
+        'result': runs[0]['result'],
+        'mtom': runs[0]['mtom'],
+        'wall_time': statistics.median(run['wall_time'] for run in runs),
+        'cpu_time': statistics.median(run['cpu_time'] for run in runs),
+        'cpu_utilization': statistics.median(run['cpu_utilization'] for run in runs),
+        'qprop_calls': max(run['qprop_calls'] for run in runs),
+        'epochs': max(run['epochs'] for run in runs)
+    }
+
+def get_regressions(summaries: dict[str, dict], baseline_summaries: dict[str, dict], tolerance: float) -> list[str]:
+    regressions = list()
+    for scenario, summary in summaries.items():
+        baseline_summary = baseline_summaries.get(scenario)
+        if baseline_summary is None:
+            continue
+        if summary['wall_time'] > (1+tolerance) * baseline_summary['wall_time']:
+            regressions.append(f'{scenario}: wall time {summary["wall_time"]:.3f} s exceeds baseline {baseline_summary["wall_time"]:.3f} s by more than {100*tolerance:.0f}%')
+        for counter in ('qprop_calls', 'epochs'):
+            if summary[counter] > baseline_summary[counter]:
+                regressions.append(f'{scenario}: {counter} {summary[counter]} exceeds baseline {baseline_summary[counter]}')
+        if summary['mtom'] != baseline_summary['mtom']:
+            regressions.append(f'{scenario}: MTOM {summary["mtom"]} differs from baseline {baseline_summary["mtom"]}')
+    return regressions
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
+    argparser = argparse.ArgumentParser(add_help=False)
+    argparser.add_argument('-s', '--scenarios', type=str, nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS), help='Scenarios benchmarked')
+    argparser.add_argument('-r', '--repeats', type=int, default=3, help='Amount of optimizer runs timed per scenario')
+    argparser.add_argument('-l', '--latency', type=float, default=0.0, help='Latency (s) added to every call of the fake QPROP executable')
+    argparser.add_argument('-w', '--workers', type=int, default=3, help='Amount of worker processes of the process engine')
+    argparser.add_argument('-m', '--masses-per-epoch', type=int, default=64, help='Amount of masses simulated per epoch by the vectorized engine')
+    argparser.add_argument('-o', '--output', type=str, default='benchmark_results.json', help='Path to the json file the benchmark results are written to')
+    argparser.add_argument('--baseline', type=str, default=None, help='Path to a json file of earlier benchmark results to check for regressions against')
+    argparser.add_argument('--tolerance', type=float, default=0.25, help='Relative increase of the median wall time over the baseline tolerated before reporting a regression')
+    args = argparser.parse_args()
+
+    if args.repeats < 1:
+        raise ValueError(f'number of repeats ({args.repeats}) must be at least 1')
+
+    baseline_summaries = None
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as baseline_file:
+            baseline_data = json.load(baseline_file)
+        if baseline_data.get('format_version') != RESULTS_FORMAT_VERSION:
+            raise ValueError(f'baseline "{args.baseline}" has format version {baseline_data.get("format_version")}, expected {RESULTS_FORMAT_VERSION}')
+        baseline_summaries = baseline_data['summaries']
+
+    os.environ['PATH'] = f'{FAKE_QPROP_DIRECTORY}{os.pathsep}{os.environ.get("PATH", "")}'
+    os.environ['FAKE_QPROP_LATENCY'] = str(args.latency)
+
+    runs = list()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        call_log_path = pathlib.Path(temporary_directory) / 'qprop_calls'
+        os.environ['FAKE_QPROP_CALL_LOG'] = str(call_log_path)
+
+        for scenario in args.scenarios:
+            for repeat in range(args.repeats):
+                run = run_scenario(scenario, args.workers, args.masses_per_epoch, call_log_path)
+                runs.append({**run, 'repeat': repeat})
+                logging.info(f'SCENARIO = {scenario} | REPEAT = {repeat} | WALL_TIME = {run["wall_time"]:.3f} s | CPU_TIME = {run["cpu_time"]:.3f} s | CPU_UTILIZATION = {run["cpu_utilization"]:.2f} | QPROP_CALLS = {run["qprop_calls"]} | EPOCHS = {run["epochs"]} | MTOM = {run["mtom"]} kg')
+
+    summaries = {scenario: get_summary([run for run in runs if run['scenario'] == scenario]) for scenario in args.scenarios}
+    for scenario, summary in summaries.items():
+        logging.info(f'SCENARIO = {scenario} | MEDIAN_WALL_TIME = {summary["wall_time"]:.3f} s | QPROP_CALLS = {summary["qprop_calls"]} | EPOCHS = {summary["epochs"]} | MTOM = {summary["mtom"]} kg')
+
+    with open(args.output, 'w') as output_file:
+        json.dump({
+            'format_version': RESULTS_FORMAT_VERSION,
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'logical_cores': psutil.cpu_count(logical=True),
+                'physical_cores': psutil.cpu_count(logical=False),
+                'workers': args.workers,
+                'masses_per_epoch': args.masses_per_epoch,
+                'latency': args.latency,
+                'repeats': args.repeats
+            },
+            'summaries': summaries,
+            'runs': runs
+        }, output_file, indent=4)
+    logging.info(f'BENCHMARK_RESULTS = {args.output}')
+
+    if baseline_summaries is not None:
+        regressions = get_regressions(summaries, baseline_summaries, args.tolerance)
+        for regression in regressions:
+            logging.error(f'Regression in {regression}')
+        if regressions:
+            sys.exit(1)
+        logging.info(f'No regressions against baseline "{args.baseline}"')
+
+if __name__ == '__main__':
+    main()
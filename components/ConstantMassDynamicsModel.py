@@ -1,4 +1,3 @@
-import matplotlib.pyplot
 import numpy
 
 class ConstantMassDynamicsModel:
@@ -10,8 +9,12 @@ class ConstantMassDynamicsModel:
     position: numpy.ndarray[numpy.float64]
     thrust: numpy.ndarray[numpy.float64]
     drag: numpy.ndarray[numpy.float64]
+    takeoff_located: bool
+    decided_early: bool
+    decided_success: bool
+    summary_only: bool
     
-    def __init__(self, mass: numpy.float64, stall_velocity: numpy.float64, time: list[numpy.float64], acceleration: list[numpy.float64], velocity: list[numpy.float64], position: list[numpy.float64], thrust: list[numpy.float64], drag: list[numpy.float64]) -> None:
+    def __init__(self, mass: numpy.float64, stall_velocity: numpy.float64, time: list[numpy.float64], acceleration: list[numpy.float64], velocity: list[numpy.float64], position: list[numpy.float64], thrust: list[numpy.float64], drag: list[numpy.float64], takeoff_located: bool = False, decided_early: bool = False, decided_success: bool = False, summary_only: bool = False) -> None:
         self.mass = mass
         self.stall_velocity = stall_velocity
         self.time = numpy.array(time, dtype=numpy.float64)
@@ -20,72 +23,26 @@ class ConstantMassDynamicsModel:
         self.position = numpy.array(position, dtype=numpy.float64)
         self.thrust = numpy.array(thrust, dtype=numpy.float64)
         self.drag = numpy.array(drag, dtype=numpy.float64)
+        self.takeoff_located = takeoff_located
+        self.decided_early = decided_early
+        self.decided_success = decided_success
+        self.summary_only = summary_only
     
     def get_position_takeoff(self) -> numpy.float64:
         return self.position[-1]
     
     def get_velocity_takeoff(self) -> numpy.float64:
-        return self.velocity[-2]
+        return self.velocity[-1] if self.takeoff_located else self.velocity[-2]
     
-    def plot_model(self, name: str, dynamics_models: dict[numpy.float64, object]) -> None:
-        time = self.time[:-1]
-        acceleration = self.acceleration
-        velocity = self.velocity[:-1]
-        position = self.position[:-1]
-        thrust = self.thrust
-        drag = self.drag
+    def get_takeoff_margin(self, takeoff_displacement: numpy.float64) -> numpy.float64:
+        if self.takeoff_located or self.position.size < 2:
+            return self.velocity[-1] - self.stall_velocity
         
-        performance_characteristics = list()
-        for dynamics_model in dynamics_models.values():
-            performance_characteristics.append((dynamics_model.mass, dynamics_model.stall_velocity, dynamics_model.get_velocity_takeoff()))
-        
-        performance_characteristics.sort(key=lambda e: e[0])
-        masses, stall_velocities, velocities = zip(*performance_characteristics)
-        stall_velocities = numpy.array(stall_velocities, dtype=numpy.float64)
-        velocities = numpy.array(velocities, dtype=numpy.float64)
-        masses = numpy.array(masses, dtype=numpy.float64)
-        
-        _, axes = matplotlib.pyplot.subplots(3, 2, figsize=(10, 8))
-        
-        axes[0, 0].plot(time, position, label='Position', color='black')
-        axes[0, 0].set_title('Position vs Time')
-        axes[0, 0].set_xlabel('Time (s)')
-        axes[0, 0].set_ylabel('Position (m)')
-        axes[0, 0].grid(True)
-
-        axes[0, 1].plot(time, velocity, label='Velocity', color='black')
-        axes[0, 1].set_title('Velocity vs Time')
-        axes[0, 1].set_xlabel('Time (s)')
-        axes[0, 1].set_ylabel('Velocity (m/s)')
-        axes[0, 1].grid(True)
-
-        axes[1, 0].plot(time, acceleration, label='Acceleration', color='black')
-        axes[1, 0].set_title('Acceleration vs Time')
-        axes[1, 0].set_xlabel('Time (s)')
-        axes[1, 0].set_ylabel('Acceleration (m/s^2)')
-        axes[1, 0].grid(True)
-
-        axes[1, 1].plot(time, thrust, label='Thrust', color='black')
-        axes[1, 1].set_title('Thrust vs Time')
-        axes[1, 1].set_xlabel('Time (s)')
-        axes[1, 1].set_ylabel('Thrust (N)')
-        axes[1, 1].grid(True)
-
-        axes[2, 0].plot(time, drag, label='Drag', color='black')
-        axes[2, 0].set_title('Drag vs Time')
-        axes[2, 0].set_xlabel('Time (s)')
-        axes[2, 0].set_ylabel('Drag (N)')
-        axes[2, 0].grid(True)
+        takeoff_fraction = numpy.clip((takeoff_displacement-self.position[-2]) / (self.position[-1]-self.position[-2]), 0, 1)
+        return self.velocity[-2] + takeoff_fraction * (self.velocity[-1]-self.velocity[-2]) - self.stall_velocity
+    
+    def is_takeoff_successful(self) -> bool:
+        if self.decided_early:
+            return self.decided_success
+        return bool(self.velocity[-1] > self.stall_velocity)
 
-        axes[2, 1].plot(masses, velocities, label='Final Velocity', color='black')
-        axes[2, 1].plot(masses, stall_velocities, label='Stall Velocity', color='red', linestyle='--')
-        axes[2, 1].set_title('Velocity vs Mass')
-        axes[2, 1].set_xlabel('Mass (kg)')
-        axes[2, 1].set_ylabel('Velocity (m/s)')
-        axes[2, 1].set_xscale('log')
-        axes[2, 1].grid(True)
-        axes[2, 1].legend()
-        
-        matplotlib.pyplot.tight_layout()
-        matplotlib.pyplot.savefig(f'{name}.png', dpi=300)
-        matplotlib.pyplot.close()
@@ -1,91 +1,110 @@
-import multiprocessing.sharedctypes
-import multiprocessing
+from typing import Callable
 import numpy
-import subprocess
-import io
 
 from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.DynamicsIntegrator import DynamicsIntegrator
 from components.utils.process_statuses import ProcessStatus
-from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+from components.utils.voltage_profile_variables import VoltageProfileVariable
+from components.WorkerTelemetry import WorkerTelemetry
+from components.TrajectoryBuffer import TrajectoryBuffer
+from components.PhaseProfiler import PhaseProfiler
 
 class ConstantMassDynamicsSimulation:
+    @classmethod
+    def set_status(cls, telemetry: WorkerTelemetry, worker_index: int, status: ProcessStatus) -> None:
+        telemetry.set_status(worker_index, status)
+        PhaseProfiler.enter(status)
+    
     @classmethod
     def simulate_dynamics_given_mass(
         cls,
         run_configuration: RunConfiguration,
         mass: numpy.float64,
-        run_results: multiprocessing.Queue,
-        status_counter: multiprocessing.sharedctypes.Synchronized,
-        position_counter: multiprocessing.sharedctypes.Synchronized,
-        velocity_counter: multiprocessing.sharedctypes.Synchronized,
-        acceleration_counter: multiprocessing.sharedctypes.Synchronized,
-        time_counter: multiprocessing.sharedctypes.Synchronized,
-        thrust_counter: multiprocessing.sharedctypes.Synchronized,
-        drag_counter: multiprocessing.sharedctypes.Synchronized
-    ) -> None:
-        duration = [numpy.float64(0.0)]
-        acceleration = list()
-        velocity = [run_configuration.setpoint_velocity]
-        position = [numpy.float64(0.0)]
-        thrust = list()
-        drag = list()
+        thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid,
+        terminate_early: bool,
+        is_cancelled: Callable[[], bool],
+        telemetry: WorkerTelemetry,
+        worker_index: int,
+        trajectory: TrajectoryBuffer,
+        summary_only: bool = False
+    ) -> tuple[str, int, bool, numpy.float64, numpy.float64, bool, bool, bool] | None:
+        duration = numpy.float64(0.0)
+        velocity = run_configuration.setpoint_velocity
+        position = numpy.float64(0.0)
+        trajectory.reset(duration, velocity, position, summary_only)
         
         stall_velocity = run_configuration.get_stall_velocity(mass)
         
+        if isinstance(thrust_model, ThrustGrid):
+            thrust_function = lambda velocity, duration: thrust_model.get_thrust(run_configuration, velocity, duration)
+        else:
+            thrust_function = lambda velocity, duration: thrust_model.get_thrust(run_configuration, velocity)
+        terminate_early = terminate_early and run_configuration.voltage_profile_variable != VoltageProfileVariable.TIME
+        locates_takeoff = DynamicsIntegrator.locates_takeoff(run_configuration)
+        timestep_size = run_configuration.timestep_size
+        decided_early = False
+        decided_success = False
+        
+        prefetches = isinstance(thrust_model, ThrustCache) and thrust_model.prefetch_depth > 0
+        stage_fractions = DynamicsIntegrator.get_stage_fractions(run_configuration)
+        previous_mean_acceleration = None
+        start_forces = None
+        
         while True:
-            with status_counter.get_lock():
-                status_counter.value = ProcessStatus.EXECUTING_QPROP.value
+            if is_cancelled():
+                return None
             
-            completed_process = subprocess.run(run_configuration.get_run_string(velocity[-1]), capture_output=True, text=True)
+            cls.set_status(telemetry, worker_index, ProcessStatus.EXECUTING_QPROP)
             
-            with status_counter.get_lock():
-                status_counter.value = ProcessStatus.EXTRACTING_DATA.value
+            step_position, step_velocity, step_acceleration, step_thrust, step_drag, step_error, end_forces = DynamicsIntegrator.step(run_configuration, thrust_function, mass, position, velocity, duration, timestep_size, start_forces)
             
-            data_stream = io.StringIO(completed_process.stdout)
-            data = numpy.loadtxt(data_stream, skiprows=17)
+            cls.set_status(telemetry, worker_index, ProcessStatus.ITERATING_STATE)
             
-            thrust.append(data[:, 3][0])
-            drag.append(run_configuration.get_drag_force(velocity[-1]))
+            if terminate_early:
+                success_decided, failure_decided = DynamicsIntegrator.get_decided_outcome(velocity, step_acceleration, stall_velocity)
+                if success_decided or failure_decided:
+                    decided_early = True
+                    decided_success = bool(success_decided)
+                    cls.set_status(telemetry, worker_index, ProcessStatus.SUCCESS_TAKEOFF if decided_success else ProcessStatus.FAILED_VELOCITY)
+                    break
             
-            with status_counter.get_lock():
-                status_counter.value = ProcessStatus.ITERATING_STATE.value
+            if step_error > 1:
+                start_forces = (step_acceleration, step_thrust, step_drag)
+                timestep_size = DynamicsIntegrator.get_next_timestep_size(run_configuration, timestep_size, step_error)
+                continue
             
-            acceleration.append((thrust[-1]-drag[-1]) / mass)
-            velocity.append(velocity[-1] + acceleration[-1] * run_configuration.timestep_size)
-            position.append(position[-1] + velocity[-1] * run_configuration.timestep_size)
-            duration.append(duration[-1] + run_configuration.timestep_size)
+            step_duration = duration + timestep_size
+            takeoff_reached = step_position > run_configuration.takeoff_displacement
+            if takeoff_reached and locates_takeoff:
+                end_acceleration, _, _ = DynamicsIntegrator.get_acceleration(run_configuration, thrust_function, mass, step_velocity, step_duration) if end_forces is None else end_forces
+                takeoff_fraction, step_velocity = DynamicsIntegrator.locate_takeoff(run_configuration, timestep_size, position, velocity, step_acceleration, step_position, step_velocity, end_acceleration)
+                step_position = run_configuration.takeoff_displacement
+                step_duration = duration + takeoff_fraction * timestep_size
             
-            with status_counter.get_lock():
-                status_counter.value = ProcessStatus.UPDATING_COUNTS.value
-
-            with position_counter.get_lock():
-                with velocity_counter.get_lock():
-                    with acceleration_counter.get_lock():
-                        with time_counter.get_lock():
-                            with thrust_counter.get_lock():
-                                with drag_counter.get_lock():
-                                    position_counter.value = position[-1]
-                                    velocity_counter.value = velocity[-1]
-                                    acceleration_counter.value = acceleration[-1]
-                                    time_counter.value = duration[-1]
-                                    thrust_counter.value = thrust[-1]
-                                    drag_counter.value = drag[-1]
+            trajectory.append(step_duration, step_velocity, step_position, step_acceleration, step_thrust, step_drag)
+            mean_acceleration = (step_velocity - velocity) / timestep_size
+            duration = step_duration
+            velocity = step_velocity
+            position = step_position
+            start_forces = end_forces
+            
+            timestep_size = DynamicsIntegrator.get_next_timestep_size(run_configuration, timestep_size, step_error)
+            
+            if prefetches and not takeoff_reached:
+                predicted_acceleration = mean_acceleration if previous_mean_acceleration is None else 1.5*mean_acceleration - 0.5*previous_mean_acceleration
+                previous_mean_acceleration = mean_acceleration
+                thrust_model.prefetch(run_configuration, [velocity + fraction * timestep_size * predicted_acceleration for fraction in stage_fractions])
             
-            with status_counter.get_lock():
-                status_counter.value = ProcessStatus.CHECKING_LIMITS.value
+            cls.set_status(telemetry, worker_index, ProcessStatus.UPDATING_COUNTS)
+            telemetry.update(worker_index, duration, position, velocity, step_acceleration, step_thrust, step_drag)
+            cls.set_status(telemetry, worker_index, ProcessStatus.CHECKING_LIMITS)
             
-            if position[-1] > run_configuration.takeoff_displacement:
-                with status_counter.get_lock():
-                    status_counter.value = ProcessStatus.FAILED_VELOCITY.value if velocity[-1] <= stall_velocity else ProcessStatus.SUCCESS_TAKEOFF.value
+            if takeoff_reached:
+                cls.set_status(telemetry, worker_index, ProcessStatus.FAILED_VELOCITY if velocity <= stall_velocity else ProcessStatus.SUCCESS_TAKEOFF)
                 break
         
-        run_results.put(ConstantMassDynamicsModel(
-            mass=mass,
-            stall_velocity=stall_velocity,
-            time=duration,
-            acceleration=acceleration,
-            velocity=velocity,
-            position=position,
-            thrust=thrust,
-            drag=drag
-        ))
+        return trajectory.get_handle(mass, stall_velocity, locates_takeoff and not decided_early, decided_early, decided_success)
@@ -0,0 +1,143 @@
+from typing import Callable
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.utils.integration_methods import IntegrationMethod
+
+class DynamicsIntegrator:
+    SAFETY_FACTOR = 0.9
+    MINIMUM_STEP_SCALE = 0.2
+    MAXIMUM_STEP_SCALE = 5.0
+    CROSSING_BISECTIONS = 60
+
+    DORMAND_PRINCE_NODES = (
+        (),
+        (1/5,),
+        (3/40, 9/40),
+        (44/45, -56/15, 32/9),
+        (19372/6561, -25360/2187, 64448/6561, -212/729),
+        (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+        (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84)
+    )
+    DORMAND_PRINCE_WEIGHTS = (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0)
+    DORMAND_PRINCE_ERROR_WEIGHTS = (35/384-5179/57600, 0.0, 500/1113-7571/16695, 125/192-393/640, -2187/6784+92097/339200, 11/84-187/2100, -1/40)
+
+    @classmethod
+    def get_acceleration(cls, run_configuration: RunConfiguration, thrust_function: Callable, mass: numpy.ndarray[numpy.float64], velocity: numpy.ndarray[numpy.float64], duration: numpy.ndarray[numpy.float64]) -> tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]]:
+        thrust = thrust_function(velocity, duration)
+        drag = run_configuration.get_drag_force(velocity) + numpy.zeros_like(velocity)
+        return (thrust-drag) / mass, thrust, drag
+
+    @classmethod
+    def step(
+        cls,
+        run_configuration: RunConfiguration,
+        thrust_function: Callable,
+        mass: numpy.ndarray[numpy.float64],
+        position: numpy.ndarray[numpy.float64],
+        velocity: numpy.ndarray[numpy.float64],
+        duration: numpy.ndarray[numpy.float64],
+        timestep_size: numpy.ndarray[numpy.float64],
+        start_forces: tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]] | None = None
+    ) -> tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]] | None]:
+        acceleration, thrust, drag = cls.get_acceleration(run_configuration, thrust_function, mass, velocity, duration) if start_forces is None else start_forces
+
+        if run_configuration.integration_method == IntegrationMethod.EULER:
+            step_velocity = velocity + acceleration * timestep_size
+            step_position = position + step_velocity * timestep_size
+            return step_position, step_velocity, acceleration, thrust, drag, numpy.zeros_like(velocity), None
+
+        if run_configuration.integration_method == IntegrationMethod.RK4:
+            acceleration_2, _, _ = cls.get_acceleration(run_configuration, thrust_function, mass, velocity + 0.5 * timestep_size * acceleration, duration + 0.5 * timestep_size)
+            acceleration_3, _, _ = cls.get_acceleration(run_configuration, thrust_function, mass, velocity + 0.5 * timestep_size * acceleration_2, duration + 0.5 * timestep_size)
+            acceleration_4, _, _ = cls.get_acceleration(run_configuration, thrust_function, mass, velocity + timestep_size * acceleration_3, duration + timestep_size)
+
+            step_velocity = velocity + timestep_size / 6 * (acceleration + 2 * acceleration_2 + 2 * acceleration_3 + acceleration_4)
+            step_position = position + timestep_size * velocity + timestep_size**2 / 6 * (acceleration + acceleration_2 + acceleration_3)
+            return step_position, step_velocity, acceleration, thrust, drag, numpy.zeros_like(velocity), None
+
+        stage_accelerations = [acceleration]
+        stage_velocities = [velocity]
+        for nodes in cls.DORMAND_PRINCE_NODES[1:]:
+            stage_velocity = velocity + timestep_size * sum(node * stage_acceleration for node, stage_acceleration in zip(nodes, stage_accelerations))
+            stage_acceleration, stage_thrust, stage_drag = cls.get_acceleration(run_configuration, thrust_function, mass, stage_velocity, duration + sum(nodes) * timestep_size)
+            stage_velocities.append(stage_velocity)
+            stage_accelerations.append(stage_acceleration)
+
+        step_velocity = velocity + timestep_size * sum(weight * stage_acceleration for weight, stage_acceleration in zip(cls.DORMAND_PRINCE_WEIGHTS, stage_accelerations))
+        step_position = position + timestep_size * sum(weight * stage_velocity for weight, stage_velocity in zip(cls.DORMAND_PRINCE_WEIGHTS, stage_velocities))
+
+        velocity_error = timestep_size * sum(weight * stage_acceleration for weight, stage_acceleration in zip(cls.DORMAND_PRINCE_ERROR_WEIGHTS, stage_accelerations))
+        position_error = timestep_size * sum(weight * stage_velocity for weight, stage_velocity in zip(cls.DORMAND_PRINCE_ERROR_WEIGHTS, stage_velocities))
+
+        tolerance = run_configuration.integration_tolerance
+        velocity_scale = tolerance + tolerance * numpy.maximum(numpy.abs(velocity), numpy.abs(step_velocity))
+        position_scale = tolerance + tolerance * numpy.maximum(numpy.abs(position), numpy.abs(step_position))
+        error = numpy.maximum(numpy.abs(velocity_error) / velocity_scale, numpy.abs(position_error) / position_scale)
+
+        return step_position, step_velocity, acceleration, thrust, drag, error, (stage_acceleration, stage_thrust, stage_drag)
+
+    @classmethod
+    def get_next_timestep_size(cls, run_configuration: RunConfiguration, timestep_size: numpy.ndarray[numpy.float64], error: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        if run_configuration.integration_method != IntegrationMethod.RK45:
+            return timestep_size
+
+        with numpy.errstate(divide='ignore'):
+            scale = cls.SAFETY_FACTOR * numpy.power(error, -1/5)
+        return timestep_size * numpy.clip(scale, cls.MINIMUM_STEP_SCALE, cls.MAXIMUM_STEP_SCALE)
+
+    @classmethod
+    def get_decided_outcome(cls, velocity: numpy.ndarray[numpy.float64], acceleration: numpy.ndarray[numpy.float64], stall_velocity: numpy.ndarray[numpy.float64]) -> tuple[numpy.ndarray[numpy.bool_], numpy.ndarray[numpy.bool_]]:
+        return (velocity > stall_velocity) & (acceleration >= 0), (velocity <= stall_velocity) & (acceleration <= 0)
+
+    @classmethod
+    def get_order(cls, run_configuration: RunConfiguration) -> int:
+        if run_configuration.integration_method == IntegrationMethod.EULER:
+            return 1
+        if run_configuration.integration_method == IntegrationMethod.RK4:
+            return 4
+        return 5
+
+    @classmethod
+    def get_stage_fractions(cls, run_configuration: RunConfiguration) -> tuple[float, ...]:
+        if run_configuration.integration_method == IntegrationMethod.EULER:
+            return (0.0, 1.0)
+        if run_configuration.integration_method == IntegrationMethod.RK4:
+            return (0.0, 0.5, 1.0)
+        return tuple(sorted({sum(nodes) for nodes in cls.DORMAND_PRINCE_NODES}))
+
+    @classmethod
+    def locates_takeoff(cls, run_configuration: RunConfiguration) -> bool:
+        return run_configuration.integration_method != IntegrationMethod.EULER
+
+    @classmethod
+    def get_hermite_interpolation(cls, fraction: numpy.ndarray[numpy.float64], value_0: numpy.ndarray[numpy.float64], slope_0: numpy.ndarray[numpy.float64], value_1: numpy.ndarray[numpy.float64], slope_1: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        return (
+            (2*fraction**3 - 3*fraction**2 + 1) * value_0
+            + (fraction**3 - 2*fraction**2 + fraction) * slope_0
+            + (-2*fraction**3 + 3*fraction**2) * value_1
+            + (fraction**3 - fraction**2) * slope_1
+        )
+
+    @classmethod
+    def locate_takeoff(
+        cls,
+        run_configuration: RunConfiguration,
+        timestep_size: numpy.ndarray[numpy.float64],
+        position_0: numpy.ndarray[numpy.float64],
+        velocity_0: numpy.ndarray[numpy.float64],
+        acceleration_0: numpy.ndarray[numpy.float64],
+        position_1: numpy.ndarray[numpy.float64],
+        velocity_1: numpy.ndarray[numpy.float64],
+        acceleration_1: numpy.ndarray[numpy.float64]
+    ) -> tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]]:
+        lower_fraction = numpy.zeros_like(position_0)
+        upper_fraction = numpy.ones_like(position_0)
+        for _ in range(cls.CROSSING_BISECTIONS):
+            fraction = (lower_fraction+upper_fraction) / 2
+            crossed = cls.get_hermite_interpolation(fraction, position_0, timestep_size * velocity_0, position_1, timestep_size * velocity_1) > run_configuration.takeoff_displacement
+            upper_fraction = numpy.where(crossed, fraction, upper_fraction)
+            lower_fraction = numpy.where(crossed, lower_fraction, fraction)
+
+        fraction = (lower_fraction+upper_fraction) / 2
+        return fraction, cls.get_hermite_interpolation(fraction, velocity_0, timestep_size * acceleration_0, velocity_1, timestep_size * acceleration_1)
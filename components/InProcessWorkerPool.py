@@ -0,0 +1,96 @@
+import collections
+import time
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.ConstantMassDynamicsSimulation import ConstantMassDynamicsSimulation
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+from components.WorkerTelemetry import WorkerTelemetry
+from components.TrajectoryBuffer import TrajectoryBuffer
+from components.PhaseProfiler import PhaseProfiler
+from components.utils.process_statuses import ProcessStatus
+from components.utils.optimizer_phases import OptimizerPhase
+
+class InProcessWorkerPool:
+    n_workers: int
+    epoch_id: int
+    telemetry: WorkerTelemetry
+
+    run_configuration: RunConfiguration | None
+    thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid | None
+    terminate_early: bool
+    summary_only: bool
+    tasks: collections.deque[tuple[int, int, numpy.float64]]
+    cancelled_epochs: list[int]
+    trajectory: TrajectoryBuffer
+
+    def __init__(self, n_workers: int) -> None:
+        if n_workers < 1:
+            raise ValueError(f'number of workers ({n_workers}) must be at least 1')
+
+        self.n_workers = n_workers
+        self.epoch_id = 0
+        self.telemetry = WorkerTelemetry(self.n_workers)
+
+        self.run_configuration = None
+        self.thrust_model = None
+        self.terminate_early = False
+        self.summary_only = False
+        self.tasks = collections.deque()
+        self.cancelled_epochs = [-1] * self.n_workers
+        self.trajectory = TrajectoryBuffer()
+
+    def configure(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, terminate_early: bool, summary_only: bool = False, profile: bool = False) -> None:
+        self.run_configuration = run_configuration
+        self.thrust_model = thrust_model
+        self.terminate_early = terminate_early
+        self.summary_only = summary_only
+
+    def submit(self, MASS_SPACE: numpy.ndarray[numpy.float64]) -> int:
+        if len(MASS_SPACE) > self.n_workers:
+            raise ValueError(f'number of masses ({len(MASS_SPACE)}) cannot exceed the number of workers ({self.n_workers})')
+
+        self.epoch_id += 1
+        for i, mass in enumerate(MASS_SPACE):
+            self.tasks.append((self.epoch_id, i, mass))
+
+        return self.epoch_id
+
+    def cancel(self, epoch_id: int, worker_index: int) -> None:
+        self.cancelled_epochs[worker_index] = epoch_id
+
+    def get_result(self, timeout: float) -> tuple[int, int, ConstantMassDynamicsModel | None] | None:
+        if timeout <= 0:
+            return None
+        if not self.tasks:
+            time.sleep(timeout)
+            return None
+
+        epoch_id, worker_index, mass = self.tasks.popleft()
+        self.telemetry.reset(worker_index, ProcessStatus.FORKING_PROCESS)
+        previous_phase = PhaseProfiler.enter(ProcessStatus.FORKING_PROCESS)
+
+        trajectory_handle = ConstantMassDynamicsSimulation.simulate_dynamics_given_mass(
+            self.run_configuration,
+            mass,
+            self.thrust_model,
+            self.terminate_early,
+            lambda: self.cancelled_epochs[worker_index] == epoch_id,
+            self.telemetry,
+            worker_index,
+            self.trajectory,
+            self.summary_only
+        )
+
+        PhaseProfiler.enter(OptimizerPhase.COLLECTING_RESULTS)
+        dynamics_model = None if trajectory_handle is None else TrajectoryBuffer.get_model(self.trajectory.shared_memory, trajectory_handle)
+        PhaseProfiler.leave(previous_phase)
+
+        return epoch_id, worker_index, dynamics_model
+
+    def close(self) -> None:
+        self.trajectory.close()
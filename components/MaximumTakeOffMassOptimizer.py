@@ -1,235 +1,666 @@
-import multiprocessing.sharedctypes
-import multiprocessing
 import logging
-import ctypes
 import numpy
-import tqdm
+import time
 
 from components.RunConfiguration import RunConfiguration
 from components.utils.process_statuses import ProcessStatus
-from components.ConstantMassDynamicsSimulation import ConstantMassDynamicsSimulation
+from components.ThrustCache import ThrustCache, ThrustCacheManager
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.ThrustTableStore import ThrustTableStore
+from components.OptimizerSettings import OptimizerSettings
+from components.OptimizationCheckpoint import OptimizationCheckpoint
+from components.ResultHistory import ResultHistory
+from components.ResultPlotter import ResultPlotter
+from components.PhaseProfiler import PhaseProfiler
+from components.VectorizedDynamicsSimulation import VectorizedDynamicsSimulation
+from components.DynamicsIntegrator import DynamicsIntegrator
+from components.UncertaintyAnalysis import UncertaintyAnalysis
+from components.WorkerPool import WorkerPool
+from components.WorkerTelemetry import WorkerTelemetry
+from components.SocketWorkerPool import SocketWorkerPool
+from components.InProcessWorkerPool import InProcessWorkerPool
+from components.utils.worker_transports import WorkerTransport
+from components.utils.simulation_engines import SimulationEngine
+from components.utils.search_methods import SearchMethod
+from components.utils.thrust_sources import ThrustSource
 from components.utils.result_states import ResultState
+from components.utils.optimizer_phases import OptimizerPhase
 from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
 
 class MaximumTakeOffMassOptimizer:
+    HEADLESS_POLL_INTERVAL = 1.0
+    
     n_processes: int
+    settings: OptimizerSettings
+    
+    manager: ThrustCacheManager | None
+    thrust_cache: ThrustCache
+    thrust_table_store: ThrustTableStore | None
+    terminate_early: bool
+    result_plotter: ResultPlotter | None
+    result_history: ResultHistory | None
+    checkpoint: OptimizationCheckpoint | None
+    profiler: PhaseProfiler | None
     
-    status_counters: list[multiprocessing.sharedctypes.Synchronized]
-    position_counters: list[multiprocessing.sharedctypes.Synchronized]
-    velocity_counters: list[multiprocessing.sharedctypes.Synchronized]
-    acceleration_counters: list[multiprocessing.sharedctypes.Synchronized]
-    time_counters: list[multiprocessing.sharedctypes.Synchronized]
-    thrust_counters: list[multiprocessing.sharedctypes.Synchronized]
-    drag_counters: list[multiprocessing.sharedctypes.Synchronized]
+    telemetry: WorkerTelemetry | None
+    worker_pool: WorkerPool | InProcessWorkerPool | SocketWorkerPool | None
     
-    progress_bars: list[tqdm.tqdm]
+    main_progress_indicator: 'tqdm.tqdm | None'
+    progress_bars: list['tqdm.tqdm']
 
     results: dict[numpy.float64, ConstantMassDynamicsModel] | None
+    n_epochs: int
+    timestep_size: numpy.float64 | None
+    discretization_error: numpy.float64 | None
     
-    def __init__(self, n_processes: int) -> None:
+    def __init__(
+        self,
+        n_processes: int,
+        settings: OptimizerSettings | None = None,
+        thrust_cache: ThrustCache | None = None,
+        thrust_table_store: ThrustTableStore | None = None,
+        result_history: ResultHistory | None = None,
+        checkpoint: OptimizationCheckpoint | None = None,
+        profiler: PhaseProfiler | None = None
+    ) -> None:
         self.n_processes = n_processes
+        self.settings = OptimizerSettings() if settings is None else settings
+        
+        self.profiler = profiler
+        if self.profiler is not None:
+            self.profiler.activate()
+        
+        self.manager = None
+        self.thrust_cache = thrust_cache
+        if self.thrust_cache is None:
+            self.manager = ThrustCacheManager()
+            self.manager.start()
+            self.thrust_cache = ThrustCache(self.manager, self.settings.velocity_quantum, self.settings.prefetch_depth)
+        self.thrust_table_store = thrust_table_store
+        self.terminate_early = self.settings.terminate_early and self.settings.search_method == SearchMethod.GRID
+        self.result_plotter = ResultPlotter() if self.settings.plot_results else None
+        self.result_history = result_history
+        self.checkpoint = checkpoint
+        
+        self.telemetry = None
+        self.worker_pool = None
         
-        self.status_counters = list()
-        self.position_counters = list()
-        self.velocity_counters = list()
-        self.acceleration_counters = list()
-        self.time_counters = list()
-        self.thrust_counters = list()
-        self.drag_counters = list()
+        if self.settings.simulation_engine == SimulationEngine.PROCESS:
+            previous_phase = PhaseProfiler.enter(OptimizerPhase.FORKING_WORKERS)
+            if self.settings.worker_transport == WorkerTransport.SOCKET:
+                self.worker_pool = SocketWorkerPool(list(self.settings.worker_addresses), self.settings.worker_authkey)
+            elif self.settings.worker_transport == WorkerTransport.IN_PROCESS:
+                self.worker_pool = InProcessWorkerPool(self.n_processes)
+            else:
+                self.worker_pool = WorkerPool(self.n_processes)
+            self.telemetry = self.worker_pool.telemetry
+            self.n_processes = self.worker_pool.n_workers
+            PhaseProfiler.leave(previous_phase)
 
-        self.main_progress_indicator = tqdm.tqdm(bar_format='{desc} | Elapsed: {elapsed} | Epoch: {n}', desc=f'Optimizing for MTOW | Config: -', position=0, initial=1, leave=True)
+        self.main_progress_indicator = None
         self.progress_bars = list()
+        if self.settings.refresh_rate > 0:
+            import tqdm
+            
+            self.main_progress_indicator = tqdm.tqdm(bar_format='{desc} | Elapsed: {elapsed} | Epoch: {n}', desc=f'Optimizing for MTOW | Config: -', position=0, initial=1, leave=True)
+            
+            for i in range(self.n_processes if self.settings.simulation_engine == SimulationEngine.PROCESS else 0):
+                self.progress_bars.append(
+                    tqdm.tqdm(
+                        total=0,
+                        position=i+1,
+                        desc=f'Worker {i} | m = - kg |  [{ProcessStatus.OPTIMIZER_SETUP}]',
+                        leave=True,
+                        postfix=f't = 0 s | x = 0 m | v = 0 m/s | a = 0 m/s^2 | T = 0 N | D = 0 N'
+                    )
+                )
 
         self.results = None
-        
-        for i in range(self.n_processes):
-            self.status_counters.append(multiprocessing.Value(ctypes.c_byte, 0))
-            self.position_counters.append(multiprocessing.Value(ctypes.c_double, 0))
-            self.velocity_counters.append(multiprocessing.Value(ctypes.c_double, 0))
-            self.acceleration_counters.append(multiprocessing.Value(ctypes.c_double, 0))
-            self.time_counters.append(multiprocessing.Value(ctypes.c_double, 0))
-            self.thrust_counters.append(multiprocessing.Value(ctypes.c_double, 0))
-            self.drag_counters.append(multiprocessing.Value(ctypes.c_double, 0))
-            
-            self.progress_bars.append(
-                tqdm.tqdm(
-                    total=0,
-                    position=i+1,
-                    desc=f'Process {i} | m = - kg |  [{ProcessStatus.OPTIMIZER_SETUP}]',
-                    leave=True,
-                    postfix=f't = 0 s | x = 0 m | v = 0 m/s | a = 0 m/s^2 | T = 0 N | D = 0 N'
-                )
-            )
+        self.n_epochs = 0
+        self.timestep_size = None
+        self.discretization_error = None
     
-    def run(self, run_configuration: RunConfiguration) -> None:
-        process_with_maximum_accepted_mass = None
-
-        minimum = run_configuration.mass_range[0]
-        maximum = run_configuration.mass_range[1]
-
+    def run(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid | None = None, resume: bool = False) -> tuple[ResultState, ConstantMassDynamicsModel | None]:
+        start_time = time.perf_counter()
+        
         config_identifier = run_configuration.identifier
         config_masses = f'[{", ".join(f"{mass_bound:.{run_configuration.arithmetic_precision}f}" for mass_bound in run_configuration.mass_range)}]'
         config_displacements = run_configuration.takeoff_displacement
         
-        self.main_progress_indicator.set_description_str(
-            f'Optimizing for MTOW | Config[{config_identifier}]: m={config_masses} kg ~ x={config_displacements} m'
-        )
+        if self.main_progress_indicator is not None:
+            self.main_progress_indicator.set_description_str(
+                f'Optimizing for MTOW | Config[{config_identifier}]: m={config_masses} kg ~ x={config_displacements} m'
+            )
+        
+        if self.profiler is not None:
+            self.profiler.set_epoch(PhaseProfiler.SETUP_EPOCH)
+        
+        if self.thrust_table_store is not None:
+            logging.info(f'STORED_THRUST_CACHE_ENTRIES = {self.thrust_cache.load(run_configuration, self.thrust_table_store)}')
+        
+        if thrust_model is None:
+            thrust_model = self.build_thrust_model(run_configuration)
+        
+        PhaseProfiler.enter(OptimizerPhase.SEARCHING_MASSES)
+        self.results = dict()
+        self.n_epochs = 0
+        self.timestep_size = None
+        self.discretization_error = None
+        
+        mass_range, half_width = self.get_initial_mass_range(run_configuration)
+        if self.settings.timestep_levels > 0:
+            result_state, optimal_dynamics_model = self.search_timestep_levels(run_configuration, thrust_model, mass_range, half_width, resume)
+        else:
+            result_state, mass, search_configuration = self.search_mass_range(run_configuration, thrust_model, run_configuration.timestep_size, mass_range, half_width, resume)
+            self.timestep_size = run_configuration.timestep_size
+            result_state, optimal_dynamics_model = self.cleanup_return(result_state, mass, search_configuration, thrust_model)
+        
+        if self.thrust_table_store is not None:
+            self.thrust_cache.save(run_configuration, self.thrust_table_store)
+        
+        if self.result_history is not None and result_state == ResultState.MTOM_FOUND:
+            self.result_history.record(run_configuration, self.timestep_size, optimal_dynamics_model.mass, optimal_dynamics_model.get_velocity_takeoff(), self.n_epochs, time.perf_counter()-start_time)
+        
+        return result_state, optimal_dynamics_model
+    
+    def build_thrust_model(self, run_configuration: RunConfiguration, thrust_source: ThrustSource | None = None) -> ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid:
+        thrust_source = self.settings.thrust_source if thrust_source is None else thrust_source
+        if run_configuration.voltage_profile_variable is not None:
+            if thrust_source != ThrustSource.TABLE:
+                logging.warning(f'Thrust source "{thrust_source.value}" holds a single voltage, a thrust grid is built for the voltage profile instead...')
+            PhaseProfiler.enter(OptimizerPhase.BUILDING_TABLE)
+            return ThrustGrid.build(run_configuration, self.thrust_cache, self.settings.sweep_count, self.settings.sweep_points, self.settings.voltage_points, self.thrust_table_store)
+        if thrust_source == ThrustSource.TABLE:
+            PhaseProfiler.enter(OptimizerPhase.BUILDING_TABLE)
+            return ThrustTable.build(run_configuration, self.thrust_cache, self.settings.sweep_count, self.settings.sweep_points, self.thrust_table_store)
+        if thrust_source == ThrustSource.SURROGATE:
+            PhaseProfiler.enter(OptimizerPhase.BUILDING_TABLE)
+            return ThrustSurrogate.build(run_configuration, self.thrust_cache)
+        
+        return self.thrust_cache
+    
+    def get_n_masses(self) -> int:
+        return self.settings.masses_per_epoch if self.settings.simulation_engine == SimulationEngine.VECTORIZED else self.n_processes
+    
+    def get_initial_mass_range(self, run_configuration: RunConfiguration) -> tuple[tuple[numpy.float64, numpy.float64], numpy.float64]:
+        prediction = None if self.result_history is None else self.result_history.predict(run_configuration)
+        if prediction is None:
+            return run_configuration.mass_range, (run_configuration.mass_range[1]-run_configuration.mass_range[0]) / 2
+        
+        predicted_mtom, half_width, n_neighbours = prediction
+        half_width = max(half_width, self.get_n_masses() * numpy.float64(10)**-run_configuration.arithmetic_precision)
+        mass_range = self.get_refined_mass_range(run_configuration, predicted_mtom, half_width)
+        logging.info(f'PREDICTED_MTOM = {predicted_mtom:.{run_configuration.arithmetic_precision}f} kg | PREDICTED_MASS_RANGE = [{mass_range[0]:.{run_configuration.arithmetic_precision}f}, {mass_range[1]:.{run_configuration.arithmetic_precision}f}] kg | HISTORY_NEIGHBOURS = {n_neighbours}')
         
+        return mass_range, half_width
+    
+    def search_masses(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, resume: bool = False) -> tuple[ResultState, numpy.float64 | None]:
         self.results = dict()
-        results_queue = multiprocessing.Queue(maxsize=self.n_processes)
+        if self.worker_pool is not None:
+            self.worker_pool.configure(run_configuration, thrust_model, self.terminate_early, self.settings.summary_trajectories, self.profiler is not None)
+        
+        n_masses = self.get_n_masses()
+        
+        completed_epochs, resumed_state = self.open_checkpoint(run_configuration, n_masses, resume)
+        
+        if self.settings.search_method == SearchMethod.ROOT:
+            result_state, mass = self.search_takeoff_margin_root(run_configuration, thrust_model, n_masses, completed_epochs, resumed_state)
+        else:
+            result_state, mass = self.search_takeoff_status_grid(run_configuration, thrust_model, n_masses, completed_epochs, resumed_state)
+        
+        if self.checkpoint is not None:
+            self.checkpoint.remove()
+        
+        return result_state, mass
+    
+    def search_mass_range(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, timestep_size: numpy.float64, mass_range: tuple[numpy.float64, numpy.float64], half_width: numpy.float64, resume: bool = False) -> tuple[ResultState, numpy.float64 | None, RunConfiguration]:
+        search_configuration = run_configuration.get_refinement(timestep_size, mass_range)
+        result_state, mass = self.search_masses(search_configuration, thrust_model, resume)
+        
+        while result_state == ResultState.MASS_LOWERBOUND_BEYOND_MTOM and mass_range[0] > run_configuration.mass_range[0] or result_state == ResultState.MASS_UPPERBOUND_BELOW_MTOM and mass_range[1] < run_configuration.mass_range[1]:
+            half_width *= 2
+            if result_state == ResultState.MASS_LOWERBOUND_BEYOND_MTOM:
+                mass_range = (max(run_configuration.mass_range[0], numpy.round(mass_range[0]-2*half_width, run_configuration.arithmetic_precision)), mass_range[0])
+            else:
+                mass_range = (mass_range[1], min(run_configuration.mass_range[1], numpy.round(mass_range[1]+2*half_width, run_configuration.arithmetic_precision)))
+            logging.info(f'WIDENED_MASS_RANGE = [{mass_range[0]:.{run_configuration.arithmetic_precision}f}, {mass_range[1]:.{run_configuration.arithmetic_precision}f}] kg')
+            search_configuration = run_configuration.get_refinement(timestep_size, mass_range)
+            result_state, mass = self.search_masses(search_configuration, thrust_model, resume and self.checkpoint is not None)
+        
+        return result_state, mass, search_configuration
+    
+    def search_timestep_levels(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, mass_range: tuple[numpy.float64, numpy.float64], half_width: numpy.float64, resume: bool = False) -> tuple[ResultState, ConstantMassDynamicsModel | None]:
+        PRECISION_UNIT = numpy.float64(10)**-run_configuration.arithmetic_precision
+        RICHARDSON_FACTOR = 2**DynamicsIntegrator.get_order(run_configuration)
+        
+        previous_mtom = None
+        for level in range(self.settings.timestep_levels, -1, -1):
+            result_state, mass, level_configuration = self.search_mass_range(run_configuration, thrust_model, run_configuration.timestep_size * 2**level, mass_range, half_width, resume if level == self.settings.timestep_levels else resume and self.checkpoint is not None)
+            if result_state == ResultState.MASS_LOWERBOUND_BEYOND_MTOM:
+                return self.cleanup_return(result_state)
+            
+            self.timestep_size = level_configuration.timestep_size
+            if previous_mtom is not None:
+                self.discretization_error = abs(mass-previous_mtom) / (RICHARDSON_FACTOR-1)
+            logging.info(f'TIMESTEP_SIZE = {level_configuration.timestep_size} | MASS_RANGE = [{level_configuration.mass_range[0]:.{run_configuration.arithmetic_precision}f}, {level_configuration.mass_range[1]:.{run_configuration.arithmetic_precision}f}] kg | LEVEL_MTOM = {mass:.{run_configuration.arithmetic_precision}f} kg' + ('' if self.discretization_error is None else f' | ESTIMATED_DISCRETIZATION_ERROR = {self.discretization_error:.{run_configuration.arithmetic_precision+1}f} kg'))
+            if self.discretization_error is not None and self.discretization_error <= PRECISION_UNIT/2:
+                break
+            
+            seed_half_width = max((self.get_n_masses()-1)//2, 1) * PRECISION_UNIT
+            mass_range = self.get_refined_mass_range(run_configuration, mass if previous_mtom is None else mass + (mass-previous_mtom)/RICHARDSON_FACTOR, seed_half_width)
+            if previous_mtom is not None:
+                half_width = max(abs(mass-previous_mtom), seed_half_width)
+            previous_mtom = mass
+        
+        if self.discretization_error > PRECISION_UNIT/2:
+            logging.warning(f'MTOM found may not be accurate: estimated discretization error ({self.discretization_error:.{run_configuration.arithmetic_precision+1}f} kg) exceeds half the arithmetic precision at the configured timestep size ({run_configuration.timestep_size}).')
+        
+        return self.cleanup_return(result_state, mass, level_configuration, thrust_model)
+    
+    def get_refined_mass_range(self, run_configuration: RunConfiguration, center: numpy.float64, half_width: numpy.float64) -> tuple[numpy.float64, numpy.float64]:
+        center = numpy.clip(center, run_configuration.mass_range[0], run_configuration.mass_range[1])
+        return (
+            max(run_configuration.mass_range[0], numpy.round(center-half_width, run_configuration.arithmetic_precision)),
+            min(run_configuration.mass_range[1], numpy.round(center+half_width, run_configuration.arithmetic_precision))
+        )
+    
+    def search_takeoff_status_grid(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, n_masses: int, completed_epochs: int = 0, resumed_state: dict[str, numpy.ndarray] | None = None) -> tuple[ResultState, numpy.float64 | None]:
+        process_with_maximum_accepted_mass = None
+        
+        minimum = run_configuration.mass_range[0]
+        maximum = run_configuration.mass_range[1]
         
         backup_minimum = numpy.round(numpy.float64(minimum), run_configuration.arithmetic_precision)
         backup_maximum = numpy.round(numpy.float64(maximum), run_configuration.arithmetic_precision)
 
         PRECISION_MULTIPLIER = 10**run_configuration.arithmetic_precision
         
-        MASS_SPACE = numpy.linspace(minimum, maximum, self.n_processes)
+        MASS_SPACE = numpy.linspace(minimum, maximum, n_masses)
+        if resumed_state is not None:
+            minimum = numpy.float64(resumed_state['minimum'])
+            maximum = numpy.float64(resumed_state['maximum'])
+            backup_minimum = numpy.float64(resumed_state['backup_minimum'])
+            backup_maximum = numpy.float64(resumed_state['backup_maximum'])
+            process_with_maximum_accepted_mass = None if resumed_state['process_with_maximum_accepted_mass'] < 0 else int(resumed_state['process_with_maximum_accepted_mass'])
+            MASS_SPACE = resumed_state['MASS_SPACE']
+        
         while True:
             MASS_SPACE = numpy.round(MASS_SPACE, run_configuration.arithmetic_precision)
             if int(MASS_SPACE[-1]*PRECISION_MULTIPLIER)-int(MASS_SPACE[0]*PRECISION_MULTIPLIER) <= 1:
-                return self.cleanup_return(ResultState.MTOM_FOUND, MASS_SPACE[0], run_configuration)
-            
-            processes: list[multiprocessing.Process] = list()
-
-            PROCESS_PADDING = len(str(self.n_processes-1))
-            MASS_PADDING = max([len(f'{mass:.{run_configuration.arithmetic_precision}f}') for mass in MASS_SPACE])
-            
-            for i in range(self.n_processes):
-                self.status_counters[i].value = 0
-                self.position_counters[i].value = 0
-                self.velocity_counters[i].value = 0
-                self.acceleration_counters[i].value = 0
-                self.time_counters[i].value = 0
-                self.thrust_counters[i].value = 0
-                self.drag_counters[i].value = 0
-                
-                self.progress_bars[i].total = run_configuration.takeoff_displacement
-                self.progress_bars[i].set_description_str(f'Process {i:>{PROCESS_PADDING}} | m = {MASS_SPACE[i]:>{MASS_PADDING}.{run_configuration.arithmetic_precision}f} kg | [{ProcessStatus.FORKING_PROCESS}]')
-                self.progress_bars[i].set_postfix_str(f't = 0 s | x = 0 m | v = 0 m/s | a = 0 m/s^2 | T = 0 N | D = 0 N')
-                
-                processes.append(
-                    multiprocessing.Process(
-                        target=ConstantMassDynamicsSimulation.simulate_dynamics_given_mass,
-                        args=(
-                            run_configuration,
-                            MASS_SPACE[i],
-                            results_queue,
-                            self.status_counters[i],
-                            self.position_counters[i],
-                            self.velocity_counters[i],
-                            self.acceleration_counters[i],
-                            self.time_counters[i],
-                            self.thrust_counters[i],
-                            self.drag_counters[i],
-                        )
-                    )
-                )
-            
-            for process in processes:
-                process.start()
+                return ResultState.MTOM_FOUND, minimum
             
-            while any(process.is_alive() for process in processes):
-                self.main_progress_indicator.refresh()
-                
-                local_time_counters = list()
-                local_position_counters = list()
-                local_velocity_counters = list()
-                local_acceleration_counters = list()
-                local_thrust_counters = list()
-                local_drag_counters = list()
-                
-                for i in range(self.n_processes):
-                    with self.status_counters[i].get_lock():
-                        self.progress_bars[i].set_description_str(f'Process {i:>{PROCESS_PADDING}} | m = {MASS_SPACE[i]:>{MASS_PADDING}.{run_configuration.arithmetic_precision}f} kg | [{ProcessStatus.get(self.status_counters[i].value)}]')
-                    with self.position_counters[i].get_lock():
-                        self.progress_bars[i].n = min(self.position_counters[i].value, run_configuration.takeoff_displacement)
-                        self.progress_bars[i].last_print_n = min(self.position_counters[i].value, run_configuration.takeoff_displacement)
-                        with self.velocity_counters[i].get_lock():
-                            with self.acceleration_counters[i].get_lock():
-                                with self.time_counters[i].get_lock():
-                                    with self.thrust_counters[i].get_lock():
-                                        with self.drag_counters[i].get_lock():
-                                            local_time_counters.append(f'{self.time_counters[i].value:.2f}')
-                                            local_position_counters.append(f'{self.position_counters[i].value:.2f}')
-                                            local_velocity_counters.append(f'{self.velocity_counters[i].value:.2f}')
-                                            local_acceleration_counters.append(f'{self.acceleration_counters[i].value:.2f}')
-                                            local_thrust_counters.append(f'{self.thrust_counters[i].value:.2f}')
-                                            local_drag_counters.append(f'{self.drag_counters[i].value:.2f}')
-                
-                TIME_COUNTER_PADDING = max([len(string) for string in local_time_counters])
-                POSITION_COUNTER_PADDING = max([len(string) for string in local_position_counters])
-                VELOCITY_COUNTER_PADDING = max([len(string) for string in local_velocity_counters])
-                ACCELERATION_COUNTER_PADDING = max([len(string) for string in local_acceleration_counters])
-                THRUST_COUNTER_PADDING = max([len(string) for string in local_thrust_counters])
-                DRAG_COUNTER_PADDING = max([len(string) for string in local_drag_counters])
-                
-                for i in range(self.n_processes):
-                    self.progress_bars[i].set_postfix_str(
-                        f't = {local_time_counters[i]:>{TIME_COUNTER_PADDING}} s'
-                        f' | '
-                        f'x = {local_position_counters[i]:>{POSITION_COUNTER_PADDING}} m'
-                        f' | '
-                        f'v = {local_velocity_counters[i]:>{VELOCITY_COUNTER_PADDING}} m/s'
-                        f' | '
-                        f'a = {local_acceleration_counters[i]:>{ACCELERATION_COUNTER_PADDING}} m/s^2'
-                        f' | '
-                        f'T = {local_thrust_counters[i]:>{THRUST_COUNTER_PADDING}} N'
-                        f' | '
-                        f'D = {local_drag_counters[i]:>{DRAG_COUNTER_PADDING}} N'
-                    )
+            statuses = self.simulate(run_configuration, MASS_SPACE, thrust_model)
             
-                while not results_queue.empty():
-                    dynamics_model: ConstantMassDynamicsModel = results_queue.get()
-                    if dynamics_model.mass not in self.results:
-                        self.results[dynamics_model.mass] = dynamics_model
-            
-            for process in processes:
-                process.join()
-            
-            for i in range(self.n_processes):
-                if self.status_counters[i].value == ProcessStatus.SUCCESS_TAKEOFF.value and MASS_SPACE[i] >= minimum:
+            for i in range(n_masses):
+                if statuses[i] == ProcessStatus.SUCCESS_TAKEOFF and MASS_SPACE[i] >= minimum:
                     minimum = MASS_SPACE[i]
                     process_with_maximum_accepted_mass = i
                 
-                j = self.n_processes-1-i
-                if self.status_counters[j].value > ProcessStatus.SUCCESS_TAKEOFF.value and MASS_SPACE[j] <= maximum:
+                j = n_masses-1-i
+                if statuses[j].value > ProcessStatus.SUCCESS_TAKEOFF.value and MASS_SPACE[j] <= maximum:
                     maximum = MASS_SPACE[j]
             
             if process_with_maximum_accepted_mass is None:
                 if backup_minimum < MASS_SPACE[0]:
-                    MASS_SPACE = numpy.linspace(backup_minimum, MASS_SPACE[0], self.n_processes+2)[1:-1]
+                    MASS_SPACE = numpy.linspace(backup_minimum, MASS_SPACE[0], n_masses+2)[1:-1]
                     backup_maximum = MASS_SPACE[0]
                 else:
-                    return self.cleanup_return(ResultState.MASS_LOWERBOUND_BEYOND_MTOM)
-            if process_with_maximum_accepted_mass == self.n_processes-1:
+                    return ResultState.MASS_LOWERBOUND_BEYOND_MTOM, None
+            if process_with_maximum_accepted_mass == n_masses-1:
                 if backup_maximum > MASS_SPACE[-1]:
-                    MASS_SPACE = numpy.linspace(MASS_SPACE[-1], backup_maximum, self.n_processes+2)[1:-1]
+                    MASS_SPACE = numpy.linspace(MASS_SPACE[-1], backup_maximum, n_masses+2)[1:-1]
                     backup_minimum = MASS_SPACE[-1]
                 else:
-                    return self.cleanup_return(ResultState.MASS_UPPERBOUND_BELOW_MTOM, MASS_SPACE[process_with_maximum_accepted_mass], run_configuration)
+                    return ResultState.MASS_UPPERBOUND_BELOW_MTOM, MASS_SPACE[process_with_maximum_accepted_mass]
             else:
-                MASS_SPACE = numpy.linspace(minimum, maximum, self.n_processes+2)[1:-1]
+                MASS_SPACE = numpy.linspace(minimum, maximum, n_masses+2)[1:-1]
                 backup_minimum = minimum
                 backup_maximum = maximum
             
-            self.main_progress_indicator.update(1)
+            completed_epochs += 1
+            self.save_checkpoint(completed_epochs, {
+                'minimum': minimum,
+                'maximum': maximum,
+                'backup_minimum': backup_minimum,
+                'backup_maximum': backup_maximum,
+                'process_with_maximum_accepted_mass': -1 if process_with_maximum_accepted_mass is None else process_with_maximum_accepted_mass,
+                'MASS_SPACE': MASS_SPACE
+            })
+            if self.main_progress_indicator is not None:
+                self.main_progress_indicator.update(1)
+    
+    def search_takeoff_margin_root(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, n_masses: int, completed_epochs: int = 0, resumed_state: dict[str, numpy.ndarray] | None = None) -> tuple[ResultState, numpy.float64 | None]:
+        PRECISION_UNIT = numpy.float64(10)**-run_configuration.arithmetic_precision
+        
+        lower_bound = numpy.round(run_configuration.mass_range[0], run_configuration.arithmetic_precision)
+        upper_bound = numpy.round(run_configuration.mass_range[1], run_configuration.arithmetic_precision)
+        
+        bracket = None
+        retained_side = None
+        retained_epochs = 0
+        
+        MASS_SPACE = numpy.linspace(lower_bound, upper_bound, n_masses)
+        if resumed_state is not None:
+            bracket = ((resumed_state['bracket'][0], resumed_state['bracket'][1]), (resumed_state['bracket'][2], resumed_state['bracket'][3]))
+            retained_side = None if resumed_state['retained_side'] == '' else str(resumed_state['retained_side'])
+            retained_epochs = int(resumed_state['retained_epochs'])
+            MASS_SPACE = resumed_state['MASS_SPACE']
+        
+        while True:
+            MASS_SPACE = numpy.round(MASS_SPACE, run_configuration.arithmetic_precision)
+            self.simulate(run_configuration, MASS_SPACE, thrust_model)
+            
+            margins = sorted((mass, dynamics_model.get_takeoff_margin(run_configuration.takeoff_displacement)) for mass, dynamics_model in self.results.items())
+            failures = [(mass, margin) for mass, margin in margins if margin <= 0]
+            if not failures:
+                return ResultState.MASS_UPPERBOUND_BELOW_MTOM, margins[-1][0]
+            
+            upper = failures[0]
+            successes = [(mass, margin) for mass, margin in margins if margin > 0 and mass < upper[0]]
+            if not successes:
+                return ResultState.MASS_LOWERBOUND_BEYOND_MTOM, None
+            lower = successes[-1]
+            
+            if numpy.round((upper[0]-lower[0]) / PRECISION_UNIT) <= 1:
+                return ResultState.MTOM_FOUND, lower[0]
+            
+            if bracket is not None:
+                side = 'lower' if lower[0] == bracket[0][0] else 'upper' if upper[0] == bracket[1][0] else None
+                retained_epochs = retained_epochs+1 if side is not None and side == retained_side else 1
+                retained_side = side
+            bracket = (lower, upper)
+            
+            lower_margin = lower[1] / 2**max(0, retained_epochs-1) if retained_side == 'lower' else lower[1]
+            upper_margin = upper[1] / 2**max(0, retained_epochs-1) if retained_side == 'upper' else upper[1]
+            estimate = upper[0] - upper_margin * (upper[0]-lower[0]) / (upper_margin-lower_margin)
+            
+            n_offsets = (n_masses-1) // 2
+            half_span = (upper[0]-lower[0]) / 2
+            offsets = PRECISION_UNIT * numpy.power(max(half_span/PRECISION_UNIT, 1), numpy.arange(n_offsets)/max(n_offsets, 1))
+            MASS_SPACE = numpy.concatenate(([estimate], estimate-offsets, estimate+offsets, [lower[0]+half_span] * (n_masses-1-2*n_offsets)))
+            MASS_SPACE = numpy.sort(numpy.clip(MASS_SPACE, lower[0]+PRECISION_UNIT, upper[0]-PRECISION_UNIT))
+            
+            completed_epochs += 1
+            self.save_checkpoint(completed_epochs, {
+                'bracket': [lower[0], lower[1], upper[0], upper[1]],
+                'retained_side': '' if retained_side is None else retained_side,
+                'retained_epochs': retained_epochs,
+                'MASS_SPACE': MASS_SPACE
+            })
+            if self.main_progress_indicator is not None:
+                self.main_progress_indicator.update(1)
+    
+    def open_checkpoint(self, run_configuration: RunConfiguration, n_masses: int, resume: bool) -> tuple[int, dict[str, numpy.ndarray] | None]:
+        if self.checkpoint is None:
+            if resume:
+                logging.warning(f'Resuming requires checkpoints, starting from the first epoch...')
+            return 0, None
+        
+        self.checkpoint.open(run_configuration, [
+            self.settings.search_method.value,
+            self.settings.simulation_engine.value,
+            n_masses,
+            self.terminate_early,
+            self.settings.thrust_source.value,
+            self.settings.sweep_count,
+            self.settings.sweep_points
+        ] + ([] if run_configuration.voltage_profile_variable is None else [run_configuration.get_voltage_profile(), self.settings.voltage_points]))
+        if not resume:
+            self.checkpoint.remove()
+            return 0, None
+        
+        checkpoint = self.checkpoint.load()
+        if checkpoint is None:
+            logging.warning(f'No checkpoint found for configuration "{run_configuration.identifier}" and the given optimizer settings, starting from the first epoch...')
+            return 0, None
+        
+        completed_epochs, resumed_state, self.results = checkpoint
+        logging.info(f'RESUMED_EPOCHS = {completed_epochs} | RESUMED_MASSES = {len(self.results)}')
+        if self.main_progress_indicator is not None:
+            self.main_progress_indicator.update(completed_epochs)
+        
+        return completed_epochs, resumed_state
+    
+    def save_checkpoint(self, completed_epochs: int, state: dict[str, object]) -> None:
+        if self.checkpoint is not None:
+            previous_phase = PhaseProfiler.enter(OptimizerPhase.WRITING_CHECKPOINT)
+            self.checkpoint.save(completed_epochs, state, self.results)
+            PhaseProfiler.leave(previous_phase)
+    
+    def simulate(self, run_configuration: RunConfiguration, MASS_SPACE: numpy.ndarray[numpy.float64], thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid) -> list[ProcessStatus]:
+        self.n_epochs += 1
+        if self.profiler is not None:
+            self.profiler.set_epoch(str(self.n_epochs))
+        
+        if self.settings.simulation_engine == SimulationEngine.VECTORIZED:
+            return self.simulate_vectorized(run_configuration, MASS_SPACE, thrust_model)
+        
+        return self.simulate_in_processes(run_configuration, MASS_SPACE)
+    
+    def simulate_in_processes(self, run_configuration: RunConfiguration, MASS_SPACE: numpy.ndarray[numpy.float64]) -> list[ProcessStatus]:
+        for i in range(self.n_processes):
+            self.telemetry.reset(i, ProcessStatus.FORKING_PROCESS)
+            if self.progress_bars:
+                self.progress_bars[i].total = run_configuration.takeoff_displacement
+        
+        previous_phase = PhaseProfiler.enter(OptimizerPhase.SUBMITTING_MASSES)
+        epoch_id = self.worker_pool.submit(MASS_SPACE)
+        completed = [False] * self.n_processes
+        statuses: list[ProcessStatus | None] = [None] * self.n_processes
+        
+        refresh_interval = 1 / self.settings.refresh_rate if self.settings.refresh_rate > 0 else self.HEADLESS_POLL_INTERVAL
+        next_refresh = time.monotonic()
+        
+        while not all(completed):
+            if self.settings.refresh_rate > 0 and time.monotonic() >= next_refresh:
+                PhaseProfiler.enter(OptimizerPhase.RENDERING_PROGRESS)
+                self.render_progress(run_configuration, MASS_SPACE)
+                next_refresh = time.monotonic() + refresh_interval
+            
+            PhaseProfiler.enter(OptimizerPhase.AWAITING_RESULTS)
+            result = self.worker_pool.get_result(timeout=max(0, next_refresh-time.monotonic()) if self.settings.refresh_rate > 0 else refresh_interval)
+            PhaseProfiler.enter(OptimizerPhase.COLLECTING_RESULTS)
+            while result is not None:
+                result_epoch_id, i, dynamics_model = result
+                if result_epoch_id == epoch_id:
+                    completed[i] = True
+                    if dynamics_model is not None:
+                        statuses[i] = ProcessStatus.SUCCESS_TAKEOFF if dynamics_model.is_takeoff_successful() else ProcessStatus.FAILED_VELOCITY
+                        if dynamics_model.mass not in self.results:
+                            self.results[dynamics_model.mass] = dynamics_model
+                result = self.worker_pool.get_result(timeout=0)
+            
+            if self.terminate_early:
+                for i, implied_status in enumerate(self.get_implied_statuses(MASS_SPACE, statuses)):
+                    if implied_status is not None and not completed[i]:
+                        self.worker_pool.cancel(epoch_id, i)
+                        statuses[i] = implied_status
+        
+        if self.settings.refresh_rate > 0:
+            PhaseProfiler.enter(OptimizerPhase.RENDERING_PROGRESS)
+            self.render_progress(run_configuration, MASS_SPACE)
+        
+        PhaseProfiler.leave(previous_phase)
+        return statuses
+    
+    def render_progress(self, run_configuration: RunConfiguration, MASS_SPACE: numpy.ndarray[numpy.float64]) -> None:
+        PROCESS_PADDING = len(str(self.n_processes-1))
+        MASS_PADDING = max([len(f'{mass:.{run_configuration.arithmetic_precision}f}') for mass in MASS_SPACE])
+        
+        if self.main_progress_indicator is not None:
+            self.main_progress_indicator.refresh()
+        
+        records = [self.telemetry.read(i) for i in range(self.n_processes)]
+        
+        local_time_counters = [f'{record["time"]:.2f}' for record in records]
+        local_position_counters = [f'{record["position"]:.2f}' for record in records]
+        local_velocity_counters = [f'{record["velocity"]:.2f}' for record in records]
+        local_acceleration_counters = [f'{record["acceleration"]:.2f}' for record in records]
+        local_thrust_counters = [f'{record["thrust"]:.2f}' for record in records]
+        local_drag_counters = [f'{record["drag"]:.2f}' for record in records]
+        
+        TIME_COUNTER_PADDING = max([len(string) for string in local_time_counters])
+        POSITION_COUNTER_PADDING = max([len(string) for string in local_position_counters])
+        VELOCITY_COUNTER_PADDING = max([len(string) for string in local_velocity_counters])
+        ACCELERATION_COUNTER_PADDING = max([len(string) for string in local_acceleration_counters])
+        THRUST_COUNTER_PADDING = max([len(string) for string in local_thrust_counters])
+        DRAG_COUNTER_PADDING = max([len(string) for string in local_drag_counters])
+        
+        for i, record in enumerate(records):
+            self.progress_bars[i].n = min(float(record['position']), run_configuration.takeoff_displacement)
+            self.progress_bars[i].last_print_n = self.progress_bars[i].n
+            self.progress_bars[i].set_description_str(f'Worker {i:>{PROCESS_PADDING}} | m = {MASS_SPACE[i]:>{MASS_PADDING}.{run_configuration.arithmetic_precision}f} kg | [{ProcessStatus.get(int(record["status"]))}]', refresh=False)
+            self.progress_bars[i].set_postfix_str(
+                f't = {local_time_counters[i]:>{TIME_COUNTER_PADDING}} s'
+                f' | '
+                f'x = {local_position_counters[i]:>{POSITION_COUNTER_PADDING}} m'
+                f' | '
+                f'v = {local_velocity_counters[i]:>{VELOCITY_COUNTER_PADDING}} m/s'
+                f' | '
+                f'a = {local_acceleration_counters[i]:>{ACCELERATION_COUNTER_PADDING}} m/s^2'
+                f' | '
+                f'T = {local_thrust_counters[i]:>{THRUST_COUNTER_PADDING}} N'
+                f' | '
+                f'D = {local_drag_counters[i]:>{DRAG_COUNTER_PADDING}} N'
+            )
+    
+    def get_implied_statuses(self, MASS_SPACE: numpy.ndarray[numpy.float64], statuses: list[ProcessStatus | None]) -> list[ProcessStatus | None]:
+        successful_masses = [mass for mass, status in zip(MASS_SPACE, statuses) if status == ProcessStatus.SUCCESS_TAKEOFF]
+        failed_masses = [mass for mass, status in zip(MASS_SPACE, statuses) if status == ProcessStatus.FAILED_VELOCITY]
+        
+        implied_statuses = list()
+        for mass, status in zip(MASS_SPACE, statuses):
+            if status is not None:
+                implied_statuses.append(None)
+            elif successful_masses and mass <= max(successful_masses):
+                implied_statuses.append(ProcessStatus.SUCCESS_TAKEOFF)
+            elif failed_masses and mass >= min(failed_masses):
+                implied_statuses.append(ProcessStatus.FAILED_VELOCITY)
+            else:
+                implied_statuses.append(None)
+        
+        return implied_statuses
     
-    def cleanup_return(self, result_state: ResultState, mass: numpy.float64 | None = None, run_configuration: RunConfiguration | None = None) -> None:
-        self.main_progress_indicator.close()
+    def simulate_vectorized(self, run_configuration: RunConfiguration, MASS_SPACE: numpy.ndarray[numpy.float64], thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid) -> list[ProcessStatus]:
+        previous_phase = PhaseProfiler.enter(OptimizerPhase.SIMULATING_LOCKSTEP)
+        statuses = list()
+        for dynamics_model in VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, MASS_SPACE, thrust_model, self.terminate_early, summary_only=self.settings.summary_trajectories):
+            if dynamics_model.mass not in self.results:
+                self.results[dynamics_model.mass] = dynamics_model
+            statuses.append(ProcessStatus.SUCCESS_TAKEOFF if dynamics_model.is_takeoff_successful() else ProcessStatus.FAILED_VELOCITY)
+        
+        PhaseProfiler.leave(previous_phase)
+        return statuses
+    
+    def run_uncertainty_analysis(self, run_configuration: RunConfiguration) -> numpy.ndarray[numpy.float64]:
+        if self.profiler is not None:
+            self.profiler.set_epoch('uncertainty')
+        
+        ensemble_configuration = UncertaintyAnalysis.get_ensemble_configuration(run_configuration)
+        
+        previous_phase = PhaseProfiler.enter(OptimizerPhase.BUILDING_TABLE)
+        thrust_model = self.build_thrust_model(ensemble_configuration, ThrustSource.TABLE)
+        PhaseProfiler.leave(previous_phase)
+        
+        previous_phase = PhaseProfiler.enter(OptimizerPhase.ANALYZING_UNCERTAINTY)
+        mtoms, local_mtoms = UncertaintyAnalysis.get_mtoms(ensemble_configuration, thrust_model, self.terminate_early)
+        PhaseProfiler.leave(previous_phase)
+        
+        n_lowerbound_beyond_mtom = int(numpy.isnan(mtoms).sum())
+        if n_lowerbound_beyond_mtom == mtoms.size:
+            logging.error(f'MTOM cannot be found within the given range for any uncertainty sample: the minimum mass provided is too high.')
+            return mtoms
+        if n_lowerbound_beyond_mtom:
+            logging.warning(f'MTOM cannot be found within the given range for {n_lowerbound_beyond_mtom} of {mtoms.size} uncertainty samples: the minimum mass provided is too high.')
+        if local_mtoms.any():
+            logging.warning(f'MTOM was only found locally for {int(local_mtoms.sum())} of {mtoms.size} uncertainty samples: the maximum mass provided is too low.')
+        
+        percentiles = numpy.nanpercentile(mtoms, UncertaintyAnalysis.PERCENTILES)
+        logging.info(f'UNCERTAINTY_SAMPLES = {mtoms.size} | MEAN_MTOM = {numpy.nanmean(mtoms):.{run_configuration.arithmetic_precision}f} kg | ' + ' | '.join(f'P{percentile}_MTOM = {mtom:.{run_configuration.arithmetic_precision}f} kg' for percentile, mtom in zip(UncertaintyAnalysis.PERCENTILES, percentiles)))
+        
+        return mtoms
+    
+    def get_result_document(self, run_configuration: RunConfiguration, result_state: ResultState, optimal_dynamics_model: ConstantMassDynamicsModel | None, uncertainty_mtoms: numpy.ndarray[numpy.float64] | None = None) -> dict:
+        result_document = {
+            'identifier': run_configuration.identifier,
+            'result': result_state.name,
+            'mtom': None,
+            'stall_velocity': None,
+            'liftoff_distance': None,
+            'liftoff_velocity': None,
+            'epochs': self.n_epochs,
+            'simulated_masses': len(self.results)
+        }
+        if optimal_dynamics_model is not None:
+            result_document['mtom'] = round(float(optimal_dynamics_model.mass), run_configuration.arithmetic_precision)
+            result_document['stall_velocity'] = float(optimal_dynamics_model.stall_velocity)
+            result_document['liftoff_distance'] = float(optimal_dynamics_model.get_position_takeoff())
+            result_document['liftoff_velocity'] = float(optimal_dynamics_model.get_velocity_takeoff())
+        if self.discretization_error is not None:
+            result_document['timestep_size'] = float(self.timestep_size)
+            result_document['estimated_discretization_error'] = float(self.discretization_error)
+        
+        if uncertainty_mtoms is not None:
+            found_mtoms = uncertainty_mtoms[numpy.isfinite(uncertainty_mtoms)]
+            percentiles = numpy.percentile(found_mtoms, UncertaintyAnalysis.PERCENTILES) if found_mtoms.size else [None] * len(UncertaintyAnalysis.PERCENTILES)
+            result_document['uncertainty'] = {
+                'samples': int(uncertainty_mtoms.size),
+                'lowerbound_beyond_mtom': int(uncertainty_mtoms.size-found_mtoms.size),
+                'mean_mtom': float(found_mtoms.mean()) if found_mtoms.size else None,
+                **{f'p{percentile}_mtom': None if mtom is None else float(mtom) for percentile, mtom in zip(UncertaintyAnalysis.PERCENTILES, percentiles)}
+            }
+        
+        return result_document
+    
+    def save_trajectories(self, trajectories_path: str) -> None:
+        numpy.savez(trajectories_path, **OptimizationCheckpoint.get_result_columns([self.results[mass] for mass in sorted(self.results)]))
+    
+    def close(self) -> None:
+        if self.result_plotter is not None:
+            self.result_plotter.join()
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+        if self.manager is not None:
+            self.manager.shutdown()
+    
+    def cleanup_return(self, result_state: ResultState, mass: numpy.float64 | None = None, run_configuration: RunConfiguration | None = None, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid | None = None) -> tuple[ResultState, ConstantMassDynamicsModel | None]:
+        if self.main_progress_indicator is not None:
+            self.main_progress_indicator.close()
         for progress_bar in self.progress_bars:
             progress_bar.close()
         
+        if self.profiler is not None:
+            self.profiler.set_epoch(PhaseProfiler.FINAL_EPOCH)
+        
         if result_state == ResultState.MASS_LOWERBOUND_BEYOND_MTOM:
             logging.error(f'MTOM cannot be found within the given range: the minimum mass provided is too high.')
-            return
+            return result_state, None
         elif result_state == ResultState.MASS_UPPERBOUND_BELOW_MTOM:
             logging.warning(f'MTOM was only found locally: the maximum mass provided is too low.')
         
-        optimal_dynamics_model = self.results[mass]
+        cache_hits, cache_misses = self.thrust_cache.get_counts()
+        logging.info(f'THRUST_CACHE_HITS = {cache_hits} | THRUST_CACHE_MISSES = {cache_misses}')
+        if self.thrust_cache.prefetch_depth > 0:
+            prefetch_hits, prefetch_misses, prefetch_runs = self.thrust_cache.get_prefetch_counts()
+            logging.info(f'PREFETCH_HITS = {prefetch_hits} | PREFETCH_MISSES = {prefetch_misses} | PREFETCH_HIT_RATE = {100*prefetch_hits/max(prefetch_hits+prefetch_misses, 1):.1f}% | PREFETCH_RUNS = {prefetch_runs} | WASTED_PREFETCH_RUNS = {prefetch_runs-prefetch_hits}')
         
-        if optimal_dynamics_model.get_position_takeoff() > run_configuration.takeoff_displacement:
+        optimal_dynamics_model = self.results.get(mass)
+        if optimal_dynamics_model is None or optimal_dynamics_model.decided_early or optimal_dynamics_model.summary_only and self.settings.plot_results:
+            previous_phase = PhaseProfiler.enter(OptimizerPhase.SIMULATING_LOCKSTEP)
+            optimal_dynamics_model = VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, numpy.array([mass]), thrust_model)[0]
+            self.results[mass] = optimal_dynamics_model
+            PhaseProfiler.leave(previous_phase)
+        
+        if self.discretization_error is None and optimal_dynamics_model.get_position_takeoff() > run_configuration.takeoff_displacement:
             logging.warning(f'MTOM found may not be accurate: simulation timestep size ({run_configuration.timestep_size}) may be too large.')
         
-        logging.info(f'STALL_VELOCITY = {optimal_dynamics_model.stall_velocity:.{run_configuration.arithmetic_precision}f} m/s | MTOM = {mass:.{run_configuration.arithmetic_precision}f} kg | LIFTOFF_DISTANCE = {optimal_dynamics_model.get_position_takeoff()} m')
+        logging.info(f'STALL_VELOCITY = {optimal_dynamics_model.stall_velocity:.{run_configuration.arithmetic_precision}f} m/s | MTOM = {mass:.{run_configuration.arithmetic_precision}f} kg | LIFTOFF_DISTANCE = {optimal_dynamics_model.get_position_takeoff()} m' + ('' if self.discretization_error is None else f' | TIMESTEP_SIZE = {run_configuration.timestep_size} | ESTIMATED_DISCRETIZATION_ERROR = {self.discretization_error:.{run_configuration.arithmetic_precision+1}f} kg'))
+        
+        if self.settings.plot_results:
+            previous_phase = PhaseProfiler.enter(OptimizerPhase.PLOTTING_RESULTS)
+            self.result_plotter.submit(f'{run_configuration.identifier}-dt={run_configuration.timestep_size}-xf={optimal_dynamics_model.get_position_takeoff()}-m={mass:.{run_configuration.arithmetic_precision}f}-vf={optimal_dynamics_model.get_velocity_takeoff():.{run_configuration.arithmetic_precision}f}', optimal_dynamics_model, self.results)
+            PhaseProfiler.leave(previous_phase)
         
-        optimal_dynamics_model.plot_model(f'{run_configuration.identifier}-dt={run_configuration.timestep_size}-xf={optimal_dynamics_model.get_position_takeoff()}-m={mass:.{run_configuration.arithmetic_precision}f}-vf={optimal_dynamics_model.get_velocity_takeoff():.{run_configuration.arithmetic_precision}f}', self.results)
+        return result_state, optimal_dynamics_model
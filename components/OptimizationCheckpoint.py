@@ -0,0 +1,133 @@
+import tempfile
+import hashlib
+import pathlib
+import shutil
+import numpy
+import json
+import os
+
+from components.RunConfiguration import RunConfiguration
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+
+class OptimizationCheckpoint:
+    FORMAT_VERSION = 2
+    STATE_PREFIX = 'state_'
+
+    directory: pathlib.Path
+    run_directory: pathlib.Path | None
+    saved_masses: set[numpy.float64]
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+        self.run_directory = None
+        self.saved_masses = set()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_key(self, run_configuration: RunConfiguration, optimizer_settings: list) -> str:
+        key_data = json.dumps([
+            self.FORMAT_VERSION,
+            run_configuration.propeller_hash,
+            run_configuration.motor_hash,
+            float(run_configuration.timestep_size),
+            [float(mass_bound) for mass_bound in run_configuration.mass_range],
+            run_configuration.arithmetic_precision,
+            float(run_configuration.takeoff_displacement),
+            float(run_configuration.setpoint_velocity),
+            run_configuration.get_setpoint(),
+            run_configuration.variable_drag,
+            [float(run_configuration.aerodynamic_forces_fluid_density), float(run_configuration.aerodynamic_forces_true_airspeed), float(run_configuration.aerodynamic_forces_drag_coefficient), float(run_configuration.aerodynamic_forces_reference_area), float(run_configuration.aerodynamic_forces_acceleration_gravity), float(run_configuration.aerodynamic_forces_lift_coefficient)],
+            run_configuration.integration_method.value,
+            float(run_configuration.integration_tolerance),
+            optimizer_settings
+        ])
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def open(self, run_configuration: RunConfiguration, optimizer_settings: list) -> None:
+        self.run_directory = self.directory / f'{run_configuration.identifier}-{self.get_key(run_configuration, optimizer_settings)[:16]}'
+        self.saved_masses = set()
+
+    def get_path(self, completed_epochs: int) -> pathlib.Path:
+        return self.run_directory / f'epoch-{completed_epochs:04d}.npz'
+
+    def save(self, completed_epochs: int, state: dict[str, object], results: dict[numpy.float64, ConstantMassDynamicsModel]) -> None:
+        self.run_directory.mkdir(parents=True, exist_ok=True)
+
+        dynamics_models = [dynamics_model for mass, dynamics_model in results.items() if mass not in self.saved_masses]
+        columns = self.get_result_columns(dynamics_models)
+        columns.update({f'{self.STATE_PREFIX}{name}': numpy.asarray(value) for name, value in state.items()})
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.run_directory, prefix=f'.epoch-{completed_epochs:04d}.', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temporary_file:
+                numpy.savez(temporary_file, **columns)
+            os.replace(temporary_path, self.get_path(completed_epochs))
+        except OSError:
+            pathlib.Path(temporary_path).unlink(missing_ok=True)
+            raise
+
+        self.saved_masses.update(dynamics_model.mass for dynamics_model in dynamics_models)
+
+    def load(self) -> tuple[int, dict[str, numpy.ndarray], dict[numpy.float64, ConstantMassDynamicsModel]] | None:
+        paths = sorted(self.run_directory.glob('epoch-*.npz')) if self.run_directory.exists() else list()
+        if not paths:
+            return None
+
+        results = dict()
+        for path in paths:
+            with numpy.load(path) as columns:
+                for dynamics_model in self.get_results(columns):
+                    results[dynamics_model.mass] = dynamics_model
+                if path == paths[-1]:
+                    state = {name[len(self.STATE_PREFIX):]: columns[name] for name in columns.files if name.startswith(self.STATE_PREFIX)}
+
+        self.saved_masses = set(results)
+        return int(paths[-1].stem.split('-')[1]), state, results
+
+    def remove(self) -> None:
+        if self.run_directory is not None:
+            shutil.rmtree(self.run_directory, ignore_errors=True)
+
+    @classmethod
+    def get_result_columns(cls, dynamics_models: list[ConstantMassDynamicsModel]) -> dict[str, numpy.ndarray]:
+        return {
+            'mass': numpy.array([dynamics_model.mass for dynamics_model in dynamics_models], dtype=numpy.float64),
+            'stall_velocity': numpy.array([dynamics_model.stall_velocity for dynamics_model in dynamics_models], dtype=numpy.float64),
+            'takeoff_located': numpy.array([dynamics_model.takeoff_located for dynamics_model in dynamics_models], dtype=numpy.bool_),
+            'decided_early': numpy.array([dynamics_model.decided_early for dynamics_model in dynamics_models], dtype=numpy.bool_),
+            'decided_success': numpy.array([dynamics_model.decided_success for dynamics_model in dynamics_models], dtype=numpy.bool_),
+            'summary_only': numpy.array([dynamics_model.summary_only for dynamics_model in dynamics_models], dtype=numpy.bool_),
+            'state_offsets': numpy.cumsum([0] + [dynamics_model.time.size for dynamics_model in dynamics_models]),
+            'step_offsets': numpy.cumsum([0] + [dynamics_model.acceleration.size for dynamics_model in dynamics_models]),
+            **{
+                name: numpy.concatenate([getattr(dynamics_model, name) for dynamics_model in dynamics_models]) if dynamics_models else numpy.zeros(0)
+                for name in ('time', 'velocity', 'position', 'acceleration', 'thrust', 'drag')
+            }
+        }
+
+    @classmethod
+    def get_results(cls, columns: numpy.lib.npyio.NpzFile) -> list[ConstantMassDynamicsModel]:
+        state_offsets = columns['state_offsets']
+        step_offsets = columns['step_offsets']
+        state_columns = {name: columns[name] for name in ('time', 'velocity', 'position')}
+        step_columns = {name: columns[name] for name in ('acceleration', 'thrust', 'drag')}
+
+        dynamics_models = list()
+        for i, mass in enumerate(columns['mass']):
+            states = slice(state_offsets[i], state_offsets[i+1])
+            steps = slice(step_offsets[i], step_offsets[i+1])
+            dynamics_models.append(ConstantMassDynamicsModel(
+                mass=mass,
+                stall_velocity=columns['stall_velocity'][i],
+                time=state_columns['time'][states],
+                acceleration=step_columns['acceleration'][steps],
+                velocity=state_columns['velocity'][states],
+                position=state_columns['position'][states],
+                thrust=step_columns['thrust'][steps],
+                drag=step_columns['drag'][steps],
+                takeoff_located=bool(columns['takeoff_located'][i]),
+                decided_early=bool(columns['decided_early'][i]),
+                decided_success=bool(columns['decided_success'][i]),
+                summary_only=bool(columns['summary_only'][i])
+            ))
+
+        return dynamics_models
@@ -0,0 +1,33 @@
+import dataclasses
+import numpy
+
+from components.utils.thrust_sources import ThrustSource
+from components.utils.simulation_engines import SimulationEngine
+from components.utils.search_methods import SearchMethod
+from components.utils.worker_transports import WorkerTransport
+
+@dataclasses.dataclass(frozen=True)
+class OptimizerSettings:
+    velocity_quantum: numpy.float64 = numpy.float64(0.001)
+    prefetch_depth: int = 0
+    thrust_source: ThrustSource = ThrustSource.CACHE
+    sweep_count: int = 4
+    sweep_points: int = 100
+    voltage_points: int = 9
+    simulation_engine: SimulationEngine = SimulationEngine.PROCESS
+    masses_per_epoch: int = 64
+    search_method: SearchMethod = SearchMethod.GRID
+    terminate_early: bool = True
+    timestep_levels: int = 0
+    summary_trajectories: bool = False
+    worker_transport: WorkerTransport = WorkerTransport.PROCESS
+    worker_addresses: tuple[tuple[str, int], ...] = ()
+    worker_authkey: bytes | None = None
+    refresh_rate: float = 10.0
+    plot_results: bool = True
+
+    def __post_init__(self) -> None:
+        if self.timestep_levels < 0:
+            raise ValueError(f'timestep levels ({self.timestep_levels}) cannot be negative')
+        if self.refresh_rate < 0:
+            raise ValueError(f'refresh rate ({self.refresh_rate}) cannot be negative')
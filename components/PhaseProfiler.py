@@ -0,0 +1,139 @@
+import pathlib
+import logging
+import enum
+import json
+import time
+import os
+
+class PhaseProfiler:
+    MINIMUM_TRACE_DURATION = 100_000
+    SETUP_EPOCH = 'setup'
+    FINAL_EPOCH = 'final'
+
+    label: str
+    pid: int
+    phase: enum.Enum | None
+    phase_start: int
+    epoch: str
+    totals: dict[str, list[int]]
+    epoch_totals: dict[str, dict[str, int]]
+    merged_totals: dict[str, dict[str, list[int]]]
+    events: list[tuple[str, str, int, int, int, dict | None]]
+    process_labels: dict[int, str]
+
+    current: 'PhaseProfiler | None' = None
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.pid = os.getpid()
+        self.phase = None
+        self.phase_start = 0
+        self.epoch = self.SETUP_EPOCH
+        self.totals = dict()
+        self.epoch_totals = {self.epoch: dict()}
+        self.merged_totals = dict()
+        self.events = list()
+        self.process_labels = {self.pid: self.label}
+
+    @classmethod
+    def enter(cls, phase: enum.Enum) -> enum.Enum | None:
+        if cls.current is None:
+            return None
+        return cls.current.switch(phase)
+
+    @classmethod
+    def leave(cls, previous_phase: enum.Enum | None) -> None:
+        if cls.current is not None:
+            cls.current.switch(previous_phase, False)
+
+    def activate(self) -> None:
+        PhaseProfiler.current = self
+
+    def switch(self, phase: enum.Enum | None, count: bool = True) -> enum.Enum | None:
+        now = time.perf_counter_ns()
+        previous_phase = self.phase
+
+        if previous_phase is not None:
+            elapsed = now - self.phase_start
+            self.totals.setdefault(previous_phase.name, [0, 0])[0] += elapsed
+            epoch_totals = self.epoch_totals[self.epoch]
+            epoch_totals[previous_phase.name] = epoch_totals.get(previous_phase.name, 0) + elapsed
+            if elapsed >= self.MINIMUM_TRACE_DURATION:
+                self.events.append((previous_phase.name, type(previous_phase).__name__, self.phase_start, elapsed, self.pid, None))
+
+        if phase is not None and count:
+            self.totals.setdefault(phase.name, [0, 0])[1] += 1
+
+        self.phase = phase
+        self.phase_start = now
+        return previous_phase
+
+    def stop(self) -> None:
+        self.switch(None)
+
+    def set_epoch(self, epoch: str) -> None:
+        self.switch(self.phase, False)
+        self.epoch = epoch
+        self.epoch_totals.setdefault(self.epoch, dict())
+
+    def add_event(self, name: str, category: str, start: int, end: int, args: dict | None = None) -> None:
+        self.events.append((name, category, start, end-start, self.pid, args))
+
+    def drain(self) -> dict:
+        self.stop()
+        profile = {'label': self.label, 'pid': self.pid, 'totals': self.totals, 'events': self.events}
+        self.totals = dict()
+        self.events = list()
+        return profile
+
+    def merge(self, profile: dict) -> None:
+        merged_totals = self.merged_totals.setdefault(profile['label'], dict())
+        for phase_name, (duration, calls) in profile['totals'].items():
+            phase_totals = merged_totals.setdefault(phase_name, [0, 0])
+            phase_totals[0] += duration
+            phase_totals[1] += calls
+        self.events.extend(profile['events'])
+        self.process_labels[profile['pid']] = profile['label']
+
+    def get_totals_by_label(self) -> dict[str, dict[str, list[int]]]:
+        self.stop()
+        return {self.label: self.totals, **self.merged_totals}
+
+    def log_summary(self) -> None:
+        rows = [('PROCESS', 'PHASE', 'CALLS', 'TOTAL (s)', 'MEAN (us)', 'SHARE (%)')]
+        for label, totals in self.get_totals_by_label().items():
+            label_duration = sum(duration for duration, _ in totals.values())
+            for phase_name, (duration, calls) in sorted(totals.items(), key=lambda item: item[1][0], reverse=True):
+                rows.append((label, phase_name, str(calls), f'{duration/1e9:.3f}', f'{duration/1e3/max(calls, 1):.1f}', f'{100*duration/max(label_duration, 1):.1f}'))
+        self.log_table('PHASE_PROFILE', rows, 2)
+
+        phase_names = list(dict.fromkeys(phase_name for epoch_totals in self.epoch_totals.values() for phase_name in epoch_totals))
+        rows = [('EPOCH', *phase_names, 'TOTAL')]
+        for epoch, epoch_totals in self.epoch_totals.items():
+            if epoch_totals:
+                rows.append((epoch, *[f'{epoch_totals.get(phase_name, 0)/1e9:.3f}' for phase_name in phase_names], f'{sum(epoch_totals.values())/1e9:.3f}'))
+        self.log_table('EPOCH_PROFILE (s)', rows, 1)
+
+    @classmethod
+    def log_table(cls, title: str, rows: list[tuple[str, ...]], n_label_columns: int) -> None:
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        logging.info(title)
+        for row in rows:
+            logging.info(' | '.join(value.ljust(width) if i < n_label_columns else value.rjust(width) for i, (value, width) in enumerate(zip(row, widths))))
+
+    def write_trace(self, trace_path: pathlib.Path) -> None:
+        self.stop()
+        origin = min((start for _, _, start, _, _, _ in self.events), default=0)
+
+        trace_events = list()
+        for pid, label in self.process_labels.items():
+            trace_events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': pid, 'args': {'name': label}})
+        for name, category, start, duration, pid, args in self.events:
+            trace_event = {'name': name, 'cat': category, 'ph': 'X', 'ts': (start-origin)/1e3, 'dur': duration/1e3, 'pid': pid, 'tid': pid}
+            if args is not None:
+                trace_event['args'] = args
+            trace_events.append(trace_event)
+
+        with open(trace_path, 'w') as trace_file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, trace_file)
+        logging.info(f'PROFILE_TRACE = {trace_path} | TRACE_EVENTS = {len(self.events)}')
@@ -0,0 +1,68 @@
+import numpy
+
+from components.utils.qprop_columns import QpropColumn
+
+class QpropOutputParser:
+    HEADER_MARKER = QpropColumn.THRUST.value
+    COMMENT_CHARACTER = '#'
+
+    column_indices: dict[tuple[str, tuple[QpropColumn, ...]], tuple[list[int], int]] = dict()
+
+    @classmethod
+    def get_header(cls, output: str) -> tuple[str, int]:
+        marker_index = output.find(cls.HEADER_MARKER)
+        if marker_index < 0:
+            raise ValueError(f'QPROP output has no data block: column header "{cls.HEADER_MARKER}" not found')
+
+        header_start = output.rfind('\n', 0, marker_index)+1
+        header_end = output.find('\n', marker_index)
+        if header_end < 0:
+            header_end = len(output)
+
+        return output[header_start:header_end], header_end+1
+
+    @classmethod
+    def get_column_indices(cls, header: str, columns: tuple[QpropColumn, ...]) -> tuple[list[int], int]:
+        column_indices = cls.column_indices.get((header, columns))
+        if column_indices is not None:
+            return column_indices
+
+        labels = header.lstrip(f'{cls.COMMENT_CHARACTER} ').split()
+        missing_columns = [column.value for column in columns if column.value not in labels]
+        if missing_columns:
+            raise ValueError(f'QPROP output has no column(s) {missing_columns}, got {labels}')
+
+        indices = [labels.index(column.value) for column in columns]
+        column_indices = cls.column_indices[(header, columns)] = (indices, max(indices, default=0)+1)
+        return column_indices
+
+    @classmethod
+    def parse(cls, output: str, columns: tuple[QpropColumn, ...], n_rows: int | None = None) -> numpy.ndarray[numpy.float64]:
+        header, data_start = cls.get_header(output)
+        column_indices, n_splits = cls.get_column_indices(header, columns)
+
+        if n_rows == 1:
+            data_end = output.find('\n', data_start)
+            tokens = output[data_start:data_end if data_end >= 0 else len(output)].split(None, n_splits)
+            if len(tokens) < n_splits or tokens[0][0] == cls.COMMENT_CHARACTER:
+                raise ValueError(f'QPROP output has no data rows below its column header')
+
+            data = numpy.empty((1, len(columns)), dtype=numpy.float64)
+            for i, column_index in enumerate(column_indices):
+                data[0, i] = float(tokens[column_index])
+            return data
+
+        lines = output[data_start:].split('\n') if n_rows is None else output[data_start:].split('\n', n_rows)[:n_rows]
+        rows = [line.split(None, n_splits) for line in lines]
+        n_found = next((i for i, tokens in enumerate(rows) if len(tokens) < n_splits or tokens[0][0] == cls.COMMENT_CHARACTER), len(rows))
+
+        if n_found == 0:
+            raise ValueError(f'QPROP output has no data rows below its column header')
+        if n_rows is not None and n_found < n_rows:
+            raise ValueError(f'QPROP output has {n_found} data row(s), expected {n_rows}')
+
+        data = numpy.empty((n_found, len(columns)), dtype=numpy.float64)
+        for i, column_index in enumerate(column_indices):
+            data[:, i] = [tokens[column_index] for tokens in rows[:n_found]]
+
+        return data
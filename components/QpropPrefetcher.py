@@ -0,0 +1,56 @@
+import concurrent.futures
+import subprocess
+import threading
+import asyncio
+import os
+
+class QpropPrefetcher:
+    MAXIMUM_PREFETCHED = 1024
+
+    pid: int
+    loop: asyncio.AbstractEventLoop
+    thread: threading.Thread
+    futures: dict[tuple, concurrent.futures.Future]
+    n_runs: int
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.futures = dict()
+        self.n_runs = 0
+
+    async def run(self, arguments: list[str]) -> str:
+        process = await asyncio.create_subprocess_exec(*arguments, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        output, _ = await process.communicate()
+        return output.decode()
+
+    def get_n_in_flight(self) -> int:
+        return sum(not future.done() for future in self.futures.values())
+
+    def prefetch(self, key: tuple, arguments: list[str]) -> None:
+        if key in self.futures:
+            return
+
+        if len(self.futures) >= self.MAXIMUM_PREFETCHED:
+            for stale_key in [stale_key for stale_key, future in self.futures.items() if future.done()][:len(self.futures)//2]:
+                del self.futures[stale_key]
+
+        self.futures[key] = asyncio.run_coroutine_threadsafe(self.run(arguments), self.loop)
+        self.n_runs += 1
+
+    def get_output(self, key: tuple) -> str | None:
+        future = self.futures.pop(key, None)
+        if future is None:
+            return None
+
+        try:
+            return future.result()
+        except OSError:
+            return None
+
+    def pop_n_runs(self) -> int:
+        n_runs = self.n_runs
+        self.n_runs = 0
+        return n_runs
@@ -0,0 +1,76 @@
+import subprocess
+import numpy
+import os
+
+from components.RunConfiguration import RunConfiguration
+from components.QpropOutputParser import QpropOutputParser
+from components.PhaseProfiler import PhaseProfiler
+from components.utils.qprop_columns import QpropColumn
+from components.utils.process_statuses import ProcessStatus
+
+class QpropThrustSolver:
+    @classmethod
+    def get_thrust(cls, run_configuration: RunConfiguration, velocity: numpy.float64, voltage: numpy.float64 | None = None) -> numpy.float64:
+        completed_process = subprocess.run(run_configuration.get_run_arguments(velocity, voltage), capture_output=True, text=True)
+        return cls.parse_thrust(completed_process.stdout)
+
+    @classmethod
+    def get_thrusts(cls, run_configuration: RunConfiguration, velocities: numpy.ndarray[numpy.float64], voltages: numpy.ndarray[numpy.float64] | None = None) -> numpy.ndarray[numpy.float64]:
+        batch_size = os.cpu_count() or 1
+        thrusts = numpy.empty(velocities.size, dtype=numpy.float64)
+        for batch_start in range(0, velocities.size, batch_size):
+            processes = [
+                subprocess.Popen(run_configuration.get_run_arguments(velocities[i], None if voltages is None else voltages[i]), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+                for i in range(batch_start, min(batch_start+batch_size, velocities.size))
+            ]
+
+            for i, process in enumerate(processes, batch_start):
+                output, _ = process.communicate()
+                thrusts[i] = cls.parse_thrust(output)
+
+        return thrusts
+
+    @classmethod
+    def parse_thrust(cls, output: str) -> numpy.float64:
+        previous_phase = PhaseProfiler.enter(ProcessStatus.EXTRACTING_DATA)
+        data = QpropOutputParser.parse(output, (QpropColumn.THRUST,), 1)
+        PhaseProfiler.leave(previous_phase)
+
+        return numpy.float64(data[0, 0])
+
+    @classmethod
+    def get_sweep_thrusts(cls, run_configuration: RunConfiguration, minimum_velocity: numpy.float64, maximum_velocity: numpy.float64, n_velocities: int) -> tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]]:
+        completed_process = subprocess.run(run_configuration.get_sweep_run_arguments(minimum_velocity, maximum_velocity, n_velocities), capture_output=True, text=True)
+        data = cls.parse_sweep(completed_process.stdout, (QpropColumn.THRUST,), minimum_velocity, maximum_velocity, n_velocities)
+
+        return data[:, 0], data[:, 1]
+
+    @classmethod
+    def parse_sweep(cls, output: str, columns: tuple[QpropColumn, ...], minimum_velocity: numpy.float64, maximum_velocity: numpy.float64, n_velocities: int) -> numpy.ndarray[numpy.float64]:
+        previous_phase = PhaseProfiler.enter(ProcessStatus.EXTRACTING_DATA)
+        data = QpropOutputParser.parse(output, (QpropColumn.VELOCITY,) + columns)
+        PhaseProfiler.leave(previous_phase)
+
+        velocity_tolerance = (maximum_velocity-minimum_velocity) / (2*max(n_velocities-1, 1))
+        if data.shape[0] < n_velocities or abs(data[0, 0]-minimum_velocity) > velocity_tolerance or abs(data[-1, 0]-maximum_velocity) > velocity_tolerance:
+            raise ValueError(f'QPROP sweep of {n_velocities} velocities over [{minimum_velocity}, {maximum_velocity}] m/s returned {data.shape[0]} row(s) over [{data[0, 0]}, {data[-1, 0]}] m/s')
+
+        return data
+
+    @classmethod
+    def get_sweep_operating_points(cls, run_configuration: RunConfiguration, sweeps: list[tuple[numpy.float64, numpy.float64, int, numpy.float64]]) -> list[tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]]]:
+        batch_size = os.cpu_count() or 1
+        operating_points = list()
+        for batch_start in range(0, len(sweeps), batch_size):
+            batch = sweeps[batch_start:batch_start+batch_size]
+            processes = [
+                subprocess.Popen(run_configuration.get_sweep_run_arguments(minimum_velocity, maximum_velocity, n_velocities, voltage), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+                for minimum_velocity, maximum_velocity, n_velocities, voltage in batch
+            ]
+
+            for process, (minimum_velocity, maximum_velocity, n_velocities, _) in zip(processes, batch):
+                output, _ = process.communicate()
+                data = cls.parse_sweep(output, (QpropColumn.THRUST, QpropColumn.CURRENT), minimum_velocity, maximum_velocity, n_velocities)
+                operating_points.append((data[:, 0], data[:, 1], data[:, 2]))
+
+        return operating_points
@@ -0,0 +1,91 @@
+from typing import Iterator
+import contextlib
+import pathlib
+import sqlite3
+import numpy
+import json
+import time
+
+from components.RunConfiguration import RunConfiguration
+
+class ResultHistory:
+    FORMAT_VERSION = 1
+    LOCK_TIMEOUT = 30.0
+    FEATURE_FLOOR = 1e-9
+    MAXIMUM_NEIGHBOURS = 16
+    FEATURES = ('fluid_density', 'true_airspeed', 'drag_coefficient', 'reference_area', 'acceleration_gravity', 'lift_coefficient', 'takeoff_displacement', 'timestep_size')
+    FEATURE_WEIGHTS = (1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 0.01)
+
+    path: pathlib.Path
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self.connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'format_version INTEGER, propeller_hash TEXT, motor_hash TEXT, setpoint TEXT, variable_drag INTEGER, integration_method TEXT, '
+                + ', '.join(f'{feature} REAL' for feature in self.FEATURES) +
+                ', arithmetic_precision INTEGER, mtom REAL, liftoff_velocity REAL, epochs INTEGER, wall_time REAL, recorded_at REAL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS results_thrust ON results (format_version, propeller_hash, motor_hash, setpoint, variable_drag, integration_method)')
+
+    @contextlib.contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        with contextlib.closing(sqlite3.connect(self.path, timeout=self.LOCK_TIMEOUT)) as connection, connection:
+            yield connection
+
+    def get_key(self, run_configuration: RunConfiguration) -> tuple:
+        return (self.FORMAT_VERSION, run_configuration.propeller_hash, run_configuration.motor_hash, json.dumps(run_configuration.get_setpoint() if run_configuration.voltage_profile_variable is None else [run_configuration.get_setpoint(), run_configuration.get_voltage_profile()]), int(run_configuration.variable_drag), run_configuration.integration_method.value)
+
+    def get_features(self, run_configuration: RunConfiguration, timestep_size: numpy.float64 | None = None) -> tuple[float, ...]:
+        return (
+            float(run_configuration.aerodynamic_forces_fluid_density),
+            float(run_configuration.aerodynamic_forces_true_airspeed),
+            float(run_configuration.aerodynamic_forces_drag_coefficient),
+            float(run_configuration.aerodynamic_forces_reference_area),
+            float(run_configuration.aerodynamic_forces_acceleration_gravity),
+            float(run_configuration.aerodynamic_forces_lift_coefficient),
+            float(run_configuration.takeoff_displacement),
+            float(run_configuration.timestep_size if timestep_size is None else timestep_size)
+        )
+
+    def record(self, run_configuration: RunConfiguration, timestep_size: numpy.float64, mtom: numpy.float64, liftoff_velocity: numpy.float64, n_epochs: int, wall_time: float) -> None:
+        row = self.get_key(run_configuration) + self.get_features(run_configuration, timestep_size) + (run_configuration.arithmetic_precision, float(mtom), float(liftoff_velocity), n_epochs, wall_time, time.time())
+        with self.connect() as connection:
+            connection.execute(f'INSERT INTO results VALUES ({", ".join("?" * len(row))})', row)
+
+    def predict(self, run_configuration: RunConfiguration) -> tuple[numpy.float64, numpy.float64, int] | None:
+        with self.connect() as connection:
+            rows = connection.execute(
+                f'SELECT {", ".join(self.FEATURES)}, mtom FROM results WHERE format_version = ? AND propeller_hash = ? AND motor_hash = ? AND setpoint = ? AND variable_drag = ? AND integration_method = ?',
+                self.get_key(run_configuration)
+            ).fetchall()
+        if not rows:
+            return None
+
+        history = numpy.array(rows, dtype=numpy.float64)
+        features = numpy.log(numpy.maximum(history[:, :-1], self.FEATURE_FLOOR)) * self.FEATURE_WEIGHTS
+        log_mtoms = numpy.log(history[:, -1])
+        query = numpy.log(numpy.maximum(numpy.array(self.get_features(run_configuration)), self.FEATURE_FLOOR)) * self.FEATURE_WEIGHTS
+
+        distances = numpy.linalg.norm(features - query, axis=1)
+        neighbours = numpy.argsort(distances, kind='stable')[:self.MAXIMUM_NEIGHBOURS]
+        if distances[neighbours[0]] == 0:
+            exact_mtoms = history[distances == 0, -1]
+            return numpy.float64(numpy.median(exact_mtoms)), numpy.float64(numpy.ptp(exact_mtoms)), int(exact_mtoms.size)
+
+        varying = numpy.ptp(features[neighbours], axis=0) > 0
+        design = numpy.column_stack((numpy.ones(neighbours.size), features[neighbours][:, varying]))
+        if neighbours.size > design.shape[1]:
+            coefficients, _, rank, _ = numpy.linalg.lstsq(design, log_mtoms[neighbours], rcond=None)
+            if rank == design.shape[1]:
+                residuals = log_mtoms[neighbours] - design @ coefficients
+                log_mtom = numpy.concatenate(([1.0], query[varying])) @ coefficients
+                unfitted_distance = numpy.linalg.norm((query - features[neighbours[0]])[~varying])
+                return numpy.float64(numpy.exp(log_mtom)), numpy.float64(numpy.exp(log_mtom) * (2*numpy.max(numpy.abs(residuals)) + unfitted_distance)), int(neighbours.size)
+
+        weights = 1 / distances[neighbours]
+        log_mtom = numpy.sum(weights * log_mtoms[neighbours]) / numpy.sum(weights)
+        return numpy.float64(numpy.exp(log_mtom)), numpy.float64(numpy.exp(log_mtom) * numpy.max(numpy.abs(log_mtoms[neighbours] - log_mtom) + distances[neighbours])), int(neighbours.size)
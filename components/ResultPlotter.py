@@ -0,0 +1,123 @@
+import multiprocessing
+import logging
+import pathlib
+import numpy
+
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+from components.OptimizationCheckpoint import OptimizationCheckpoint
+
+class ResultPlotter:
+    PLOT_POINTS = 2000
+    PLOT_DPI = 300
+    SERIES = ('position', 'velocity', 'acceleration', 'thrust', 'drag')
+
+    context: multiprocessing.context.SpawnContext
+    processes: list[tuple[str, multiprocessing.Process]]
+
+    def __init__(self) -> None:
+        self.context = multiprocessing.get_context('spawn')
+        self.processes = list()
+
+    @classmethod
+    def get_downsampled_indices(cls, x: numpy.ndarray[numpy.float64], y: numpy.ndarray[numpy.float64], n_points: int) -> numpy.ndarray[numpy.int64]:
+        if x.size <= n_points or n_points < 3:
+            return numpy.arange(x.size)
+
+        edges = numpy.linspace(1, x.size-1, n_points-1).astype(numpy.int64)
+        indices = numpy.empty(n_points, dtype=numpy.int64)
+        indices[0] = 0
+        indices[-1] = x.size-1
+
+        selected = 0
+        for i in range(n_points-2):
+            start, end = edges[i], edges[i+1]
+            next_start, next_end = edges[i+1], edges[i+2] if i+2 < edges.size else x.size
+            average_x = x[next_start:next_end].mean()
+            average_y = y[next_start:next_end].mean()
+
+            areas = numpy.abs((x[selected]-average_x) * (y[start:end]-y[selected]) - (x[selected]-x[start:end]) * (average_y-y[selected]))
+            selected = start + int(numpy.argmax(areas))
+            indices[i+1] = selected
+
+        return indices
+
+    @classmethod
+    def get_plot_data(cls, dynamics_model: ConstantMassDynamicsModel, dynamics_models: dict[numpy.float64, ConstantMassDynamicsModel]) -> dict[str, numpy.ndarray[numpy.float64]]:
+        time = dynamics_model.time[:-1]
+        plot_data = dict()
+        for series in cls.SERIES:
+            values = getattr(dynamics_model, series)
+            values = values[:-1] if values.size == dynamics_model.time.size else values
+            indices = cls.get_downsampled_indices(time, values, cls.PLOT_POINTS)
+            plot_data[f'{series}_time'] = time[indices]
+            plot_data[series] = values[indices]
+
+        performance_characteristics = sorted((model.mass, model.stall_velocity, model.get_velocity_takeoff()) for model in dynamics_models.values() if not model.decided_early)
+        plot_data['masses'], plot_data['stall_velocities'], plot_data['velocities'] = (numpy.array(column, dtype=numpy.float64) for column in zip(*performance_characteristics))
+
+        return plot_data
+
+    @classmethod
+    def plot(cls, name: str, plot_data: dict[str, numpy.ndarray[numpy.float64]]) -> None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot
+
+        _, axes = matplotlib.pyplot.subplots(3, 2, figsize=(10, 8))
+
+        for (row, column), series, title, label in (
+            ((0, 0), 'position', 'Position', 'Position (m)'),
+            ((0, 1), 'velocity', 'Velocity', 'Velocity (m/s)'),
+            ((1, 0), 'acceleration', 'Acceleration', 'Acceleration (m/s^2)'),
+            ((1, 1), 'thrust', 'Thrust', 'Thrust (N)'),
+            ((2, 0), 'drag', 'Drag', 'Drag (N)')
+        ):
+            axes[row, column].plot(plot_data[f'{series}_time'], plot_data[series], label=title, color='black')
+            axes[row, column].set_title(f'{title} vs Time')
+            axes[row, column].set_xlabel('Time (s)')
+            axes[row, column].set_ylabel(label)
+            axes[row, column].grid(True)
+
+        axes[2, 1].plot(plot_data['masses'], plot_data['velocities'], label='Final Velocity', color='black')
+        axes[2, 1].plot(plot_data['masses'], plot_data['stall_velocities'], label='Stall Velocity', color='red', linestyle='--')
+        axes[2, 1].set_title('Velocity vs Mass')
+        axes[2, 1].set_xlabel('Mass (kg)')
+        axes[2, 1].set_ylabel('Velocity (m/s)')
+        axes[2, 1].set_xscale('log')
+        axes[2, 1].grid(True)
+        axes[2, 1].legend()
+
+        matplotlib.pyplot.tight_layout()
+        matplotlib.pyplot.savefig(f'{name}.png', dpi=cls.PLOT_DPI)
+        matplotlib.pyplot.close()
+
+    @classmethod
+    def plot_trajectories(cls, trajectories_path: pathlib.Path) -> str:
+        with numpy.load(trajectories_path) as columns:
+            dynamics_models = {dynamics_model.mass: dynamics_model for dynamics_model in OptimizationCheckpoint.get_results(columns)}
+
+        successful_masses = [mass for mass, dynamics_model in dynamics_models.items() if dynamics_model.is_takeoff_successful()]
+        if not successful_masses:
+            raise ValueError(f'trajectories file "{trajectories_path}" holds no mass that takes off')
+
+        dynamics_model = dynamics_models[max(successful_masses)]
+        if dynamics_model.decided_early or dynamics_model.summary_only:
+            raise ValueError(f'trajectories file "{trajectories_path}" does not hold the full trajectory of its heaviest mass that takes off ({dynamics_model.mass} kg)')
+
+        name = f'{trajectories_path.with_suffix("")}-xf={dynamics_model.get_position_takeoff()}-m={dynamics_model.mass}-vf={dynamics_model.get_velocity_takeoff()}'
+        cls.plot(name, cls.get_plot_data(dynamics_model, dynamics_models))
+        return name
+
+    def submit(self, name: str, dynamics_model: ConstantMassDynamicsModel, dynamics_models: dict[numpy.float64, ConstantMassDynamicsModel]) -> None:
+        process = self.context.Process(target=self.plot, args=(name, self.get_plot_data(dynamics_model, dynamics_models)), daemon=False)
+        process.start()
+        self.processes.append((name, process))
+
+    def join(self) -> None:
+        for name, process in self.processes:
+            process.join()
+            if process.exitcode != 0:
+                logging.warning(f'Plotting "{name}.png" failed with exit code {process.exitcode}')
+            else:
+                logging.info(f'PLOT_OUTPUT = {name}.png')
+        self.processes.clear()
@@ -1,14 +1,24 @@
+import hashlib
 import pathlib
 import numpy
+import copy
 import json
 
-from components.utils.config_structure import get_config_structure, EXPECTED_CONFIGURATION_STRUCTURE
+from components.utils.config_structure import get_config_structure, get_expected_config_structure
+from components.utils.integration_methods import IntegrationMethod
+from components.utils.uncertainty_distributions import UncertaintyDistribution
+from components.utils.voltage_profile_variables import VoltageProfileVariable
 
 class RunConfiguration:
+    UNCERTAIN_AERODYNAMIC_FORCES = ('fluid_density', 'drag_coefficient', 'reference_area', 'lift_coefficient')
+    
     identifier: str
+    json_data: dict
     variable_drag: bool
     propeller_file: pathlib.Path
+    propeller_hash: str
     motor_file: pathlib.Path
+    motor_hash: str
     timestep_size: numpy.float64
     mass_range: tuple[numpy.float64, numpy.float64]
     arithmetic_precision: int
@@ -27,32 +37,50 @@ class RunConfiguration:
     aerodynamic_forces_reference_area: numpy.float64
     aerodynamic_forces_acceleration_gravity: numpy.float64
     aerodynamic_forces_lift_coefficient: numpy.float64
+    integration_method: IntegrationMethod
+    integration_tolerance: numpy.float64
+    uncertainty_samples: int
+    uncertainty_seed: int | None
+    uncertainty_distribution: UncertaintyDistribution
+    uncertainty_fluid_density: numpy.float64
+    uncertainty_drag_coefficient: numpy.float64
+    uncertainty_reference_area: numpy.float64
+    uncertainty_lift_coefficient: numpy.float64
+    voltage_profile_variable: VoltageProfileVariable | None
+    voltage_profile_breakpoints: numpy.ndarray[numpy.float64]
+    voltage_profile_voltages: numpy.ndarray[numpy.float64]
     
-    def __init__(self, json_path: pathlib.Path) -> None:
-        self.identifier = json_path.stem
+    def __init__(self, json_path: pathlib.Path, json_data: dict | None = None, identifier: str | None = None) -> None:
+        self.identifier = json_path.stem if identifier is None else identifier
         
-        with open(json_path, 'r') as json_file:
-            json_data = json.load(json_file)
+        if json_data is None:
+            with open(json_path, 'r') as json_file:
+                json_data = json.load(json_file)
         
-        json_structure = get_config_structure(json_data)
-        if json_structure != EXPECTED_CONFIGURATION_STRUCTURE:
+        expected_structure = get_expected_config_structure(json_data)
+        json_structure = get_config_structure(json_data, expected_structure)
+        if json_structure != expected_structure:
             raise SyntaxError(
                 f'structure of configuration file "{json_path}" is invalid\n'
                 f'\nGOT:\n\n'
                 f'{json_structure}\n'
                 f'\nEXPECTED:\n\n'
-                f'{EXPECTED_CONFIGURATION_STRUCTURE}\n'
+                f'{expected_structure}\n'
             )
         
+        self.json_data = copy.deepcopy(json_data)
+        
         self.variable_drag = json_data['aerodynamic_forces']['true_airspeed'] is None
 
         self.propeller_file = pathlib.Path(json_data['propeller_file'])
         if not self.propeller_file.exists():
             raise FileNotFoundError(f'propeller file "{self.propeller_file}" not found')
+        self.propeller_hash = hashlib.sha256(self.propeller_file.read_bytes()).hexdigest()
         
         self.motor_file = pathlib.Path(json_data['motor_file'])
         if not self.motor_file.exists():
             raise FileNotFoundError(f'motor file "{self.motor_file}" not found')
+        self.motor_hash = hashlib.sha256(self.motor_file.read_bytes()).hexdigest()
         
         self.timestep_size = numpy.float64(json_data['timestep_size'])
 
@@ -95,9 +123,113 @@ class RunConfiguration:
         self.aerodynamic_forces_lift_coefficient = numpy.float64(1.0) if json_data['aerodynamic_forces']['lift_coefficient'] is None else numpy.float64(json_data['aerodynamic_forces']['lift_coefficient'])
         if self.aerodynamic_forces_lift_coefficient == 0:
             raise ZeroDivisionError(f'lift_coefficient cannot be 0')
+        
+        integration = json_data.get('integration', {'method': None, 'tolerance': None})
+        
+        integration_methods = [integration_method.value for integration_method in IntegrationMethod]
+        if integration['method'] is not None and integration['method'] not in integration_methods:
+            raise ValueError(f'integration method "{integration["method"]}" must be one of {integration_methods}')
+        self.integration_method = IntegrationMethod.EULER if integration['method'] is None else IntegrationMethod(integration['method'])
+        
+        self.integration_tolerance = numpy.float64(1e-6) if integration['tolerance'] is None else numpy.float64(integration['tolerance'])
+        if self.integration_tolerance <= 0:
+            raise ValueError(f'integration tolerance ({self.integration_tolerance}) must be positive')
+        
+        uncertainty = json_data.get('uncertainty')
+        
+        self.uncertainty_samples = 0 if uncertainty is None else 1000 if uncertainty['samples'] is None else uncertainty['samples']
+        if uncertainty is not None and self.uncertainty_samples < 1:
+            raise ValueError(f'uncertainty samples ({self.uncertainty_samples}) must be at least 1')
+        
+        self.uncertainty_seed = None if uncertainty is None else uncertainty['seed']
+        
+        uncertainty_distributions = [uncertainty_distribution.value for uncertainty_distribution in UncertaintyDistribution]
+        if uncertainty is not None and uncertainty['distribution'] is not None and uncertainty['distribution'] not in uncertainty_distributions:
+            raise ValueError(f'uncertainty distribution "{uncertainty["distribution"]}" must be one of {uncertainty_distributions}')
+        self.uncertainty_distribution = UncertaintyDistribution.NORMAL if uncertainty is None or uncertainty['distribution'] is None else UncertaintyDistribution(uncertainty['distribution'])
+        
+        for aerodynamic_force in self.UNCERTAIN_AERODYNAMIC_FORCES:
+            spread = numpy.float64(0) if uncertainty is None or uncertainty[aerodynamic_force] is None else numpy.float64(uncertainty[aerodynamic_force])
+            if spread < 0:
+                raise ValueError(f'uncertainty of {aerodynamic_force} ({spread}) cannot be negative')
+            setattr(self, f'uncertainty_{aerodynamic_force}', spread)
+        
+        voltage_profile = json_data.get('voltage_profile')
+        
+        voltage_profile_variables = [voltage_profile_variable.value for voltage_profile_variable in VoltageProfileVariable]
+        if voltage_profile is not None and voltage_profile['variable'] is not None and voltage_profile['variable'] not in voltage_profile_variables:
+            raise ValueError(f'voltage profile variable "{voltage_profile["variable"]}" must be one of {voltage_profile_variables}')
+        self.voltage_profile_variable = None if voltage_profile is None else VoltageProfileVariable.TIME if voltage_profile['variable'] is None else VoltageProfileVariable(voltage_profile['variable'])
+        
+        self.voltage_profile_breakpoints = numpy.array([] if voltage_profile is None else voltage_profile['breakpoints'], dtype=numpy.float64)
+        self.voltage_profile_voltages = numpy.array([] if voltage_profile is None else voltage_profile['voltages'], dtype=numpy.float64)
+        if voltage_profile is not None:
+            if self.voltage_profile_breakpoints.size != self.voltage_profile_voltages.size:
+                raise ValueError(f'voltage profile has {self.voltage_profile_breakpoints.size} breakpoint(s) but {self.voltage_profile_voltages.size} voltage(s)')
+            if not numpy.all(numpy.diff(self.voltage_profile_breakpoints) > 0):
+                raise ValueError(f'voltage profile breakpoints must be strictly increasing')
+            if numpy.any(self.voltage_profile_voltages <= 0):
+                raise ValueError(f'voltage profile voltages must be positive')
+            if numpy.unique(self.voltage_profile_voltages).size < 2:
+                raise ValueError(f'voltage profile must span at least 2 distinct voltages, use the "voltage" setpoint for a constant voltage')
+            if self.setpoint_rpm > 0:
+                raise ValueError(f'voltage profile cannot be combined with an "rpm" setpoint')
+    
+    def get_document(self) -> dict:
+        document = copy.deepcopy(self.json_data)
+        document['timestep_size'] = float(self.timestep_size)
+        document['mass_range'] = [float(self.mass_range[0]), float(self.mass_range[1])]
+        
+        return document
+    
+    def get_setpoint(self) -> tuple[float, float, float, float, float, float, float]:
+        return (float(self.setpoint_rpm), float(self.setpoint_voltage), float(self.setpoint_dbeta), float(self.setpoint_thrust), float(self.setpoint_torque), float(self.setpoint_current), float(self.setpoint_pele))
+    
+    def get_voltage_profile(self) -> tuple[str, tuple[float, ...], tuple[float, ...]] | None:
+        if self.voltage_profile_variable is None:
+            return None
+        
+        return (self.voltage_profile_variable.value, tuple(self.voltage_profile_breakpoints.tolist()), tuple(self.voltage_profile_voltages.tolist()))
+    
+    def get_profile_voltage(self, value: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        return numpy.interp(value, self.voltage_profile_breakpoints, self.voltage_profile_voltages)
+    
+    def get_run_arguments(self, velocity: numpy.float64 | str, voltage: numpy.float64 | None = None) -> list[str]:
+        return ['qprop', str(self.propeller_file), str(self.motor_file), f'{velocity}', f'{self.setpoint_rpm}', f'{self.setpoint_voltage if voltage is None else voltage}', f'{self.setpoint_dbeta}', f'{self.setpoint_thrust}', f'{self.setpoint_torque}', f'{self.setpoint_current}', f'{self.setpoint_pele}']
+    
+    def get_sweep_run_arguments(self, minimum_velocity: numpy.float64, maximum_velocity: numpy.float64, n_velocities: int, voltage: numpy.float64 | None = None) -> list[str]:
+        return self.get_run_arguments(f'{minimum_velocity},{maximum_velocity}/{n_velocities}', voltage)
     
     def get_run_string(self, velocity: numpy.float64) -> str:
-        return f'qprop {self.propeller_file} {self.motor_file} {velocity} {self.setpoint_rpm} {self.setpoint_voltage} {self.setpoint_dbeta} {self.setpoint_thrust} {self.setpoint_torque} {self.setpoint_current} {self.setpoint_pele}'
+        return ' '.join(self.get_run_arguments(velocity))
+    
+    def get_uncertainty_spreads(self) -> dict[str, numpy.float64]:
+        return {aerodynamic_force: getattr(self, f'uncertainty_{aerodynamic_force}') for aerodynamic_force in self.UNCERTAIN_AERODYNAMIC_FORCES if getattr(self, f'uncertainty_{aerodynamic_force}') > 0}
+    
+    def get_ensemble(self, samples: dict[str, numpy.ndarray[numpy.float64]]) -> 'RunConfiguration':
+        ensemble = copy.copy(self)
+        for aerodynamic_force, values in samples.items():
+            setattr(ensemble, f'aerodynamic_forces_{aerodynamic_force}', numpy.asarray(values, dtype=numpy.float64))
+        
+        return ensemble
+    
+    def get_refinement(self, timestep_size: numpy.float64, mass_range: tuple[numpy.float64, numpy.float64]) -> 'RunConfiguration':
+        refinement = copy.copy(self)
+        refinement.timestep_size = numpy.float64(timestep_size)
+        refinement.mass_range = (numpy.float64(mass_range[0]), numpy.float64(mass_range[1]))
+        
+        return refinement
+    
+    def get_ensemble_subset(self, indices: numpy.ndarray) -> 'RunConfiguration':
+        sampled_forces = [aerodynamic_force for aerodynamic_force in self.UNCERTAIN_AERODYNAMIC_FORCES if numpy.ndim(getattr(self, f'aerodynamic_forces_{aerodynamic_force}')) > 0]
+        if not sampled_forces:
+            return self
+        
+        subset = copy.copy(self)
+        for aerodynamic_force in sampled_forces:
+            setattr(subset, f'aerodynamic_forces_{aerodynamic_force}', getattr(self, f'aerodynamic_forces_{aerodynamic_force}')[indices])
+        
+        return subset
     
     def get_drag_force(self, velocity: numpy.float64) -> numpy.float64:
         return numpy.float64(0.5) * self.aerodynamic_forces_fluid_density * numpy.power(velocity if self.variable_drag else self.aerodynamic_forces_true_airspeed, 2, dtype=numpy.float64) * self.aerodynamic_forces_drag_coefficient * self.aerodynamic_forces_reference_area
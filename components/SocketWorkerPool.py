@@ -0,0 +1,233 @@
+from multiprocessing.connection import Client, Connection, wait
+import collections
+import logging
+import time
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+from components.WorkerTelemetry import WorkerTelemetry
+from components.WorkerMessage import WorkerMessage
+from components.utils.process_statuses import ProcessStatus
+
+class SocketWorkerPool:
+    MAXIMUM_RETRIES = 3
+
+    n_workers: int
+    epoch_id: int
+    telemetry: WorkerTelemetry
+
+    addresses: list[tuple[str, int]]
+    authkey: bytes
+    connections: list[Connection | None]
+    capacities: list[int]
+    configuration_message: list | None
+
+    task_id: int
+    tasks: dict[int, tuple[int, int, numpy.float64]]
+    task_ids: dict[tuple[int, int], int]
+    pending: collections.deque[int]
+    executors: dict[int, set[int]]
+    dispatch_times: dict[int, float]
+    attempts: dict[int, int]
+    completed_tasks: set[int]
+    daemon_tasks: list[set[int]]
+    ready_results: collections.deque[tuple[int, int, ConstantMassDynamicsModel | None]]
+
+    def __init__(self, addresses: list[tuple[str, int]], authkey: bytes) -> None:
+        if not addresses:
+            raise ValueError(f'socket transport requires at least 1 worker daemon address')
+
+        self.epoch_id = 0
+        self.addresses = addresses
+        self.authkey = authkey
+        self.connections = [None] * len(self.addresses)
+        self.capacities = [0] * len(self.addresses)
+        self.configuration_message = None
+
+        self.task_id = 0
+        self.tasks = dict()
+        self.task_ids = dict()
+        self.pending = collections.deque()
+        self.executors = dict()
+        self.dispatch_times = dict()
+        self.attempts = dict()
+        self.completed_tasks = set()
+        self.daemon_tasks = [set() for _ in self.addresses]
+        self.ready_results = collections.deque()
+
+        for i in range(len(self.addresses)):
+            self.connect(i)
+
+        self.n_workers = sum(self.capacities)
+        if self.n_workers == 0:
+            raise ConnectionError(f'no worker daemon could be reached at {", ".join(f"{host}:{port}" for host, port in self.addresses)}')
+        self.telemetry = WorkerTelemetry(self.n_workers)
+
+        logging.info(f'WORKER_DAEMONS = {sum(connection is not None for connection in self.connections)}/{len(self.addresses)} | WORKERS = {self.n_workers}')
+
+    def connect(self, daemon_index: int, warn: bool = True) -> bool:
+        host, port = self.addresses[daemon_index]
+        try:
+            connection = Client((host, port), authkey=self.authkey)
+            _, capacity = WorkerMessage.receive(connection)
+            capacity = int(capacity)
+            if self.configuration_message is not None:
+                WorkerMessage.send(connection, self.configuration_message)
+        except (EOFError, OSError, ValueError, TypeError) as e:
+            if warn:
+                logging.warning(f'Worker daemon {host}:{port} cannot be reached: {e}')
+            return False
+
+        self.connections[daemon_index] = connection
+        self.capacities[daemon_index] = capacity
+        return True
+
+    def configure(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, terminate_early: bool, summary_only: bool = False, profile: bool = False) -> None:
+        if profile:
+            logging.warning(f'Worker daemons are not profiled, only the optimizer phases are timed...')
+
+        self.configuration_message = WorkerMessage.get_configure_message(run_configuration, thrust_model, terminate_early, summary_only)
+
+        for i, connection in enumerate(self.connections):
+            if connection is not None:
+                self.send(i, self.configuration_message)
+
+    def send(self, daemon_index: int, message: list | None) -> None:
+        try:
+            WorkerMessage.send(self.connections[daemon_index], message)
+        except OSError as e:
+            self.disconnect(daemon_index, e)
+
+    def submit(self, MASS_SPACE: numpy.ndarray[numpy.float64]) -> int:
+        if len(MASS_SPACE) > self.n_workers:
+            raise ValueError(f'number of masses ({len(MASS_SPACE)}) cannot exceed the number of workers ({self.n_workers})')
+
+        for i, connection in enumerate(self.connections):
+            if connection is None and self.connect(i, False):
+                logging.info(f'WORKER_DAEMON_RECONNECTED = {self.addresses[i][0]}:{self.addresses[i][1]}')
+
+        self.epoch_id += 1
+        self.tasks.clear()
+        self.task_ids.clear()
+        self.attempts.clear()
+        self.completed_tasks.clear()
+        for i, mass in enumerate(MASS_SPACE):
+            self.task_id += 1
+            self.tasks[self.task_id] = (self.epoch_id, i, mass)
+            self.task_ids[(self.epoch_id, i)] = self.task_id
+            self.executors[self.task_id] = set()
+            self.attempts[self.task_id] = 0
+            self.pending.append(self.task_id)
+
+        self.dispatch()
+        return self.epoch_id
+
+    def dispatch(self) -> None:
+        for i, connection in enumerate(self.connections):
+            while connection is not None and len(self.daemon_tasks[i]) < self.capacities[i]:
+                if self.pending:
+                    task_id = self.pending.popleft()
+                else:
+                    stealable_tasks = [task_id for task_id, executors in self.executors.items() if task_id in self.tasks and task_id not in self.completed_tasks and len(executors) == 1 and i not in executors]
+                    if not stealable_tasks:
+                        break
+                    task_id = min(stealable_tasks, key=lambda task_id: self.dispatch_times[task_id])
+
+                self.executors[task_id].add(i)
+                self.daemon_tasks[i].add(task_id)
+                self.dispatch_times.setdefault(task_id, time.monotonic())
+                self.send(i, ['simulate', task_id, float(self.tasks[task_id][2])])
+                connection = self.connections[i]
+
+    def cancel(self, epoch_id: int, worker_index: int) -> None:
+        task_id = self.task_ids.get((epoch_id, worker_index))
+        if task_id is None or task_id in self.completed_tasks:
+            return
+
+        if task_id in self.pending:
+            self.pending.remove(task_id)
+            self.complete(task_id, None)
+            return
+
+        for i in list(self.executors[task_id]):
+            if self.connections[i] is not None:
+                self.send(i, ['cancel', task_id])
+
+    def complete(self, task_id: int, dynamics_model: ConstantMassDynamicsModel | None) -> None:
+        epoch_id, worker_index, _ = self.tasks[task_id]
+        self.completed_tasks.add(task_id)
+        self.ready_results.append((epoch_id, worker_index, dynamics_model))
+
+        if dynamics_model is not None and dynamics_model.time.size:
+            self.telemetry.update(worker_index, dynamics_model.time[-1], dynamics_model.position[-1], dynamics_model.velocity[-1], dynamics_model.acceleration[-1] if dynamics_model.acceleration.size else 0.0, dynamics_model.thrust[-1] if dynamics_model.thrust.size else 0.0, dynamics_model.drag[-1] if dynamics_model.drag.size else 0.0)
+            self.telemetry.set_status(worker_index, ProcessStatus.SUCCESS_TAKEOFF if dynamics_model.is_takeoff_successful() else ProcessStatus.FAILED_VELOCITY)
+
+        self.dispatch_times.pop(task_id, None)
+        for i in self.executors.pop(task_id, set()):
+            if self.connections[i] is not None:
+                self.send(i, ['cancel', task_id])
+
+    def disconnect(self, daemon_index: int, error: Exception) -> None:
+        connection = self.connections[daemon_index]
+        if connection is None:
+            return
+
+        host, port = self.addresses[daemon_index]
+        logging.warning(f'Lost worker daemon {host}:{port}: {error or type(error).__name__}')
+        connection.close()
+        self.connections[daemon_index] = None
+
+        for task_id in self.daemon_tasks[daemon_index]:
+            executors = self.executors.get(task_id)
+            if executors is None:
+                continue
+            executors.discard(daemon_index)
+            if executors or task_id not in self.tasks or task_id in self.completed_tasks:
+                continue
+
+            self.attempts[task_id] += 1
+            if self.attempts[task_id] > self.MAXIMUM_RETRIES:
+                raise RuntimeError(f'mass {self.tasks[task_id][2]} was lost by worker daemons more than {self.MAXIMUM_RETRIES} times')
+            self.pending.appendleft(task_id)
+        self.daemon_tasks[daemon_index].clear()
+
+        if all(connection is None for connection in self.connections):
+            raise RuntimeError(f'all worker daemons were lost')
+
+    def receive(self, daemon_index: int) -> None:
+        try:
+            _, task_id, columns = WorkerMessage.receive(self.connections[daemon_index])
+            dynamics_model = WorkerMessage.get_dynamics_model(columns)
+        except (EOFError, OSError, ValueError, TypeError, KeyError) as e:
+            self.disconnect(daemon_index, e)
+            return
+
+        self.daemon_tasks[daemon_index].discard(task_id)
+        if task_id in self.executors:
+            self.executors[task_id].discard(daemon_index)
+            if task_id in self.tasks and task_id not in self.completed_tasks:
+                self.complete(task_id, dynamics_model)
+
+    def get_result(self, timeout: float) -> tuple[int, int, ConstantMassDynamicsModel | None] | None:
+        if not self.ready_results:
+            live_connections = {connection: i for i, connection in enumerate(self.connections) if connection is not None}
+            for connection in wait(list(live_connections), timeout):
+                self.receive(live_connections[connection])
+            self.dispatch()
+
+        return self.ready_results.popleft() if self.ready_results else None
+
+    def close(self) -> None:
+        for i, connection in enumerate(self.connections):
+            if connection is not None:
+                try:
+                    WorkerMessage.send(connection, None)
+                except OSError:
+                    pass
+                connection.close()
+                self.connections[i] = None
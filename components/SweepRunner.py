@@ -0,0 +1,184 @@
+import multiprocessing
+import dataclasses
+import itertools
+import logging
+import pathlib
+import glob
+import copy
+import json
+import csv
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.MaximumTakeOffMassOptimizer import MaximumTakeOffMassOptimizer
+from components.OptimizerSettings import OptimizerSettings
+from components.ThrustCache import ThrustCache, ThrustCacheManager
+from components.ThrustTable import ThrustTable
+from components.ThrustGrid import ThrustGrid
+from components.ThrustTableStore import ThrustTableStore
+from components.ResultHistory import ResultHistory
+from components.utils.simulation_engines import SimulationEngine
+
+class SweepRunner:
+    GLOB_CHARACTERS = '*?['
+    RESULT_COLUMNS = ['identifier', 'result', 'mtom', 'stall_velocity', 'liftoff_distance', 'liftoff_velocity', 'error']
+
+    template_path: pathlib.Path
+    template_data: dict
+    axes: dict[str, list]
+
+    worker_thrust_cache: ThrustCache | None = None
+
+    def __init__(self, sweep_path: pathlib.Path) -> None:
+        with open(sweep_path, 'r') as sweep_file:
+            sweep_data = json.load(sweep_file)
+
+        if not isinstance(sweep_data, dict) or not isinstance(sweep_data.get('template'), str) or not isinstance(sweep_data.get('axes'), dict) or not all(isinstance(values, list) and values for values in sweep_data['axes'].values()):
+            raise SyntaxError(f'structure of sweep file "{sweep_path}" is invalid: expected {{"template": str, "axes": {{str: [value, ...], ...}}}}')
+
+        self.template_path = pathlib.Path(sweep_data['template'])
+        if not self.template_path.exists():
+            raise FileNotFoundError(f'sweep template file "{self.template_path}" not found')
+
+        with open(self.template_path, 'r') as template_file:
+            self.template_data = json.load(template_file)
+
+        self.axes = dict()
+        for axis, values in sweep_data['axes'].items():
+            parent = self.template_data
+            keys = axis.split('.')
+            for key in keys[:-1]:
+                parent = parent.get(key) if isinstance(parent, dict) else None
+            if not isinstance(parent, dict) or keys[-1] not in parent:
+                raise KeyError(f'sweep axis "{axis}" does not exist in template "{self.template_path}"')
+
+            self.axes[axis] = list()
+            for value in values:
+                if isinstance(value, str) and any(character in value for character in self.GLOB_CHARACTERS):
+                    self.axes[axis].extend(sorted(path for path in glob.glob(value) if pathlib.Path(path).is_file()))
+                else:
+                    self.axes[axis].append(value)
+            if not self.axes[axis]:
+                raise ValueError(f'sweep axis "{axis}" has no values')
+
+    def get_run_configurations(self) -> list[tuple[RunConfiguration, dict]]:
+        run_configurations = list()
+        for values in itertools.product(*self.axes.values()):
+            json_data = copy.deepcopy(self.template_data)
+            identifier_parts = [self.template_path.stem]
+            for axis, value in zip(self.axes, values):
+                parent = json_data
+                keys = axis.split('.')
+                for key in keys[:-1]:
+                    parent = parent[key]
+                parent[keys[-1]] = value
+                identifier_parts.append(pathlib.Path(value).name if keys[-1].endswith('_file') else f'{keys[-1]}={value}')
+
+            run_configurations.append((RunConfiguration(self.template_path, json_data, '-'.join(identifier_parts)), dict(zip(self.axes, values))))
+
+        return run_configurations
+
+    @classmethod
+    def get_thrust_key(cls, run_configuration: RunConfiguration) -> tuple:
+        voltage_profile_voltages = run_configuration.voltage_profile_voltages
+        return (run_configuration.propeller_hash, run_configuration.motor_hash, run_configuration.get_setpoint(), (float(numpy.min(voltage_profile_voltages)), float(numpy.max(voltage_profile_voltages))) if voltage_profile_voltages.size else None)
+
+    @classmethod
+    def get_job_cost(cls, run_configuration: RunConfiguration, static_thrust: numpy.float64, masses_per_epoch: int) -> numpy.float64:
+        mass_span = (run_configuration.mass_range[1]-run_configuration.mass_range[0]) * 10**run_configuration.arithmetic_precision
+        n_epochs = numpy.log(max(mass_span, 2)) / numpy.log(masses_per_epoch+1)
+        takeoff_time = numpy.sqrt(2 * run_configuration.takeoff_displacement * run_configuration.mass_range[1] / max(static_thrust, 1e-3))
+        return n_epochs * takeoff_time / run_configuration.timestep_size
+
+    @classmethod
+    def initialize_worker(cls, thrust_cache: ThrustCache) -> None:
+        cls.worker_thrust_cache = thrust_cache
+        logging.getLogger().setLevel(logging.WARNING)
+
+    @classmethod
+    def build_thrust_table(cls, task: tuple[tuple, RunConfiguration, OptimizerSettings, ThrustTableStore | None]) -> tuple[tuple, type[ThrustTable] | type[ThrustGrid] | None, tuple[numpy.ndarray[numpy.float64], ...] | None, numpy.float64 | None, str | None]:
+        thrust_key, run_configuration, optimizer_settings, thrust_table_store = task
+        try:
+            if run_configuration.voltage_profile_variable is None:
+                thrust_model = ThrustTable.build(run_configuration, cls.worker_thrust_cache, optimizer_settings.sweep_count, optimizer_settings.sweep_points, thrust_table_store)
+            else:
+                thrust_model = ThrustGrid.build(run_configuration, cls.worker_thrust_cache, optimizer_settings.sweep_count, optimizer_settings.sweep_points, optimizer_settings.voltage_points, thrust_table_store)
+        except Exception as e:
+            return thrust_key, None, None, None, f'{type(e).__name__}: {e}'
+
+        return thrust_key, type(thrust_model), tuple(numpy.array(getattr(thrust_model, array)) for array in type(thrust_model).ARRAYS), thrust_model.get_thrust(run_configuration, thrust_model.velocities[0]), None
+
+    @classmethod
+    def run_job(cls, task: tuple[int, RunConfiguration, type[ThrustTable] | type[ThrustGrid], tuple[numpy.ndarray[numpy.float64], ...], OptimizerSettings, ResultHistory | None]) -> tuple[int, dict]:
+        job_index, run_configuration, thrust_model_type, thrust_arrays, optimizer_settings, result_history = task
+        result = {'identifier': run_configuration.identifier}
+        try:
+            optimizer = MaximumTakeOffMassOptimizer(
+                1,
+                dataclasses.replace(optimizer_settings, simulation_engine=SimulationEngine.VECTORIZED, summary_trajectories=True, refresh_rate=0, plot_results=False),
+                thrust_cache=cls.worker_thrust_cache,
+                result_history=result_history
+            )
+            result_state, optimal_dynamics_model = optimizer.run(run_configuration, thrust_model_type(*thrust_arrays, cls.worker_thrust_cache))
+        except Exception as e:
+            result['result'] = 'ERROR'
+            result['error'] = f'{type(e).__name__}: {e}'
+            return job_index, result
+
+        result['result'] = result_state.name
+        if optimal_dynamics_model is not None:
+            result['mtom'] = f'{optimal_dynamics_model.mass:.{run_configuration.arithmetic_precision}f}'
+            result['stall_velocity'] = f'{optimal_dynamics_model.stall_velocity:.{run_configuration.arithmetic_precision}f}'
+            result['liftoff_distance'] = f'{optimal_dynamics_model.get_position_takeoff():.{run_configuration.arithmetic_precision}f}'
+            result['liftoff_velocity'] = f'{optimal_dynamics_model.get_velocity_takeoff():.{run_configuration.arithmetic_precision}f}'
+
+        return job_index, result
+
+    def run(self, n_workers: int, output_path: pathlib.Path, optimizer_settings: OptimizerSettings, thrust_table_store: ThrustTableStore | None = None, result_history: ResultHistory | None = None) -> None:
+        run_configurations = self.get_run_configurations()
+
+        thrust_tasks = dict()
+        for run_configuration, _ in run_configurations:
+            thrust_key = self.get_thrust_key(run_configuration)
+            if thrust_key not in thrust_tasks or ThrustTable.get_velocity_bound(run_configuration) > ThrustTable.get_velocity_bound(thrust_tasks[thrust_key]):
+                thrust_tasks[thrust_key] = run_configuration
+
+        logging.info(f'SWEEP_JOBS = {len(run_configurations)} | DISTINCT_THRUST_TABLES = {len(thrust_tasks)} | WORKERS = {n_workers}')
+
+        manager = ThrustCacheManager()
+        manager.start()
+        thrust_cache = ThrustCache(manager, optimizer_settings.velocity_quantum)
+
+        results: list[dict] = [dict() for _ in run_configurations]
+        try:
+            with multiprocessing.Pool(n_workers, initializer=self.initialize_worker, initargs=(thrust_cache,)) as pool:
+                thrust_tables = dict()
+                for thrust_key, thrust_model_type, thrust_arrays, static_thrust, error in pool.imap_unordered(self.build_thrust_table, [(thrust_key, run_configuration, optimizer_settings, thrust_table_store) for thrust_key, run_configuration in thrust_tasks.items()]):
+                    thrust_tables[thrust_key] = (thrust_model_type, thrust_arrays, static_thrust, error)
+
+                jobs = list()
+                for job_index, (run_configuration, _) in enumerate(run_configurations):
+                    thrust_model_type, thrust_arrays, static_thrust, error = thrust_tables[self.get_thrust_key(run_configuration)]
+                    if error is not None:
+                        results[job_index] = {'identifier': run_configuration.identifier, 'result': 'ERROR', 'error': error}
+                        continue
+                    jobs.append((self.get_job_cost(run_configuration, static_thrust, optimizer_settings.masses_per_epoch), (job_index, run_configuration, thrust_model_type, thrust_arrays, optimizer_settings, result_history)))
+
+                jobs.sort(key=lambda job: job[0], reverse=True)
+
+                for n_completed, (job_index, result) in enumerate(pool.imap_unordered(self.run_job, [job for _, job in jobs], chunksize=1), start=1):
+                    results[job_index] = result
+                    logging.info(f'JOB {n_completed}/{len(jobs)} | CONFIG = {result["identifier"]} | RESULT = {result["result"]} | MTOM = {result.get("mtom", "-")} kg')
+        finally:
+            manager.shutdown()
+
+        with open(output_path, 'w', newline='') as output_file:
+            writer = csv.DictWriter(output_file, fieldnames=self.RESULT_COLUMNS[:1] + list(self.axes) + self.RESULT_COLUMNS[1:])
+            writer.writeheader()
+            for (_, axis_values), result in zip(run_configurations, results):
+                writer.writerow({**axis_values, **result})
+
+        n_errors = sum(result.get('result') == 'ERROR' for result in results)
+        if n_errors:
+            logging.warning(f'{n_errors} of {len(results)} sweep jobs failed, see the "error" column of "{output_path}"')
+        logging.info(f'SWEEP_RESULTS = {output_path}')
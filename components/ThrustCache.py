@@ -0,0 +1,192 @@
+import multiprocessing.managers
+import threading
+import numpy
+import os
+
+from components.RunConfiguration import RunConfiguration
+from components.QpropThrustSolver import QpropThrustSolver
+from components.QpropPrefetcher import QpropPrefetcher
+from components.ThrustTableStore import ThrustTableStore
+
+class ThrustCacheStorage:
+    thrusts: dict[tuple, float]
+    hits: int
+    misses: int
+    prefetch_hits: int
+    prefetch_misses: int
+    prefetch_runs: int
+    lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.thrusts = dict()
+        self.hits = 0
+        self.misses = 0
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        self.prefetch_runs = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple) -> float | None:
+        with self.lock:
+            thrust = self.thrusts.get(key)
+            if thrust is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return thrust
+
+    def set(self, key: tuple, thrust: float, prefetched: bool | None = None, n_prefetch_runs: int = 0) -> None:
+        with self.lock:
+            self.thrusts[key] = thrust
+            if prefetched is not None:
+                self.prefetch_hits += prefetched
+                self.prefetch_misses += not prefetched
+                self.prefetch_runs += n_prefetch_runs
+
+    def get_many(self, keys: list[tuple]) -> list[float | None]:
+        with self.lock:
+            thrusts = [self.thrusts.get(key) for key in keys]
+            n_misses = thrusts.count(None)
+            self.hits += len(thrusts) - n_misses
+            self.misses += n_misses
+            return thrusts
+
+    def set_many(self, thrusts: dict[tuple, float]) -> None:
+        with self.lock:
+            self.thrusts.update(thrusts)
+
+    def get_entries(self, key_prefix: tuple) -> dict[int | float, float]:
+        with self.lock:
+            return {key[len(key_prefix)]: thrust for key, thrust in self.thrusts.items() if key[:len(key_prefix)] == key_prefix}
+
+    def get_missing(self, keys: list[tuple]) -> list[tuple]:
+        with self.lock:
+            return [key for key in keys if key not in self.thrusts]
+
+    def get_counts(self) -> tuple[int, int]:
+        with self.lock:
+            return self.hits, self.misses
+
+    def get_prefetch_counts(self) -> tuple[int, int, int]:
+        with self.lock:
+            return self.prefetch_hits, self.prefetch_misses, self.prefetch_runs
+
+class ThrustCacheManager(multiprocessing.managers.BaseManager):
+    pass
+
+ThrustCacheManager.register('ThrustCacheStorage', ThrustCacheStorage)
+
+class ThrustCache:
+    velocity_quantum: numpy.float64
+    prefetch_depth: int
+    storage: multiprocessing.managers.BaseProxy
+
+    prefetcher: QpropPrefetcher | None = None
+
+    def __init__(self, manager: ThrustCacheManager, velocity_quantum: numpy.float64, prefetch_depth: int = 0) -> None:
+        if velocity_quantum < 0:
+            raise ValueError(f'velocity quantum ({velocity_quantum}) cannot be negative')
+        if prefetch_depth < 0:
+            raise ValueError(f'prefetch depth ({prefetch_depth}) cannot be negative')
+
+        self.velocity_quantum = numpy.float64(velocity_quantum)
+        self.prefetch_depth = prefetch_depth if self.velocity_quantum > 0 else 0
+        self.storage = manager.ThrustCacheStorage()
+
+    def get_quantized_velocity(self, velocity: numpy.float64) -> tuple[int | float, numpy.float64]:
+        if self.velocity_quantum == 0:
+            return float(velocity), numpy.float64(velocity)
+
+        quantum_index = int(numpy.round(velocity / self.velocity_quantum))
+        return quantum_index, numpy.float64(quantum_index * self.velocity_quantum)
+
+    def get_key(self, run_configuration: RunConfiguration, quantum_index: int | float, voltage: numpy.float64 | None = None) -> tuple:
+        setpoint = run_configuration.get_setpoint()
+        if voltage is not None:
+            setpoint = setpoint[:1] + (float(voltage),) + setpoint[2:]
+        return (run_configuration.propeller_hash, run_configuration.motor_hash, setpoint, quantum_index)
+
+    def get_thrust(self, run_configuration: RunConfiguration, velocity: numpy.float64, voltage: numpy.float64 | None = None) -> numpy.float64:
+        quantum_index, quantized_velocity = self.get_quantized_velocity(velocity)
+        key = self.get_key(run_configuration, quantum_index, voltage)
+
+        thrust = self.storage.get(key)
+        if thrust is not None:
+            return numpy.float64(thrust)
+
+        prefetcher = ThrustCache.prefetcher
+        if self.prefetch_depth == 0 or prefetcher is None or prefetcher.pid != os.getpid() or voltage is not None:
+            thrust = QpropThrustSolver.get_thrust(run_configuration, quantized_velocity, voltage)
+            self.storage.set(key, float(thrust))
+            return thrust
+
+        output = prefetcher.get_output(key)
+        thrust = QpropThrustSolver.get_thrust(run_configuration, quantized_velocity) if output is None else QpropThrustSolver.parse_thrust(output)
+        self.storage.set(key, float(thrust), output is not None, prefetcher.pop_n_runs())
+        return thrust
+
+    def prefetch(self, run_configuration: RunConfiguration, velocities: list[numpy.float64]) -> None:
+        if self.prefetch_depth == 0:
+            return
+
+        if ThrustCache.prefetcher is None or ThrustCache.prefetcher.pid != os.getpid():
+            ThrustCache.prefetcher = QpropPrefetcher()
+        prefetcher = ThrustCache.prefetcher
+
+        n_free = self.prefetch_depth - prefetcher.get_n_in_flight()
+        if n_free <= 0:
+            return
+
+        quantum_indices = [self.get_quantized_velocity(velocity)[0] for velocity in velocities]
+        candidate_indices = list(dict.fromkeys(quantum_index + offset for spread in range(self.prefetch_depth) for offset in sorted({spread, -spread}) for quantum_index in quantum_indices))[:2*self.prefetch_depth]
+        candidate_keys = {self.get_key(run_configuration, quantum_index): quantum_index for quantum_index in candidate_indices}
+        candidate_keys = {key: quantum_index for key, quantum_index in candidate_keys.items() if key not in prefetcher.futures}
+
+        for key in self.storage.get_missing(list(candidate_keys))[:n_free]:
+            prefetcher.prefetch(key, run_configuration.get_run_arguments(numpy.float64(candidate_keys[key] * self.velocity_quantum)))
+
+    def get_thrusts(self, run_configuration: RunConfiguration, velocities: numpy.ndarray[numpy.float64], voltages: numpy.ndarray[numpy.float64] | None = None) -> numpy.ndarray[numpy.float64]:
+        velocities = numpy.asarray(velocities, dtype=numpy.float64)
+        quantum_indices = velocities if self.velocity_quantum == 0 else numpy.round(velocities / self.velocity_quantum)
+        if voltages is None:
+            unique_indices, inverse = numpy.unique(quantum_indices, return_inverse=True)
+            unique_voltages = None
+        else:
+            unique_points, inverse = numpy.unique(numpy.column_stack((quantum_indices, numpy.asarray(voltages, dtype=numpy.float64))), axis=0, return_inverse=True)
+            unique_indices, unique_voltages = unique_points[:, 0], unique_points[:, 1]
+
+        keys = [self.get_key(run_configuration, float(quantum_index) if self.velocity_quantum == 0 else int(quantum_index), None if unique_voltages is None else unique_voltages[i]) for i, quantum_index in enumerate(unique_indices)]
+        thrusts = numpy.array(self.storage.get_many(keys), dtype=numpy.float64)
+
+        missing = numpy.flatnonzero(numpy.isnan(thrusts))
+        if missing.size:
+            quantized_velocities = unique_indices[missing] if self.velocity_quantum == 0 else unique_indices[missing] * self.velocity_quantum
+            thrusts[missing] = QpropThrustSolver.get_thrusts(run_configuration, quantized_velocities, None if unique_voltages is None else unique_voltages[missing])
+            self.storage.set_many({keys[i]: float(thrusts[i]) for i in missing})
+
+        return thrusts[inverse.ravel()]
+
+    def load(self, run_configuration: RunConfiguration, store: ThrustTableStore) -> int:
+        stored_entries = store.load(store.get_cache_key(run_configuration, self.velocity_quantum), numpy.float64(0.0))
+        if stored_entries is None:
+            return 0
+
+        velocities, thrusts = stored_entries
+        self.storage.set_many({self.get_key(run_configuration, self.get_quantized_velocity(velocity)[0]): float(thrust) for velocity, thrust in zip(velocities, thrusts)})
+        return velocities.size
+
+    def save(self, run_configuration: RunConfiguration, store: ThrustTableStore) -> int:
+        entries = self.storage.get_entries(self.get_key(run_configuration, 0)[:-1])
+        if not entries:
+            return 0
+
+        quantum_indices = numpy.array(sorted(entries), dtype=numpy.float64)
+        thrusts = numpy.array([entries[quantum_index] for quantum_index in sorted(entries)], dtype=numpy.float64)
+        store.save(store.get_cache_key(run_configuration, self.velocity_quantum), quantum_indices if self.velocity_quantum == 0 else quantum_indices * self.velocity_quantum, thrusts)
+        return thrusts.size
+
+    def get_counts(self) -> tuple[int, int]:
+        return self.storage.get_counts()
+
+    def get_prefetch_counts(self) -> tuple[int, int, int]:
+        return self.storage.get_prefetch_counts()
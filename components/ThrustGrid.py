@@ -0,0 +1,142 @@
+import logging
+import bisect
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.QpropThrustSolver import QpropThrustSolver
+from components.ThrustTable import ThrustTable
+from components.ThrustTableStore import ThrustTableStore
+from components.utils.voltage_profile_variables import VoltageProfileVariable
+
+class ThrustGrid:
+    ARRAYS = ('velocities', 'voltages', 'thrusts', 'currents')
+    SAG_BISECTIONS = 60
+
+    velocities: numpy.ndarray[numpy.float64]
+    voltages: numpy.ndarray[numpy.float64]
+    thrusts: numpy.ndarray[numpy.float64]
+    currents: numpy.ndarray[numpy.float64]
+    fallback: ThrustCache
+    sag_operating_points: dict[tuple, tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]]]
+
+    def __init__(self, velocities: numpy.ndarray[numpy.float64], voltages: numpy.ndarray[numpy.float64], thrusts: numpy.ndarray[numpy.float64], currents: numpy.ndarray[numpy.float64], fallback: ThrustCache) -> None:
+        velocities = numpy.asarray(velocities, dtype=numpy.float64)
+        voltages = numpy.asarray(voltages, dtype=numpy.float64)
+        thrusts = numpy.asarray(thrusts, dtype=numpy.float64)
+        currents = numpy.asarray(currents, dtype=numpy.float64)
+        if thrusts.shape != (voltages.size, velocities.size) or currents.shape != thrusts.shape:
+            raise ValueError(f'thrust grid of {voltages.size} voltage(s) and {velocities.size} velocities cannot hold thrusts of shape {thrusts.shape} and currents of shape {currents.shape}')
+        if not numpy.all(numpy.diff(velocities) > 0):
+            velocities, unique_indices = numpy.unique(velocities, return_index=True)
+            thrusts = numpy.ascontiguousarray(thrusts[:, unique_indices])
+            currents = numpy.ascontiguousarray(currents[:, unique_indices])
+        if velocities.size < 2 or voltages.size < 2 or not numpy.all(numpy.diff(voltages) > 0):
+            raise ValueError(f'thrust grid requires at least 2 distinct velocities and 2 increasing voltages, got {velocities.size} velocities and voltages {voltages.tolist()}')
+
+        self.velocities = velocities
+        self.voltages = voltages
+        self.thrusts = thrusts
+        self.currents = currents
+        self.fallback = fallback
+        self.sag_operating_points = dict()
+
+    @classmethod
+    def get_grid_voltages(cls, run_configuration: RunConfiguration, voltage_points: int) -> numpy.ndarray[numpy.float64]:
+        return numpy.linspace(numpy.min(run_configuration.voltage_profile_voltages), numpy.max(run_configuration.voltage_profile_voltages), voltage_points)
+
+    @classmethod
+    def build(cls, run_configuration: RunConfiguration, fallback: ThrustCache, n_sweeps: int, points_per_sweep: int, voltage_points: int, store: ThrustTableStore | None = None) -> 'ThrustGrid':
+        if run_configuration.voltage_profile_variable is None:
+            raise ValueError(f'thrust grid requires a "voltage_profile" in configuration "{run_configuration.identifier}"')
+        if n_sweeps < 1 or points_per_sweep < 2 or voltage_points < 2:
+            raise ValueError(f'thrust grid requires at least 1 sweep of 2 points at 2 voltages, got {n_sweeps} sweep(s) of {points_per_sweep} point(s) at {voltage_points} voltage(s)')
+
+        velocity_bound = ThrustTable.get_velocity_bound(run_configuration)
+        voltages = cls.get_grid_voltages(run_configuration, voltage_points)
+
+        if store is not None:
+            store_key = store.get_key(run_configuration, n_sweeps, points_per_sweep, voltages)
+            stored_grid = store.load(store_key, velocity_bound, 1 + 2*voltage_points)
+            if stored_grid is not None:
+                return cls(stored_grid[0], voltages, numpy.stack(stored_grid[1:1+voltage_points]), numpy.stack(stored_grid[1+voltage_points:]), fallback)
+
+        sweep_bounds = numpy.linspace(0.0, velocity_bound, n_sweeps+1)
+        sweeps = [(minimum_velocity, maximum_velocity, points_per_sweep, voltage) for voltage in voltages for minimum_velocity, maximum_velocity in zip(sweep_bounds[:-1], sweep_bounds[1:])]
+        operating_points = QpropThrustSolver.get_sweep_operating_points(run_configuration, sweeps)
+
+        velocities = numpy.concatenate([sweep_velocities for sweep_velocities, _, _ in operating_points[:n_sweeps]])
+        thrusts = numpy.array([numpy.concatenate([sweep_thrusts for _, sweep_thrusts, _ in operating_points[i:i+n_sweeps]]) for i in range(0, len(operating_points), n_sweeps)])
+        currents = numpy.array([numpy.concatenate([sweep_currents for _, _, sweep_currents in operating_points[i:i+n_sweeps]]) for i in range(0, len(operating_points), n_sweeps)])
+
+        thrust_grid = cls(velocities, voltages, thrusts, currents, fallback)
+        logging.info(f'THRUST_GRID = {thrust_grid.voltages.size} voltages x {thrust_grid.velocities.size} velocities | VOLTAGE_RANGE = [{voltages[0]}, {voltages[-1]}] V | SOLVER_SWEEPS = {len(sweeps)}')
+        if store is not None:
+            store.save(store_key, thrust_grid.velocities, *thrust_grid.thrusts, *thrust_grid.currents)
+
+        return thrust_grid
+
+    def interpolate(self, values: numpy.ndarray[numpy.float64], velocities: numpy.ndarray[numpy.float64], voltages: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        i = numpy.searchsorted(self.velocities[1:-1], velocities, side='right')
+        j = numpy.searchsorted(self.voltages[1:-1], voltages, side='right')
+        s = (velocities - self.velocities[i]) / (self.velocities[i+1] - self.velocities[i])
+        t = (voltages - self.voltages[j]) / (self.voltages[j+1] - self.voltages[j])
+
+        k = j*self.velocities.size + i
+        values = values.ravel()
+        lower = values[k] + s*(values[k+1] - values[k])
+        upper = values[k+self.velocities.size] + s*(values[k+self.velocities.size+1] - values[k+self.velocities.size])
+        return lower + t*(upper - lower)
+
+    def get_sag_operating_points(self, run_configuration: RunConfiguration) -> tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]]:
+        voltage_profile = run_configuration.get_voltage_profile()
+        sag_operating_points = self.sag_operating_points.get(voltage_profile)
+        if sag_operating_points is not None:
+            return sag_operating_points
+
+        lower_voltages = numpy.full_like(self.velocities, self.voltages[0])
+        upper_voltages = numpy.full_like(self.velocities, self.voltages[-1])
+        for _ in range(self.SAG_BISECTIONS):
+            voltages = (lower_voltages+upper_voltages) / 2
+            excess = voltages - run_configuration.get_profile_voltage(self.interpolate(self.currents, self.velocities, voltages))
+            upper_voltages = numpy.where(excess > 0, voltages, upper_voltages)
+            lower_voltages = numpy.where(excess > 0, lower_voltages, voltages)
+
+        sag_voltages = (lower_voltages+upper_voltages) / 2
+        sag_operating_points = self.sag_operating_points[voltage_profile] = (sag_voltages, self.interpolate(self.thrusts, self.velocities, sag_voltages))
+        return sag_operating_points
+
+    def is_out_of_grid(self, velocities: numpy.ndarray[numpy.float64], voltages: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.bool_]:
+        return (velocities < self.velocities[0]) | (velocities > self.velocities[-1]) | (voltages < self.voltages[0]) | (voltages > self.voltages[-1])
+
+    def get_thrust(self, run_configuration: RunConfiguration, velocity: numpy.float64, duration: numpy.float64 = numpy.float64(0.0)) -> numpy.float64:
+        if run_configuration.voltage_profile_variable == VoltageProfileVariable.CURRENT:
+            sag_voltages, sag_thrusts = self.get_sag_operating_points(run_configuration)
+            if velocity < self.velocities[0] or velocity > self.velocities[-1]:
+                return self.fallback.get_thrust(run_configuration, velocity, numpy.float64(numpy.interp(velocity, self.velocities, sag_voltages)))
+            return numpy.float64(numpy.interp(velocity, self.velocities, sag_thrusts))
+
+        voltage = numpy.float64(run_configuration.get_profile_voltage(duration))
+        if self.is_out_of_grid(velocity, voltage):
+            return self.fallback.get_thrust(run_configuration, velocity, voltage)
+
+        j = min(bisect.bisect(self.voltages, voltage)-1, self.voltages.size-2)
+        t = (voltage - self.voltages[j]) / (self.voltages[j+1] - self.voltages[j])
+        lower = numpy.interp(velocity, self.velocities, self.thrusts[j])
+        upper = numpy.interp(velocity, self.velocities, self.thrusts[j+1])
+        return numpy.float64(lower + t*(upper - lower))
+
+    def get_thrusts(self, run_configuration: RunConfiguration, velocities: numpy.ndarray[numpy.float64], durations: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        if run_configuration.voltage_profile_variable == VoltageProfileVariable.CURRENT:
+            sag_voltages, sag_thrusts = self.get_sag_operating_points(run_configuration)
+            voltages = numpy.interp(velocities, self.velocities, sag_voltages)
+            thrusts = numpy.interp(velocities, self.velocities, sag_thrusts)
+        else:
+            voltages = run_configuration.get_profile_voltage(durations)
+            thrusts = self.interpolate(self.thrusts, velocities, voltages)
+
+        out_of_grid = self.is_out_of_grid(velocities, voltages)
+        if out_of_grid.any():
+            thrusts[out_of_grid] = self.fallback.get_thrusts(run_configuration, velocities[out_of_grid], voltages[out_of_grid])
+
+        return thrusts
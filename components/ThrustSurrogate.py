@@ -0,0 +1,127 @@
+import logging
+import bisect
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.QpropThrustSolver import QpropThrustSolver
+from components.ThrustTable import ThrustTable
+
+class ThrustSurrogate:
+    ARRAYS = ('velocities', 'thrusts')
+    INITIAL_POINTS = 9
+    MAXIMUM_SAMPLES = 64
+    TOLERANCE_FACTOR = 0.1
+
+    velocities: numpy.ndarray[numpy.float64]
+    thrusts: numpy.ndarray[numpy.float64]
+    slopes: numpy.ndarray[numpy.float64]
+    fallback: ThrustCache
+
+    def __init__(self, velocities: numpy.ndarray[numpy.float64], thrusts: numpy.ndarray[numpy.float64], fallback: ThrustCache) -> None:
+        velocities = numpy.asarray(velocities, dtype=numpy.float64)
+        thrusts = numpy.asarray(thrusts, dtype=numpy.float64)
+        if not numpy.all(numpy.diff(velocities) > 0):
+            velocities, unique_indices = numpy.unique(velocities, return_index=True)
+            thrusts = thrusts[unique_indices]
+        if velocities.size < 2:
+            raise ValueError(f'thrust surrogate requires at least 2 distinct velocities, got {velocities.size}')
+
+        self.velocities = velocities
+        self.thrusts = thrusts
+        self.slopes = self.get_slopes(self.velocities, self.thrusts)
+        self.fallback = fallback
+
+    @classmethod
+    def get_slopes(cls, velocities: numpy.ndarray[numpy.float64], thrusts: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        steps = numpy.diff(velocities)
+        secants = numpy.diff(thrusts) / steps
+        if secants.size == 1:
+            return numpy.repeat(secants, 2)
+
+        slopes = numpy.zeros(velocities.size)
+        left_weights = 2*steps[1:] + steps[:-1]
+        right_weights = steps[1:] + 2*steps[:-1]
+        monotone = secants[:-1]*secants[1:] > 0
+        slopes[1:-1][monotone] = (left_weights+right_weights)[monotone] / (left_weights[monotone]/secants[:-1][monotone] + right_weights[monotone]/secants[1:][monotone])
+
+        for end, (step, next_step, secant, next_secant) in ((0, (steps[0], steps[1], secants[0], secants[1])), (-1, (steps[-1], steps[-2], secants[-1], secants[-2]))):
+            slope = ((2*step+next_step)*secant - step*next_secant) / (step+next_step)
+            if numpy.sign(slope) != numpy.sign(secant):
+                slope = 0.0
+            elif numpy.sign(secant) != numpy.sign(next_secant) and abs(slope) > 3*abs(secant):
+                slope = 3*secant
+            slopes[end] = slope
+
+        return slopes
+
+    @classmethod
+    def interpolate(cls, velocities: numpy.ndarray[numpy.float64], thrusts: numpy.ndarray[numpy.float64], slopes: numpy.ndarray[numpy.float64], query_velocities: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        k = numpy.clip(numpy.searchsorted(velocities, query_velocities, side='right')-1, 0, velocities.size-2)
+        step = velocities[k+1] - velocities[k]
+        t = (query_velocities - velocities[k]) / step
+
+        return (1+2*t)*(1-t)**2*thrusts[k] + t*(1-t)**2*step*slopes[k] + t**2*(3-2*t)*thrusts[k+1] + t**2*(t-1)*step*slopes[k+1]
+
+    @classmethod
+    def get_error_estimates(cls, velocities: numpy.ndarray[numpy.float64], thrusts: numpy.ndarray[numpy.float64], slopes: numpy.ndarray[numpy.float64]) -> tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.float64]]:
+        midpoints = (velocities[:-1] + velocities[1:]) / 2
+        surrogate_thrusts = cls.interpolate(velocities, thrusts, slopes, midpoints)
+
+        cubic_thrusts = numpy.empty(midpoints.size)
+        for k, midpoint in enumerate(midpoints):
+            start = min(max(k-1, 0), velocities.size-4)
+            window_velocities = velocities[start:start+4]
+            cubic_thrusts[k] = sum(
+                thrusts[start+i] * numpy.prod([(midpoint-window_velocities[j]) / (window_velocities[i]-window_velocities[j]) for j in range(4) if j != i])
+                for i in range(4)
+            )
+
+        return midpoints, numpy.abs(surrogate_thrusts - cubic_thrusts)
+
+    @classmethod
+    def get_tolerance(cls, run_configuration: RunConfiguration, thrusts: numpy.ndarray[numpy.float64]) -> numpy.float64:
+        return numpy.float64(cls.TOLERANCE_FACTOR * 10**-run_configuration.arithmetic_precision * numpy.max(numpy.abs(thrusts)) / run_configuration.mass_range[1])
+
+    @classmethod
+    def build(cls, run_configuration: RunConfiguration, fallback: ThrustCache) -> 'ThrustSurrogate':
+        velocities, thrusts = QpropThrustSolver.get_sweep_thrusts(run_configuration, 0.0, ThrustTable.get_velocity_bound(run_configuration), cls.INITIAL_POINTS)
+        velocities = list(velocities)
+        thrusts = list(thrusts)
+        n_solver_calls = 1
+
+        tolerance = cls.get_tolerance(run_configuration, numpy.array(thrusts))
+        while True:
+            node_velocities = numpy.array(velocities)
+            node_thrusts = numpy.array(thrusts)
+            midpoints, errors = cls.get_error_estimates(node_velocities, node_thrusts, cls.get_slopes(node_velocities, node_thrusts))
+            refined_midpoints = midpoints[errors > tolerance]
+            if refined_midpoints.size == 0 or n_solver_calls >= cls.MAXIMUM_SAMPLES:
+                break
+
+            for midpoint in refined_midpoints[:cls.MAXIMUM_SAMPLES-n_solver_calls]:
+                i = bisect.bisect(velocities, midpoint)
+                velocities.insert(i, numpy.float64(midpoint))
+                thrusts.insert(i, QpropThrustSolver.get_thrust(run_configuration, midpoint))
+                n_solver_calls += 1
+
+        if refined_midpoints.size:
+            logging.warning(f'Thrust surrogate stopped at {cls.MAXIMUM_SAMPLES} solver calls with an estimated error of {numpy.max(errors):.3e} N, above its tolerance of {tolerance:.3e} N...')
+        logging.info(f'SURROGATE_SOLVER_CALLS = {n_solver_calls} | SURROGATE_NODES = {len(velocities)} | THRUST_TOLERANCE = {tolerance:.3e} N | ESTIMATED_THRUST_ERROR = {numpy.max(errors):.3e} N')
+
+        return cls(numpy.array(velocities), numpy.array(thrusts), fallback)
+
+    def get_thrust(self, run_configuration: RunConfiguration, velocity: numpy.float64) -> numpy.float64:
+        if velocity < self.velocities[0] or velocity > self.velocities[-1]:
+            return self.fallback.get_thrust(run_configuration, velocity)
+
+        return numpy.float64(self.interpolate(self.velocities, self.thrusts, self.slopes, numpy.float64(velocity)))
+
+    def get_thrusts(self, run_configuration: RunConfiguration, velocities: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        thrusts = self.interpolate(self.velocities, self.thrusts, self.slopes, velocities)
+
+        out_of_table = (velocities < self.velocities[0]) | (velocities > self.velocities[-1])
+        if out_of_table.any():
+            thrusts[out_of_table] = self.fallback.get_thrusts(run_configuration, velocities[out_of_table])
+
+        return thrusts
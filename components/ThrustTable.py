@@ -0,0 +1,75 @@
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.QpropThrustSolver import QpropThrustSolver
+from components.ThrustTableStore import ThrustTableStore
+
+class ThrustTable:
+    ARRAYS = ('velocities', 'thrusts')
+    VELOCITY_BOUND_FACTOR = 1.5
+
+    velocities: numpy.ndarray[numpy.float64]
+    thrusts: numpy.ndarray[numpy.float64]
+    fallback: ThrustCache
+
+    def __init__(self, velocities: numpy.ndarray[numpy.float64], thrusts: numpy.ndarray[numpy.float64], fallback: ThrustCache) -> None:
+        velocities = numpy.asarray(velocities, dtype=numpy.float64)
+        thrusts = numpy.asarray(thrusts, dtype=numpy.float64)
+        if not numpy.all(numpy.diff(velocities) > 0):
+            velocities, unique_indices = numpy.unique(velocities, return_index=True)
+            thrusts = thrusts[unique_indices]
+        if velocities.size < 2:
+            raise ValueError(f'thrust table requires at least 2 distinct velocities, got {velocities.size}')
+
+        self.velocities = velocities
+        self.thrusts = thrusts
+        self.fallback = fallback
+
+    @classmethod
+    def get_velocity_bound(cls, run_configuration: RunConfiguration) -> numpy.float64:
+        stall_velocity = run_configuration.get_stall_velocity(run_configuration.mass_range[1])
+        return numpy.float64(cls.VELOCITY_BOUND_FACTOR * max(numpy.max(stall_velocity), run_configuration.setpoint_velocity))
+
+    @classmethod
+    def build(cls, run_configuration: RunConfiguration, fallback: ThrustCache, n_sweeps: int, points_per_sweep: int, store: ThrustTableStore | None = None) -> 'ThrustTable':
+        if n_sweeps < 1 or points_per_sweep < 2:
+            raise ValueError(f'thrust table requires at least 1 sweep of 2 points, got {n_sweeps} sweep(s) of {points_per_sweep} point(s)')
+
+        velocity_bound = cls.get_velocity_bound(run_configuration)
+
+        if store is not None:
+            store_key = store.get_key(run_configuration, n_sweeps, points_per_sweep)
+            stored_table = store.load(store_key, velocity_bound)
+            if stored_table is not None:
+                return cls(*stored_table, fallback)
+
+        sweep_bounds = numpy.linspace(0.0, velocity_bound, n_sweeps+1)
+
+        velocities = list()
+        thrusts = list()
+        for minimum_velocity, maximum_velocity in zip(sweep_bounds[:-1], sweep_bounds[1:]):
+            sweep_velocities, sweep_thrusts = QpropThrustSolver.get_sweep_thrusts(run_configuration, minimum_velocity, maximum_velocity, points_per_sweep)
+            velocities.append(sweep_velocities)
+            thrusts.append(sweep_thrusts)
+
+        thrust_table = cls(numpy.concatenate(velocities), numpy.concatenate(thrusts), fallback)
+        if store is not None:
+            store.save(store_key, thrust_table.velocities, thrust_table.thrusts)
+
+        return thrust_table
+
+    def get_thrust(self, run_configuration: RunConfiguration, velocity: numpy.float64) -> numpy.float64:
+        if velocity < self.velocities[0] or velocity > self.velocities[-1]:
+            return self.fallback.get_thrust(run_configuration, velocity)
+
+        return numpy.float64(numpy.interp(velocity, self.velocities, self.thrusts))
+
+    def get_thrusts(self, run_configuration: RunConfiguration, velocities: numpy.ndarray[numpy.float64]) -> numpy.ndarray[numpy.float64]:
+        thrusts = numpy.interp(velocities, self.velocities, self.thrusts)
+
+        out_of_table = (velocities < self.velocities[0]) | (velocities > self.velocities[-1])
+        if out_of_table.any():
+            thrusts[out_of_table] = self.fallback.get_thrusts(run_configuration, velocities[out_of_table])
+
+        return thrusts
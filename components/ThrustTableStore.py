@@ -0,0 +1,87 @@
+import tempfile
+import hashlib
+import pathlib
+import numpy
+import json
+import os
+
+from components.RunConfiguration import RunConfiguration
+
+class ThrustTableStore:
+    FORMAT_VERSION = 1
+    VELOCITY_BOUND_TOLERANCE = 1e-3
+
+    directory: pathlib.Path
+    maximum_size: int
+
+    def __init__(self, directory: pathlib.Path, maximum_size: int) -> None:
+        if maximum_size <= 0:
+            raise ValueError(f'thrust table store size ({maximum_size}) must be positive')
+
+        self.directory = directory
+        self.maximum_size = maximum_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_key(self, run_configuration: RunConfiguration, n_sweeps: int, points_per_sweep: int, voltages: numpy.ndarray[numpy.float64] | None = None) -> str:
+        key_data = [self.FORMAT_VERSION, run_configuration.propeller_hash, run_configuration.motor_hash, run_configuration.get_setpoint(), n_sweeps, points_per_sweep]
+        if voltages is not None:
+            key_data.append(voltages.tolist())
+        key_data = json.dumps(key_data)
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def get_cache_key(self, run_configuration: RunConfiguration, velocity_quantum: numpy.float64) -> str:
+        key_data = json.dumps([self.FORMAT_VERSION, 'cache', run_configuration.propeller_hash, run_configuration.motor_hash, run_configuration.get_setpoint(), float(velocity_quantum)])
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def get_path(self, key: str) -> pathlib.Path:
+        return self.directory / f'{key}.npy'
+
+    def load(self, key: str, velocity_bound: numpy.float64, n_rows: int = 2) -> tuple[numpy.ndarray[numpy.float64], ...] | None:
+        path = self.get_path(key)
+        try:
+            table = numpy.load(path, mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if table.ndim != 2 or table.shape[0] != n_rows or table[0, -1] < velocity_bound * (1 - self.VELOCITY_BOUND_TOLERANCE):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return tuple(table)
+
+    def save(self, key: str, velocities: numpy.ndarray[numpy.float64], *rows: numpy.ndarray[numpy.float64]) -> None:
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix=f'.{key}.', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temporary_file:
+                numpy.save(temporary_file, numpy.stack((velocities, *rows)).astype(numpy.float64))
+            os.replace(temporary_path, self.get_path(key))
+        except OSError:
+            pathlib.Path(temporary_path).unlink(missing_ok=True)
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        entries = list()
+        for path in self.directory.glob('*.npy'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.maximum_size:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            total_size -= size
@@ -0,0 +1,75 @@
+from multiprocessing import shared_memory
+import numpy
+
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+
+class TrajectoryBuffer:
+    COLUMNS = ('time', 'velocity', 'position', 'acceleration', 'thrust', 'drag')
+    INITIAL_CAPACITY = 4096
+    SUMMARY_ROWS = 2
+
+    capacity: int
+    n_rows: int
+    summary_only: bool
+    shared_memory: shared_memory.SharedMemory
+    rows: numpy.ndarray[numpy.float64]
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        self.capacity = max(capacity, self.SUMMARY_ROWS)
+        self.n_rows = 0
+        self.summary_only = False
+        self.shared_memory = shared_memory.SharedMemory(create=True, size=self.capacity * len(self.COLUMNS) * numpy.dtype(numpy.float64).itemsize)
+        self.rows = numpy.ndarray((self.capacity, len(self.COLUMNS)), dtype=numpy.float64, buffer=self.shared_memory.buf)
+
+    def reset(self, time: numpy.float64, velocity: numpy.float64, position: numpy.float64, summary_only: bool = False) -> None:
+        self.n_rows = 0
+        self.summary_only = summary_only
+        self.append(time, velocity, position, numpy.nan, numpy.nan, numpy.nan)
+
+    def append(self, time: numpy.float64, velocity: numpy.float64, position: numpy.float64, acceleration: numpy.float64, thrust: numpy.float64, drag: numpy.float64) -> None:
+        if self.summary_only and self.n_rows == self.SUMMARY_ROWS:
+            self.rows[0] = self.rows[1]
+            self.n_rows = 1
+        elif self.n_rows == self.capacity:
+            self.grow()
+
+        self.rows[self.n_rows] = (time, velocity, position, acceleration, thrust, drag)
+        self.n_rows += 1
+
+    def grow(self) -> None:
+        grown_memory = shared_memory.SharedMemory(create=True, size=2 * self.capacity * len(self.COLUMNS) * numpy.dtype(numpy.float64).itemsize)
+        grown_rows = numpy.ndarray((2 * self.capacity, len(self.COLUMNS)), dtype=numpy.float64, buffer=grown_memory.buf)
+        grown_rows[:self.n_rows] = self.rows[:self.n_rows]
+
+        self.close()
+        self.capacity *= 2
+        self.shared_memory = grown_memory
+        self.rows = grown_rows
+
+    def get_handle(self, mass: numpy.float64, stall_velocity: numpy.float64, takeoff_located: bool, decided_early: bool, decided_success: bool) -> tuple[str, int, bool, numpy.float64, numpy.float64, bool, bool, bool]:
+        return self.shared_memory.name, self.n_rows, self.summary_only, mass, stall_velocity, takeoff_located, decided_early, decided_success
+
+    def close(self) -> None:
+        del self.rows
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+
+    @classmethod
+    def get_model(cls, memory: shared_memory.SharedMemory, handle: tuple[str, int, bool, numpy.float64, numpy.float64, bool, bool, bool]) -> ConstantMassDynamicsModel:
+        _, n_rows, summary_only, mass, stall_velocity, takeoff_located, decided_early, decided_success = handle
+        rows = numpy.ndarray((n_rows, len(cls.COLUMNS)), dtype=numpy.float64, buffer=memory.buf)
+
+        return ConstantMassDynamicsModel(
+            mass=mass,
+            stall_velocity=stall_velocity,
+            time=rows[:, 0],
+            acceleration=rows[1:, 3],
+            velocity=rows[:, 1],
+            position=rows[:, 2],
+            thrust=rows[1:, 4],
+            drag=rows[1:, 5],
+            takeoff_located=takeoff_located,
+            decided_early=decided_early,
+            decided_success=decided_success,
+            summary_only=summary_only
+        )
@@ -0,0 +1,70 @@
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.VectorizedDynamicsSimulation import VectorizedDynamicsSimulation
+from components.utils.uncertainty_distributions import UncertaintyDistribution
+
+class UncertaintyAnalysis:
+    MASSES_PER_SAMPLE = 7
+    PERCENTILES = (5, 25, 50, 75, 95)
+
+    @classmethod
+    def get_ensemble_configuration(cls, run_configuration: RunConfiguration) -> RunConfiguration:
+        generator = numpy.random.default_rng(run_configuration.uncertainty_seed)
+
+        samples = dict()
+        for aerodynamic_force, spread in run_configuration.get_uncertainty_spreads().items():
+            nominal = getattr(run_configuration, f'aerodynamic_forces_{aerodynamic_force}')
+            values = numpy.zeros(run_configuration.uncertainty_samples)
+            invalid = numpy.ones(values.size, dtype=numpy.bool_)
+            while invalid.any():
+                if run_configuration.uncertainty_distribution == UncertaintyDistribution.NORMAL:
+                    values[invalid] = generator.normal(nominal, spread, invalid.sum())
+                else:
+                    values[invalid] = generator.uniform(nominal-spread, nominal+spread, invalid.sum())
+                invalid = values <= 0
+            samples[aerodynamic_force] = values
+
+        return run_configuration.get_ensemble(samples)
+
+    @classmethod
+    def get_mtoms(cls, ensemble_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, terminate_early: bool = True) -> tuple[numpy.ndarray[numpy.float64], numpy.ndarray[numpy.bool_]]:
+        PRECISION_MULTIPLIER = 10**ensemble_configuration.arithmetic_precision
+        n_samples = ensemble_configuration.uncertainty_samples
+
+        lightest_mass = numpy.round(ensemble_configuration.mass_range[0]*PRECISION_MULTIPLIER)
+        heaviest_mass = numpy.round(ensemble_configuration.mass_range[1]*PRECISION_MULTIPLIER)
+
+        heaviest_successes = numpy.full(n_samples, -numpy.inf)
+        lightest_failures = numpy.full(n_samples, numpy.inf)
+
+        pending = numpy.arange(n_samples)
+        MASS_SPACE = numpy.tile(numpy.round(numpy.linspace(lightest_mass, heaviest_mass, cls.MASSES_PER_SAMPLE+2)), (n_samples, 1))
+        while pending.size:
+            samples = numpy.repeat(pending, MASS_SPACE.shape[1])
+            masses = MASS_SPACE.ravel()
+            successes = VectorizedDynamicsSimulation.get_takeoff_outcomes(
+                ensemble_configuration.get_ensemble_subset(samples),
+                masses / PRECISION_MULTIPLIER,
+                thrust_model,
+                terminate_early,
+                numpy.repeat(numpy.arange(pending.size), MASS_SPACE.shape[1])
+            )
+
+            numpy.maximum.at(heaviest_successes, samples[successes], masses[successes])
+            numpy.minimum.at(lightest_failures, samples[~successes], masses[~successes])
+
+            unresolved = lightest_failures[pending]-heaviest_successes[pending] > 1
+            pending = pending[unresolved & numpy.isfinite(heaviest_successes[pending]) & numpy.isfinite(lightest_failures[pending])]
+
+            fractions = numpy.arange(1, cls.MASSES_PER_SAMPLE+1) / (cls.MASSES_PER_SAMPLE+1)
+            lower_bounds = heaviest_successes[pending, numpy.newaxis]
+            upper_bounds = lightest_failures[pending, numpy.newaxis]
+            MASS_SPACE = numpy.clip(numpy.round(lower_bounds + fractions * (upper_bounds-lower_bounds)), lower_bounds+1, upper_bounds-1)
+
+        mtoms = numpy.where(numpy.isfinite(heaviest_successes), heaviest_successes / PRECISION_MULTIPLIER, numpy.nan)
+        return mtoms, numpy.isinf(lightest_failures) & numpy.isfinite(heaviest_successes)
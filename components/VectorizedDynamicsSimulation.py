@@ -0,0 +1,233 @@
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+from components.DynamicsIntegrator import DynamicsIntegrator
+from components.PhaseProfiler import PhaseProfiler
+from components.utils.process_statuses import ProcessStatus
+from components.utils.voltage_profile_variables import VoltageProfileVariable
+
+class VectorizedDynamicsSimulation:
+    @classmethod
+    def simulate_dynamics_given_masses(
+        cls,
+        run_configuration: RunConfiguration,
+        masses: numpy.ndarray[numpy.float64],
+        thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid,
+        terminate_early: bool = False,
+        groups: numpy.ndarray[numpy.intp] | None = None,
+        summary_only: bool = False
+    ) -> list[ConstantMassDynamicsModel]:
+        masses = numpy.asarray(masses, dtype=numpy.float64)
+        stall_velocities, history, decided_early, outcomes = cls.simulate_lockstep(run_configuration, masses, thrust_model, terminate_early, groups, not summary_only, summary_only)
+        durations, accelerations, velocities, positions, thrusts, drags, accepted_steps = history
+        locates_takeoff = DynamicsIntegrator.locates_takeoff(run_configuration)
+
+        models = list()
+        for i, mass in enumerate(masses):
+            if summary_only:
+                n_states = min(int(accepted_steps[i]), 1)+1
+                models.append(ConstantMassDynamicsModel(
+                    mass=mass,
+                    stall_velocity=stall_velocities[i],
+                    time=durations[2-n_states:, i],
+                    acceleration=accelerations[2-n_states:, i],
+                    velocity=velocities[2-n_states:, i],
+                    position=positions[2-n_states:, i],
+                    thrust=thrusts[2-n_states:, i],
+                    drag=drags[2-n_states:, i],
+                    takeoff_located=locates_takeoff and not decided_early[i],
+                    decided_early=bool(decided_early[i]),
+                    decided_success=bool(outcomes[i] == 1),
+                    summary_only=True
+                ))
+                continue
+
+            step_indices = numpy.flatnonzero(accepted_steps[:, i])
+            state_indices = numpy.concatenate(([0], step_indices+1))
+            models.append(ConstantMassDynamicsModel(
+                mass=mass,
+                stall_velocity=stall_velocities[i],
+                time=durations[state_indices, i],
+                acceleration=accelerations[step_indices, i],
+                velocity=velocities[state_indices, i],
+                position=positions[state_indices, i],
+                thrust=thrusts[step_indices, i],
+                drag=drags[step_indices, i],
+                takeoff_located=locates_takeoff and not decided_early[i],
+                decided_early=bool(decided_early[i]),
+                decided_success=bool(outcomes[i] == 1)
+            ))
+
+        return models
+
+    @classmethod
+    def get_takeoff_outcomes(
+        cls,
+        run_configuration: RunConfiguration,
+        masses: numpy.ndarray[numpy.float64],
+        thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid,
+        terminate_early: bool = False,
+        groups: numpy.ndarray[numpy.intp] | None = None
+    ) -> numpy.ndarray[numpy.bool_]:
+        _, _, _, outcomes = cls.simulate_lockstep(run_configuration, numpy.asarray(masses, dtype=numpy.float64), thrust_model, terminate_early, groups, False, False)
+        return outcomes == 1
+
+    @classmethod
+    def simulate_lockstep(
+        cls,
+        run_configuration: RunConfiguration,
+        masses: numpy.ndarray[numpy.float64],
+        thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid,
+        terminate_early: bool,
+        groups: numpy.ndarray[numpy.intp] | None,
+        record_history: bool,
+        record_summary: bool
+    ) -> tuple[numpy.ndarray[numpy.float64], tuple[numpy.ndarray, ...] | None, numpy.ndarray[numpy.bool_], numpy.ndarray[numpy.int8]]:
+        previous_phase = PhaseProfiler.enter(ProcessStatus.ITERATING_STATE)
+        stall_velocities = run_configuration.get_stall_velocity(masses)
+
+        duration = numpy.zeros_like(masses)
+        velocity = numpy.full_like(masses, run_configuration.setpoint_velocity)
+        position = numpy.zeros_like(masses)
+
+        durations = [duration]
+        accelerations = list()
+        velocities = [velocity]
+        positions = [position]
+        thrusts = list()
+        drags = list()
+        accepted_steps = list()
+
+        previous_duration = duration
+        previous_velocity = velocity
+        previous_position = position
+        last_acceleration = numpy.zeros_like(masses)
+        last_thrust = numpy.zeros_like(masses)
+        last_drag = numpy.zeros_like(masses)
+        n_accepted = numpy.zeros(masses.size, dtype=numpy.intp)
+
+        if isinstance(thrust_model, ThrustGrid):
+            thrust_function = lambda velocities, durations: thrust_model.get_thrusts(run_configuration, velocities, durations)
+        else:
+            thrust_function = lambda velocities, durations: thrust_model.get_thrusts(run_configuration, velocities)
+        terminate_early = terminate_early and run_configuration.voltage_profile_variable != VoltageProfileVariable.TIME
+        groups = numpy.zeros(masses.size, dtype=numpy.intp) if groups is None else numpy.asarray(groups, dtype=numpy.intp)
+        n_groups = int(groups.max())+1 if groups.size else 0
+        locates_takeoff = DynamicsIntegrator.locates_takeoff(run_configuration)
+        timestep_sizes = numpy.full_like(masses, run_configuration.timestep_size)
+
+        start_forces = None
+
+        active = numpy.ones(masses.size, dtype=numpy.bool_)
+        decided_early = numpy.zeros(masses.size, dtype=numpy.bool_)
+        outcomes = numpy.zeros(masses.size, dtype=numpy.int8)
+
+        while active.any():
+            step_position = position.copy()
+            step_velocity = velocity.copy()
+            acceleration = numpy.zeros_like(masses)
+            thrust = numpy.zeros_like(masses)
+            drag = numpy.zeros_like(masses)
+            error = numpy.zeros_like(masses)
+            end_forces = None
+
+            PhaseProfiler.enter(ProcessStatus.EXECUTING_QPROP)
+            step_position[active], step_velocity[active], acceleration[active], thrust[active], drag[active], error[active], active_end_forces = DynamicsIntegrator.step(
+                run_configuration.get_ensemble_subset(active), thrust_function, masses[active], position[active], velocity[active], duration[active], timestep_sizes[active], None if start_forces is None else tuple(forces[active] for forces in start_forces)
+            )
+            if active_end_forces is not None:
+                end_forces = tuple(numpy.zeros_like(masses) for _ in active_end_forces)
+                for forces, active_forces in zip(end_forces, active_end_forces):
+                    forces[active] = active_forces
+
+            PhaseProfiler.enter(ProcessStatus.ITERATING_STATE)
+            if terminate_early:
+                decided_success, decided_failure = DynamicsIntegrator.get_decided_outcome(velocity, acceleration, stall_velocities)
+                outcomes[active & decided_success] = 1
+                outcomes[active & decided_failure] = -1
+
+                heaviest_successes = numpy.full(n_groups, -numpy.inf)
+                numpy.maximum.at(heaviest_successes, groups[outcomes == 1], masses[outcomes == 1])
+                lightest_failures = numpy.full(n_groups, numpy.inf)
+                numpy.minimum.at(lightest_failures, groups[outcomes == -1], masses[outcomes == -1])
+                outcomes[active & (masses <= heaviest_successes[groups])] = 1
+                outcomes[active & (masses >= lightest_failures[groups])] = -1
+
+                decided = active & (outcomes != 0)
+                decided_early |= decided
+                active &= ~decided
+
+            accepted = active & (error <= 1)
+            step_duration = duration + timestep_sizes
+
+            PhaseProfiler.enter(ProcessStatus.CHECKING_LIMITS)
+            takeoff_reached = accepted & (step_position > run_configuration.takeoff_displacement)
+            if locates_takeoff and takeoff_reached.any():
+                if end_forces is None:
+                    end_acceleration, _, _ = DynamicsIntegrator.get_acceleration(run_configuration.get_ensemble_subset(takeoff_reached), thrust_function, masses[takeoff_reached], step_velocity[takeoff_reached], step_duration[takeoff_reached])
+                else:
+                    end_acceleration = end_forces[0][takeoff_reached]
+                takeoff_fraction, step_velocity[takeoff_reached] = DynamicsIntegrator.locate_takeoff(
+                    run_configuration,
+                    timestep_sizes[takeoff_reached],
+                    position[takeoff_reached],
+                    velocity[takeoff_reached],
+                    acceleration[takeoff_reached],
+                    step_position[takeoff_reached],
+                    step_velocity[takeoff_reached],
+                    end_acceleration
+                )
+                step_position[takeoff_reached] = run_configuration.takeoff_displacement
+                step_duration[takeoff_reached] = duration[takeoff_reached] + takeoff_fraction * timestep_sizes[takeoff_reached]
+
+            PhaseProfiler.enter(ProcessStatus.UPDATING_COUNTS)
+            if record_summary:
+                previous_duration = numpy.where(accepted, duration, previous_duration)
+                previous_velocity = numpy.where(accepted, velocity, previous_velocity)
+                previous_position = numpy.where(accepted, position, previous_position)
+                last_acceleration = numpy.where(accepted, acceleration, last_acceleration)
+                last_thrust = numpy.where(accepted, thrust, last_thrust)
+                last_drag = numpy.where(accepted, drag, last_drag)
+                n_accepted += accepted
+
+            duration = numpy.where(accepted, step_duration, duration)
+            velocity = numpy.where(accepted, step_velocity, velocity)
+            position = numpy.where(accepted, step_position, position)
+            if end_forces is not None:
+                start_forces = tuple(numpy.where(accepted, end, start) for end, start in zip(end_forces, (acceleration, thrust, drag)))
+
+            if record_history:
+                durations.append(duration)
+                accelerations.append(acceleration)
+                velocities.append(velocity)
+                positions.append(position)
+                thrusts.append(thrust)
+                drags.append(drag)
+                accepted_steps.append(accepted)
+
+            timestep_sizes[active] = DynamicsIntegrator.get_next_timestep_size(run_configuration, timestep_sizes[active], error[active])
+            active &= ~takeoff_reached
+            outcomes[takeoff_reached] = numpy.where(velocity[takeoff_reached] > stall_velocities[takeoff_reached], 1, -1)
+
+        PhaseProfiler.leave(previous_phase)
+
+        history = None
+        if record_history:
+            history = tuple(numpy.stack(values) for values in (durations, accelerations, velocities, positions, thrusts, drags, accepted_steps))
+        elif record_summary:
+            history = (
+                numpy.stack((previous_duration, duration)),
+                numpy.stack((last_acceleration,)),
+                numpy.stack((previous_velocity, velocity)),
+                numpy.stack((previous_position, position)),
+                numpy.stack((last_thrust,)),
+                numpy.stack((last_drag,)),
+                n_accepted
+            )
+
+        return stall_velocities, history, decided_early, outcomes
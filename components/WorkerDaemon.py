@@ -0,0 +1,127 @@
+from multiprocessing.connection import Listener, Connection
+import collections
+import logging
+import numpy
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache, ThrustCacheManager
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.WorkerPool import WorkerPool
+from components.WorkerMessage import WorkerMessage
+from components.utils.thrust_sources import ThrustSource
+
+class WorkerDaemon:
+    POLL_INTERVAL = 0.005
+
+    address: tuple[str, int]
+    authkey: bytes
+    worker_pool: WorkerPool
+    manager: ThrustCacheManager
+    thrust_caches: dict[tuple[float, int], ThrustCache]
+    task_id: int
+
+    def __init__(self, address: tuple[str, int], authkey: bytes, n_workers: int) -> None:
+        self.address = address
+        self.authkey = authkey
+        self.worker_pool = WorkerPool(n_workers)
+        self.manager = ThrustCacheManager()
+        self.manager.start()
+        self.thrust_caches = dict()
+        self.task_id = 0
+
+    def get_thrust_model(self, run_configuration: RunConfiguration, thrust_specification: dict) -> ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid:
+        thrust_source = ThrustSource(thrust_specification['source'])
+        velocity_quantum = float(thrust_specification['velocity_quantum'])
+        prefetch_depth = int(thrust_specification['prefetch_depth'])
+
+        thrust_cache = self.thrust_caches.get((velocity_quantum, prefetch_depth))
+        if thrust_cache is None:
+            thrust_cache = self.thrust_caches[(velocity_quantum, prefetch_depth)] = ThrustCache(self.manager, numpy.float64(velocity_quantum), prefetch_depth)
+
+        thrust_model_type = WorkerMessage.get_thrust_model_type(thrust_source, run_configuration)
+        return thrust_cache if thrust_model_type is None else thrust_model_type(*WorkerMessage.get_thrust_arrays(thrust_model_type, thrust_specification['arrays']), thrust_cache)
+
+    def serve_forever(self) -> None:
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logging.info(f'WORKER_DAEMON = {self.address[0]}:{listener.address[1]} | WORKERS = {self.worker_pool.n_workers}')
+            while True:
+                try:
+                    connection = listener.accept()
+                except OSError as e:
+                    logging.warning(f'Rejected connection: {e}')
+                    continue
+
+                with connection:
+                    logging.info(f'OPTIMIZER = {listener.last_accepted}')
+                    self.serve_connection(connection)
+                logging.info(f'OPTIMIZER_DISCONNECTED = {listener.last_accepted}')
+
+    def serve_connection(self, connection: Connection) -> None:
+        free_workers = list(range(self.worker_pool.n_workers))
+        pending: collections.deque[tuple[int, int, numpy.float64]] = collections.deque()
+        running: dict[int, tuple[int, int]] = dict()
+
+        try:
+            WorkerMessage.send(connection, ['hello', self.worker_pool.n_workers])
+            while True:
+                if connection.poll(self.POLL_INTERVAL):
+                    message = WorkerMessage.receive(connection)
+                    if message is None:
+                        return
+
+                    if message[0] == 'configure':
+                        _, identifier, document, thrust_specification, terminate_early, summary_only = message
+                        try:
+                            run_configuration = WorkerMessage.get_run_configuration(identifier, document)
+                            thrust_model = self.get_thrust_model(run_configuration, thrust_specification)
+                        except Exception as e:
+                            raise ValueError(f'invalid configuration ({type(e).__name__}: {e})') from e
+                        self.worker_pool.configure(run_configuration, thrust_model, bool(terminate_early), bool(summary_only))
+                    elif message[0] == 'simulate':
+                        _, remote_task_id, mass = message
+                        self.task_id += 1
+                        pending.append((self.task_id, int(remote_task_id), numpy.float64(mass)))
+                    elif message[0] == 'cancel':
+                        _, remote_task_id = message
+                        for task in pending:
+                            if task[1] == remote_task_id:
+                                pending.remove(task)
+                                WorkerMessage.send(connection, WorkerMessage.get_result_message(remote_task_id, None))
+                                break
+                        for task_id, (worker_index, running_task_id) in running.items():
+                            if running_task_id == remote_task_id:
+                                self.worker_pool.cancel(task_id, worker_index)
+                                break
+                    else:
+                        raise ValueError(f'unknown worker message "{message[0]}"')
+
+                while pending and free_workers:
+                    worker_index = free_workers.pop()
+                    task_id, remote_task_id, mass = pending.popleft()
+                    running[task_id] = (worker_index, remote_task_id)
+                    self.worker_pool.submit_task(worker_index, task_id, mass)
+
+                result = self.worker_pool.get_result(timeout=0)
+                while result is not None:
+                    task_id, worker_index, dynamics_model = result
+                    _, remote_task_id = running.pop(task_id)
+                    free_workers.append(worker_index)
+                    WorkerMessage.send(connection, WorkerMessage.get_result_message(remote_task_id, dynamics_model))
+                    result = self.worker_pool.get_result(timeout=0)
+        except (EOFError, OSError) as e:
+            logging.warning(f'Lost connection to the optimizer: {e}')
+        except Exception as e:
+            logging.warning(f'Rejected malformed message from the optimizer, closing its connection: {e}')
+        finally:
+            for task_id, (worker_index, _) in running.items():
+                self.worker_pool.cancel(task_id, worker_index)
+            while running:
+                result = self.worker_pool.get_result(timeout=self.POLL_INTERVAL)
+                if result is not None:
+                    running.pop(result[0])
+
+    def close(self) -> None:
+        self.worker_pool.close()
+        self.manager.shutdown()
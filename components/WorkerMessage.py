@@ -0,0 +1,80 @@
+from multiprocessing.connection import Connection
+import pathlib
+import numpy
+import json
+
+from components.RunConfiguration import RunConfiguration
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+from components.OptimizationCheckpoint import OptimizationCheckpoint
+from components.ThrustCache import ThrustCache
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.utils.thrust_sources import ThrustSource
+
+class WorkerMessage:
+    MAXIMUM_SIZE = 2**30
+    THRUST_MODEL_TYPES = {ThrustSource.TABLE: ThrustTable, ThrustSource.SURROGATE: ThrustSurrogate}
+
+    @classmethod
+    def send(cls, connection: Connection, message: list | None) -> None:
+        connection.send_bytes(json.dumps(message).encode())
+
+    @classmethod
+    def receive(cls, connection: Connection) -> list | None:
+        message = json.loads(connection.recv_bytes(cls.MAXIMUM_SIZE))
+        if message is not None and (not isinstance(message, list) or not message or not isinstance(message[0], str)):
+            raise ValueError(f'malformed worker message: {str(message)[:80]}')
+        return message
+
+    @classmethod
+    def get_thrust_source(cls, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid) -> ThrustSource:
+        if isinstance(thrust_model, ThrustCache):
+            return ThrustSource.CACHE
+        if isinstance(thrust_model, ThrustSurrogate):
+            return ThrustSource.SURROGATE
+        return ThrustSource.TABLE
+
+    @classmethod
+    def get_thrust_model_type(cls, thrust_source: ThrustSource, run_configuration: RunConfiguration) -> type[ThrustTable] | type[ThrustSurrogate] | type[ThrustGrid] | None:
+        if thrust_source == ThrustSource.CACHE:
+            return None
+        if thrust_source == ThrustSource.TABLE and run_configuration.voltage_profile_variable is not None:
+            return ThrustGrid
+        return cls.THRUST_MODEL_TYPES[thrust_source]
+
+    @classmethod
+    def get_configure_message(cls, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, terminate_early: bool, summary_only: bool) -> list:
+        thrust_cache = thrust_model if isinstance(thrust_model, ThrustCache) else thrust_model.fallback
+        thrust_specification = {
+            'source': cls.get_thrust_source(thrust_model).value,
+            'velocity_quantum': float(thrust_cache.velocity_quantum),
+            'prefetch_depth': int(thrust_cache.prefetch_depth),
+            'arrays': [] if isinstance(thrust_model, ThrustCache) else [numpy.asarray(getattr(thrust_model, array), dtype=numpy.float64).tolist() for array in type(thrust_model).ARRAYS]
+        }
+        return ['configure', run_configuration.identifier, run_configuration.get_document(), thrust_specification, bool(terminate_early), bool(summary_only)]
+
+    @classmethod
+    def get_run_configuration(cls, identifier: str, document: dict) -> RunConfiguration:
+        if not isinstance(identifier, str) or not isinstance(document, dict):
+            raise TypeError(f'run configuration must be sent as an identifier and a json document')
+        return RunConfiguration(pathlib.Path(f'{identifier}.json'), document, identifier)
+
+    @classmethod
+    def get_thrust_arrays(cls, thrust_model_type: type[ThrustTable] | type[ThrustSurrogate] | type[ThrustGrid], arrays: list) -> list[numpy.ndarray[numpy.float64]]:
+        if not isinstance(arrays, list) or len(arrays) != len(thrust_model_type.ARRAYS):
+            raise ValueError(f'{thrust_model_type.__name__} requires {len(thrust_model_type.ARRAYS)} arrays ({", ".join(thrust_model_type.ARRAYS)})')
+        return [numpy.array(array, dtype=numpy.float64) for array in arrays]
+
+    @classmethod
+    def get_result_message(cls, task_id: int, dynamics_model: ConstantMassDynamicsModel | None) -> list:
+        columns = None if dynamics_model is None else {name: column.tolist() for name, column in OptimizationCheckpoint.get_result_columns([dynamics_model]).items()}
+        return ['result', int(task_id), columns]
+
+    @classmethod
+    def get_dynamics_model(cls, columns: dict | None) -> ConstantMassDynamicsModel | None:
+        if columns is None:
+            return None
+        if not isinstance(columns, dict):
+            raise TypeError(f'dynamics model must be sent as columns, got {type(columns).__name__}')
+        return OptimizationCheckpoint.get_results({name: numpy.asarray(column) for name, column in columns.items()})[0]
@@ -0,0 +1,179 @@
+from multiprocessing import shared_memory, resource_tracker
+import multiprocessing
+import queue
+import time
+import ctypes
+import numpy
+import os
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.ConstantMassDynamicsSimulation import ConstantMassDynamicsSimulation
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+from components.WorkerTelemetry import WorkerTelemetry
+from components.TrajectoryBuffer import TrajectoryBuffer
+from components.PhaseProfiler import PhaseProfiler
+from components.utils.process_statuses import ProcessStatus
+from components.utils.optimizer_phases import OptimizerPhase
+
+class WorkerPool:
+    n_workers: int
+    epoch_id: int
+    telemetry: WorkerTelemetry
+
+    task_queues: list[multiprocessing.Queue]
+    results_queue: multiprocessing.Queue
+    cancelled_epochs: list[ctypes.c_longlong]
+    workers: list[multiprocessing.Process]
+    trajectory_memories: list[shared_memory.SharedMemory | None]
+
+    def __init__(self, n_workers: int) -> None:
+        if n_workers < 1:
+            raise ValueError(f'number of workers ({n_workers}) must be at least 1')
+
+        self.n_workers = n_workers
+        self.epoch_id = 0
+        self.telemetry = WorkerTelemetry(self.n_workers)
+
+        self.task_queues = list()
+        self.results_queue = multiprocessing.Queue()
+        self.cancelled_epochs = list()
+        self.workers = list()
+        self.trajectory_memories = [None] * self.n_workers
+
+        if os.name == 'posix':
+            resource_tracker.ensure_running()
+
+        for i in range(self.n_workers):
+            self.task_queues.append(multiprocessing.Queue())
+            self.cancelled_epochs.append(multiprocessing.RawValue(ctypes.c_longlong, -1))
+            self.workers.append(
+                multiprocessing.Process(
+                    target=self.serve,
+                    args=(
+                        i,
+                        self.task_queues[i],
+                        self.results_queue,
+                        self.cancelled_epochs[i],
+                        self.telemetry
+                    ),
+                    daemon=True
+                )
+            )
+
+        for worker in self.workers:
+            worker.start()
+
+    def configure(self, run_configuration: RunConfiguration, thrust_model: ThrustCache | ThrustTable | ThrustSurrogate | ThrustGrid, terminate_early: bool, summary_only: bool = False, profile: bool = False) -> None:
+        for task_queue in self.task_queues:
+            task_queue.put(('configure', run_configuration, thrust_model, terminate_early, summary_only, profile))
+
+    def submit(self, MASS_SPACE: numpy.ndarray[numpy.float64]) -> int:
+        if len(MASS_SPACE) > self.n_workers:
+            raise ValueError(f'number of masses ({len(MASS_SPACE)}) cannot exceed the number of workers ({self.n_workers})')
+
+        self.epoch_id += 1
+        for i, mass in enumerate(MASS_SPACE):
+            self.submit_task(i, self.epoch_id, mass)
+
+        return self.epoch_id
+
+    def submit_task(self, worker_index: int, epoch_id: int, mass: numpy.float64) -> None:
+        self.task_queues[worker_index].put(('simulate', epoch_id, mass))
+
+    def cancel(self, epoch_id: int, worker_index: int) -> None:
+        self.cancelled_epochs[worker_index].value = epoch_id
+
+    def get_result(self, timeout: float) -> tuple[int, int, ConstantMassDynamicsModel | None] | None:
+        try:
+            epoch_id, worker_index, trajectory_handle, worker_profile = self.results_queue.get(timeout=timeout)
+        except queue.Empty:
+            for i, worker in enumerate(self.workers):
+                if not worker.is_alive():
+                    raise RuntimeError(f'worker {i} exited unexpectedly with exit code {worker.exitcode}')
+            return None
+
+        previous_phase = PhaseProfiler.enter(OptimizerPhase.COLLECTING_RESULTS)
+        if worker_profile is not None and PhaseProfiler.current is not None:
+            PhaseProfiler.current.merge(worker_profile)
+        dynamics_model = None if trajectory_handle is None else self.get_model(worker_index, trajectory_handle)
+        PhaseProfiler.leave(previous_phase)
+
+        return epoch_id, worker_index, dynamics_model
+
+    def get_model(self, worker_index: int, trajectory_handle: tuple[str, int, bool, numpy.float64, numpy.float64, bool, bool, bool]) -> ConstantMassDynamicsModel:
+        memory = self.trajectory_memories[worker_index]
+        if memory is None or memory.name != trajectory_handle[0]:
+            if memory is not None:
+                memory.close()
+            memory = self.trajectory_memories[worker_index] = shared_memory.SharedMemory(name=trajectory_handle[0])
+
+        return TrajectoryBuffer.get_model(memory, trajectory_handle)
+
+    def close(self) -> None:
+        for worker, task_queue in zip(self.workers, self.task_queues):
+            if worker.is_alive():
+                task_queue.put(None)
+
+        for worker in self.workers:
+            worker.join()
+
+        for memory in self.trajectory_memories:
+            if memory is not None:
+                memory.close()
+
+    @classmethod
+    def serve(
+        cls,
+        worker_index: int,
+        task_queue: multiprocessing.Queue,
+        results_queue: multiprocessing.Queue,
+        cancelled_epoch: ctypes.c_longlong,
+        telemetry: WorkerTelemetry
+    ) -> None:
+        run_configuration = None
+        thrust_model = None
+        terminate_early = False
+        summary_only = False
+        trajectory = TrajectoryBuffer()
+        PhaseProfiler.current = None
+
+        try:
+            while True:
+                task = task_queue.get()
+                if task is None:
+                    return
+
+                if task[0] == 'configure':
+                    _, run_configuration, thrust_model, terminate_early, summary_only, profile = task
+                    PhaseProfiler.current = PhaseProfiler(f'Worker {worker_index}') if profile else None
+                    continue
+
+                _, epoch_id, mass = task
+                telemetry.reset(worker_index, ProcessStatus.FORKING_PROCESS)
+                start = time.perf_counter_ns()
+                PhaseProfiler.enter(ProcessStatus.FORKING_PROCESS)
+
+                trajectory_handle = ConstantMassDynamicsSimulation.simulate_dynamics_given_mass(
+                    run_configuration,
+                    mass,
+                    thrust_model,
+                    terminate_early,
+                    lambda: cancelled_epoch.value == epoch_id,
+                    telemetry,
+                    worker_index,
+                    trajectory,
+                    summary_only
+                )
+
+                worker_profile = None
+                if PhaseProfiler.current is not None:
+                    PhaseProfiler.current.stop()
+                    PhaseProfiler.current.add_event(f'm = {mass:.{run_configuration.arithmetic_precision}f} kg', 'simulation', start, time.perf_counter_ns(), {'epoch': epoch_id, 'cancelled': trajectory_handle is None})
+                    worker_profile = PhaseProfiler.current.drain()
+                results_queue.put((epoch_id, worker_index, trajectory_handle, worker_profile))
+        finally:
+            trajectory.close()
@@ -0,0 +1,73 @@
+import multiprocessing
+import ctypes
+import numpy
+
+from components.utils.process_statuses import ProcessStatus
+
+class WorkerTelemetry:
+    MAXIMUM_READ_ATTEMPTS = 64
+
+    RECORD_DTYPE = numpy.dtype([
+        ('version', numpy.uint64),
+        ('status', numpy.int64),
+        ('steps', numpy.uint64),
+        ('time', numpy.float64),
+        ('position', numpy.float64),
+        ('velocity', numpy.float64),
+        ('acceleration', numpy.float64),
+        ('thrust', numpy.float64),
+        ('drag', numpy.float64)
+    ])
+
+    n_workers: int
+    buffer: ctypes.Array
+    records: numpy.ndarray
+
+    def __init__(self, n_workers: int) -> None:
+        self.n_workers = n_workers
+        self.buffer = multiprocessing.RawArray(ctypes.c_byte, n_workers * self.RECORD_DTYPE.itemsize)
+        self.records = numpy.frombuffer(self.buffer, dtype=self.RECORD_DTYPE)
+
+    def __getstate__(self) -> dict:
+        return {'n_workers': self.n_workers, 'buffer': self.buffer}
+
+    def __setstate__(self, state: dict) -> None:
+        self.n_workers = state['n_workers']
+        self.buffer = state['buffer']
+        self.records = numpy.frombuffer(self.buffer, dtype=self.RECORD_DTYPE)
+
+    def reset(self, worker_index: int, status: ProcessStatus) -> None:
+        record = self.records[worker_index]
+        record['version'] += 1
+        record['status'] = status.value
+        record['steps'] = 0
+        record['time'] = record['position'] = record['velocity'] = record['acceleration'] = record['thrust'] = record['drag'] = 0.0
+        record['version'] += 1
+
+    def set_status(self, worker_index: int, status: ProcessStatus) -> None:
+        self.records['status'][worker_index] = status.value
+
+    def update(self, worker_index: int, time: float, position: float, velocity: float, acceleration: float, thrust: float, drag: float) -> None:
+        record = self.records[worker_index]
+        record['version'] += 1
+        record['steps'] += 1
+        record['time'] = time
+        record['position'] = position
+        record['velocity'] = velocity
+        record['acceleration'] = acceleration
+        record['thrust'] = thrust
+        record['drag'] = drag
+        record['version'] += 1
+
+    def read(self, worker_index: int) -> numpy.void:
+        record = self.records[worker_index]
+        for _ in range(self.MAXIMUM_READ_ATTEMPTS):
+            version = int(record['version'])
+            if version % 2 == 1:
+                continue
+
+            snapshot = record.copy()
+            if int(record['version']) == version:
+                return snapshot
+
+        return record.copy()
@@ -25,7 +25,45 @@ EXPECTED_CONFIGURATION_STRUCTURE = {
     }
 }
 
-def get_config_structure(json: object) -> object:
+OPTIONAL_CONFIGURATION_STRUCTURE = {
+    'integration': {
+        'method': (None, str),
+        'tolerance': (None, float, int)
+    },
+    'uncertainty': {
+        'samples': (None, int),
+        'seed': (None, int),
+        'distribution': (None, str),
+        'fluid_density': (None, float, int),
+        'drag_coefficient': (None, float, int),
+        'reference_area': (None, float, int),
+        'lift_coefficient': (None, float, int)
+    },
+    'voltage_profile': {
+        'variable': (None, str),
+        'breakpoints': [(float, int)],
+        'voltages': [(float, int)]
+    }
+}
+
+def get_expanded_structure(json: object, structure: object) -> object:
+    if isinstance(structure, dict) and isinstance(json, dict):
+        return {key: get_expanded_structure(json.get(key), value) for key, value in structure.items()}
+    if isinstance(structure, list) and len(structure) == 1 and isinstance(json, list):
+        return structure * len(json)
+    
+    return structure
+
+def get_expected_config_structure(json: object) -> object:
+    expected_structure = dict(EXPECTED_CONFIGURATION_STRUCTURE)
+    if isinstance(json, dict):
+        for key, value in OPTIONAL_CONFIGURATION_STRUCTURE.items():
+            if key in json:
+                expected_structure[key] = get_expanded_structure(json[key], value)
+    
+    return expected_structure
+
+def get_config_structure(json: object, expected_structure: object = EXPECTED_CONFIGURATION_STRUCTURE) -> object:
     def get_json_structure(json: object, origin_keys: list[str] = list()) -> object:
         if isinstance(json, dict):
             result = {key: get_json_structure(value, origin_keys + [key]) for key, value in json.items()}
@@ -33,8 +71,17 @@ def get_config_structure(json: object) -> object:
             result = list()
             for i, value in enumerate(json):
                 result.append(get_json_structure(value, [key for key in origin_keys] + [i]))
+        elif isinstance(json, str):
+            result = expected_structure
+            try:
+                for key in origin_keys:
+                    result = result[key]
+                if not (result is str or isinstance(result, tuple) and str in result):
+                    result = str
+            except Exception as e:
+                result = str
         elif json is None or isinstance(json, int) or isinstance(json, float):
-            result = EXPECTED_CONFIGURATION_STRUCTURE
+            result = expected_structure
             try:
                 for key in origin_keys:
                     result = result[key]
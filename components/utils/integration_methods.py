@@ -0,0 +1,6 @@
+import enum
+
+class IntegrationMethod(enum.Enum):
+    EULER = 'euler'
+    RK4 = 'rk4'
+    RK45 = 'rk45'
@@ -0,0 +1,14 @@
+import enum
+
+class OptimizerPhase(enum.Enum):
+    FORKING_WORKERS = 0
+    BUILDING_TABLE = enum.auto()
+    SEARCHING_MASSES = enum.auto()
+    SUBMITTING_MASSES = enum.auto()
+    AWAITING_RESULTS = enum.auto()
+    COLLECTING_RESULTS = enum.auto()
+    RENDERING_PROGRESS = enum.auto()
+    SIMULATING_LOCKSTEP = enum.auto()
+    WRITING_CHECKPOINT = enum.auto()
+    PLOTTING_RESULTS = enum.auto()
+    ANALYZING_UNCERTAINTY = enum.auto()
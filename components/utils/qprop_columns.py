@@ -0,0 +1,22 @@
+import enum
+
+class QpropColumn(enum.Enum):
+    VELOCITY = 'V(m/s)'
+    RPM = 'rpm'
+    DBETA = 'Dbeta'
+    THRUST = 'T(N)'
+    TORQUE = 'Q(N-m)'
+    SHAFT_POWER = 'Pshaft(W)'
+    VOLTAGE = 'Volts'
+    CURRENT = 'Amps'
+    MOTOR_EFFICIENCY = 'effmot'
+    PROPELLER_EFFICIENCY = 'effprop'
+    ADVANCE_RATIO = 'adv'
+    THRUST_COEFFICIENT = 'CT'
+    POWER_COEFFICIENT = 'CP'
+    SLIPSTREAM_VELOCITY = 'DV(m/s)'
+    EFFICIENCY = 'eff'
+    ELECTRICAL_POWER = 'Pelec'
+    PROPELLER_POWER = 'Pprop'
+    AVERAGE_LIFT_COEFFICIENT = 'cl_avg'
+    AVERAGE_DRAG_COEFFICIENT = 'cd_avg'
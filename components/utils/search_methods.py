@@ -0,0 +1,5 @@
+import enum
+
+class SearchMethod(enum.Enum):
+    GRID = 'grid'
+    ROOT = 'root'
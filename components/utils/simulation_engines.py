@@ -0,0 +1,5 @@
+import enum
+
+class SimulationEngine(enum.Enum):
+    PROCESS = 'process'
+    VECTORIZED = 'vectorized'
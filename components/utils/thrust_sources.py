@@ -0,0 +1,6 @@
+import enum
+
+class ThrustSource(enum.Enum):
+    CACHE = 'cache'
+    TABLE = 'table'
+    SURROGATE = 'surrogate'
@@ -0,0 +1,5 @@
+import enum
+
+class UncertaintyDistribution(enum.Enum):
+    NORMAL = 'normal'
+    UNIFORM = 'uniform'
@@ -0,0 +1,5 @@
+import enum
+
+class VoltageProfileVariable(enum.Enum):
+    TIME = 'time'
+    CURRENT = 'current'
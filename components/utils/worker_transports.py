@@ -0,0 +1,6 @@
+import enum
+
+class WorkerTransport(enum.Enum):
+    IN_PROCESS = 'in-process'
+    PROCESS = 'process'
+    SOCKET = 'socket'
@@ -2,36 +2,189 @@ import argparse
 import pathlib
 import logging
 import psutil
+import signal
+import json
+import sys
+import os
 
 from components.RunConfiguration import RunConfiguration
 from components.MaximumTakeOffMassOptimizer import MaximumTakeOffMassOptimizer
+from components.OptimizerSettings import OptimizerSettings
+from components.ThrustTableStore import ThrustTableStore
+from components.ResultHistory import ResultHistory
+from components.ResultPlotter import ResultPlotter
+from components.OptimizationCheckpoint import OptimizationCheckpoint
+from components.PhaseProfiler import PhaseProfiler
+from components.SweepRunner import SweepRunner
+from components.WorkerDaemon import WorkerDaemon
+from components.utils.thrust_sources import ThrustSource
+from components.utils.simulation_engines import SimulationEngine
+from components.utils.search_methods import SearchMethod
+from components.utils.worker_transports import WorkerTransport
+
+WORKER_KEY_ENVIRONMENT_VARIABLE = 'MTOM_WORKER_KEY'
+
+def parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(':')
+    if not host or not port.isdigit():
+        raise ValueError(f'worker address "{address}" is invalid: expected host:port')
+    return host, int(port)
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     
     MINIMUM_CORES_REQUIRED_BY_ALGORITHM_DESIGN = 4
     
-    system_cores = psutil.cpu_count(logical=False)
-    if system_cores < 4:
-        raise SystemError(f'system requirements not met: number of cores ({system_cores}) must be at least 4')
-    
     argparser = argparse.ArgumentParser(add_help=False)
-    argparser.add_argument('-c', '--config', required=True, type=str, help='Path to the input configuration json file')
+    input_arguments = argparser.add_mutually_exclusive_group(required=True)
+    input_arguments.add_argument('-c', '--config', type=str, help='Path to the input configuration json file')
+    input_arguments.add_argument('--sweep', type=str, help='Path to a sweep json file expanding a configuration template over parameter axes')
+    input_arguments.add_argument('--plot', type=str, help='Path to a trajectories npz file written with --trajectories whose heaviest mass that takes off is plotted without optimizing')
+    input_arguments.add_argument('--serve', type=str, help='Address (host:port) on which to run a worker daemon simulating the masses submitted by optimizers using the socket transport, serving one optimizer connection at a time')
+    argparser.add_argument('--sweep-output', type=str, default='sweep_results.csv', help='Path to the csv file the sweep results are written to')
     argparser.add_argument('-p', '--processes', type=int, default=MINIMUM_CORES_REQUIRED_BY_ALGORITHM_DESIGN-1, help='Amount of processes forked to speedup optimization')
+    argparser.add_argument('-w', '--workers', type=int, default=None, help='Amount of persistent worker processes simulating the masses of each epoch, overriding the core-bound process count')
+    argparser.add_argument('-q', '--velocity-quantum', type=float, default=0.001, help='Velocity (m/s) resolution of the shared thrust cache, 0 to cache exact velocities only')
+    argparser.add_argument('--prefetch-depth', type=int, default=0, help='Amount of QPROP runs each worker keeps in flight for the velocities predicted for its next timestep when thrust comes from the cache, 0 to disable prefetching')
+    argparser.add_argument('-t', '--thrust-source', type=str, choices=[thrust_source.value for thrust_source in ThrustSource], default=ThrustSource.CACHE.value, help='Source of thrust values: per-velocity QPROP runs through the cache (default), a table interpolated from QPROP velocity sweeps or a monotone spline refined with QPROP runs until its estimated error is within the arithmetic precision')
+    argparser.add_argument('--sweep-count', type=int, default=4, help='Amount of QPROP velocity sweeps used to build the thrust table')
+    argparser.add_argument('--sweep-points', type=int, default=100, help='Amount of velocities per QPROP sweep used to build the thrust table')
+    argparser.add_argument('--voltage-points', type=int, default=9, help='Amount of voltages spanning the voltage profile at which QPROP velocity sweeps are run to build the thrust grid of configurations with a voltage profile')
+    argparser.add_argument('--table-store', type=str, default='.thrust_tables', help='Path to the directory where thrust tables and cached thrusts are stored and reused across runs')
+    argparser.add_argument('--table-store-size', type=float, default=256, help='Size (MB) beyond which the least recently used stored thrust tables are evicted')
+    argparser.add_argument('--no-table-store', action='store_true', help='Build thrust tables and cache thrusts without reading or writing the thrust table store')
+    argparser.add_argument('--history', type=str, default='.result_history.sqlite', help='Path to the SQLite database where every MTOM found is recorded and from which the starting mass range of later runs is predicted')
+    argparser.add_argument('--no-history', action='store_true', help='Search the configured mass range without reading or writing the result history')
+    argparser.add_argument('-e', '--engine', type=str, choices=[simulation_engine.value for simulation_engine in SimulationEngine], default=SimulationEngine.PROCESS.value, help='Simulation engine: one forked process per mass or all masses of an epoch in lockstep within a single process')
+    argparser.add_argument('--transport', type=str, choices=[worker_transport.value for worker_transport in WorkerTransport], default=WorkerTransport.PROCESS.value, help='Transport of the masses simulated by the process engine: sequentially within the optimizer process, to local worker processes or to worker daemons over TCP')
+    argparser.add_argument('--worker-addresses', type=str, nargs='+', default=list(), help='Addresses (host:port) of the worker daemons used by the socket transport')
+    argparser.add_argument('--worker-key', type=str, default=None, help=f'Key authenticating optimizers to worker daemons, read from the {WORKER_KEY_ENVIRONMENT_VARIABLE} environment variable by default')
+    argparser.add_argument('-m', '--masses-per-epoch', type=int, default=64, help='Amount of masses simulated per epoch by the vectorized engine')
+    argparser.add_argument('-s', '--search', type=str, choices=[search_method.value for search_method in SearchMethod], default=SearchMethod.GRID.value, help='Mass search: n-ary grid search over takeoff statuses or root search over the continuous takeoff velocity margin')
+    argparser.add_argument('--timestep-levels', type=int, default=0, help='Amount of times the timestep size is halved from a coarse one bracketing the MTOM down to the configured one, stopping once the Richardson estimate (not a bound) of the MTOM discretization error is within the arithmetic precision, 0 to search with the configured timestep size only')
+    argparser.add_argument('--no-early-termination', action='store_true', help='Simulate every mass up to the takeoff displacement even once its outcome is decided')
+    argparser.add_argument('--summary-trajectories', action='store_true', help='Keep only the takeoff state of every mass but the MTOM instead of its whole trajectory')
+    argparser.add_argument('--checkpoint-dir', type=str, default='.checkpoints', help='Path to the directory where the search state and simulated masses are checkpointed after every epoch')
+    argparser.add_argument('--no-checkpoint', action='store_true', help='Optimize without writing checkpoints')
+    argparser.add_argument('--resume', action='store_true', help='Resume the optimization from the last epoch checkpointed for the same configuration and optimizer settings')
+    argparser.add_argument('--profile', type=str, nargs='?', const='profile_trace.json', default=None, help='Time every phase of the workers and the optimizer, logging a summary and writing a trace file (profile_trace.json by default) viewable in a trace viewer')
+    argparser.add_argument('--headless', action='store_true', help='Render no progress and plot nothing, printing the result as json to the standard output instead')
+    argparser.add_argument('--result-output', type=str, default=None, help='Path to a json file the result is written to instead of the standard output')
+    argparser.add_argument('--trajectories', type=str, default=None, help='Path to an npz file the trajectories of every simulated mass are written to')
+    argparser.add_argument('-r', '--refresh-rate', type=float, default=10, help='Rate (Hz) at which worker progress is rendered, 0 to disable progress rendering')
     args = argparser.parse_args()
     
-    json_path = pathlib.Path(args.config)
+    worker_transport = WorkerTransport(args.transport)
+    worker_key = args.worker_key if args.worker_key is not None else os.environ.get(WORKER_KEY_ENVIRONMENT_VARIABLE)
+    if worker_key is None and (args.serve is not None or worker_transport == WorkerTransport.SOCKET and args.sweep is None):
+        raise ValueError(f'worker daemons require a key: supply --worker-key or set the {WORKER_KEY_ENVIRONMENT_VARIABLE} environment variable')
+    
+    if args.plot is not None:
+        trajectories_path = pathlib.Path(args.plot)
+        if not trajectories_path.exists():
+            raise FileNotFoundError(f'trajectories file does not exist at path "{trajectories_path}"')
+        logging.info(f'PLOT_OUTPUT = {ResultPlotter.plot_trajectories(trajectories_path)}.png')
+        return
+    
+    system_cores = psutil.cpu_count(logical=False)
+    if args.serve is not None:
+        worker_daemon = WorkerDaemon(parse_address(args.serve), worker_key.encode(), args.workers if args.workers is not None else max(1, system_cores-1))
+        signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+        try:
+            worker_daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker_daemon.close()
+        return
+    
+    if system_cores < 4 and (worker_transport == WorkerTransport.PROCESS or args.sweep is not None):
+        raise SystemError(f'system requirements not met: number of cores ({system_cores}) must be at least 4')
+    
+    json_path = pathlib.Path(args.config if args.sweep is None else args.sweep)
     if not json_path.exists():
-        raise FileNotFoundError(f'configuration file does not exist at path "{json_path}"')
+        raise FileNotFoundError(f'{"configuration" if args.sweep is None else "sweep"} file does not exist at path "{json_path}"')
     
     n_processes = max(MINIMUM_CORES_REQUIRED_BY_ALGORITHM_DESIGN-1, min(args.processes, system_cores-1))
     if n_processes != args.processes:
         logging.warning(f'Supplied number of processes ({args.processes}) is beyond the allowable [{MINIMUM_CORES_REQUIRED_BY_ALGORITHM_DESIGN-1}, {system_cores-1}]. Clamping to {n_processes}...')
     
-    optimizer = MaximumTakeOffMassOptimizer(n_processes)
+    if args.workers is not None:
+        if args.workers < 1:
+            raise ValueError(f'number of workers ({args.workers}) must be at least 1')
+        n_processes = args.workers
+    
+    if args.prefetch_depth > 0 and args.velocity_quantum == 0:
+        logging.warning(f'Prefetching requires a positive velocity quantum, ignoring --prefetch-depth...')
+    
+    thrust_table_store = None if args.no_table_store else ThrustTableStore(pathlib.Path(args.table_store), int(args.table_store_size*2**20))
+    result_history = None if args.no_history else ResultHistory(pathlib.Path(args.history))
+    
+    optimizer_settings = OptimizerSettings(
+        velocity_quantum=args.velocity_quantum,
+        prefetch_depth=args.prefetch_depth,
+        thrust_source=ThrustSource(args.thrust_source),
+        sweep_count=args.sweep_count,
+        sweep_points=args.sweep_points,
+        voltage_points=args.voltage_points,
+        simulation_engine=SimulationEngine(args.engine),
+        masses_per_epoch=args.masses_per_epoch,
+        search_method=SearchMethod(args.search),
+        terminate_early=not args.no_early_termination,
+        timestep_levels=args.timestep_levels,
+        summary_trajectories=args.summary_trajectories,
+        worker_transport=worker_transport,
+        worker_addresses=tuple(parse_address(address) for address in args.worker_addresses),
+        worker_authkey=None if worker_key is None else worker_key.encode(),
+        refresh_rate=0 if args.headless else args.refresh_rate,
+        plot_results=not args.headless
+    )
+    
+    if args.sweep is not None:
+        if args.profile is not None:
+            logging.warning(f'Profiling is not supported for sweeps, ignoring --profile...')
+        if worker_transport != WorkerTransport.PROCESS:
+            logging.warning(f'Sweep jobs always run in local worker processes, ignoring --transport...')
+        sweep_runner = SweepRunner(json_path)
+        sweep_runner.run(n_processes, pathlib.Path(args.sweep_output), optimizer_settings, thrust_table_store, result_history)
+        return
+    
+    checkpoint = None if args.no_checkpoint else OptimizationCheckpoint(pathlib.Path(args.checkpoint_dir))
+    profiler = None if args.profile is None else PhaseProfiler('Optimizer')
+    
+    optimizer = MaximumTakeOffMassOptimizer(
+        n_processes,
+        optimizer_settings,
+        thrust_table_store=thrust_table_store,
+        result_history=result_history,
+        checkpoint=checkpoint,
+        profiler=profiler
+    )
     
-    run_configuration = RunConfiguration(json_path)
-    optimizer.run(run_configuration)
+    try:
+        run_configuration = RunConfiguration(json_path)
+        result_state, optimal_dynamics_model = optimizer.run(run_configuration, resume=args.resume)
+        uncertainty_mtoms = None
+        if run_configuration.uncertainty_samples > 0:
+            uncertainty_mtoms = optimizer.run_uncertainty_analysis(run_configuration)
+        
+        if args.headless or args.result_output is not None:
+            result_document = json.dumps(optimizer.get_result_document(run_configuration, result_state, optimal_dynamics_model, uncertainty_mtoms), indent=4)
+            if args.result_output is None:
+                print(result_document)
+            else:
+                with open(args.result_output, 'w') as result_file:
+                    result_file.write(result_document)
+                logging.info(f'RESULT_OUTPUT = {args.result_output}')
+        
+        if args.trajectories is not None:
+            optimizer.save_trajectories(args.trajectories)
+            logging.info(f'TRAJECTORIES_OUTPUT = {args.trajectories}')
+    finally:
+        optimizer.close()
+        if profiler is not None:
+            profiler.log_summary()
+            profiler.write_trace(pathlib.Path(args.profile))
 
 if __name__ == '__main__':
     main()
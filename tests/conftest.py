@@ -0,0 +1,115 @@
+import pathlib
+import pytest
+import numpy
+import copy
+import sys
+import os
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+FAKE_QPROP_DIRECTORY = ROOT / 'benchmarks' / 'fake_qprop'
+
+sys.path.insert(0, str(ROOT))
+os.environ['PATH'] = f'{FAKE_QPROP_DIRECTORY}{os.pathsep}{os.environ.get("PATH", "")}'
+
+from components.RunConfiguration import RunConfiguration
+from components.ThrustCache import ThrustCache, ThrustCacheManager
+from components.ThrustTable import ThrustTable
+from components.ConstantMassDynamicsModel import ConstantMassDynamicsModel
+from components.ConstantMassDynamicsSimulation import ConstantMassDynamicsSimulation
+from components.TrajectoryBuffer import TrajectoryBuffer
+from components.WorkerTelemetry import WorkerTelemetry
+from components.MaximumTakeOffMassOptimizer import MaximumTakeOffMassOptimizer
+from components.OptimizerSettings import OptimizerSettings
+from components.ResultHistory import ResultHistory
+from components.ThrustTableStore import ThrustTableStore
+from components.utils.simulation_engines import SimulationEngine
+
+EXAMPLE_CONFIGURATION = {
+    'propeller_file': str(ROOT / 'propeller_files' / 'apc14x10e'),
+    'motor_file': str(ROOT / 'motor_files' / 'CobraCM2217-26'),
+    'timestep_size': 0.1,
+    'mass_range': [0.1, 2.0],
+    'arithmetic_precision': None,
+    'takeoff_displacement': 100.0,
+    'setpoint_parameters': {
+        'velocity': None,
+        'voltage': 8.4,
+        'dbeta': None,
+        'current': None,
+        'torque': None,
+        'thrust': None,
+        'pele': None,
+        'rpm': None
+    },
+    'aerodynamic_forces': {
+        'fluid_density': 1.225,
+        'true_airspeed': None,
+        'drag_coefficient': 0.1,
+        'reference_area': 0.075,
+        'acceleration_gravity': 9.81,
+        'lift_coefficient': 1.0
+    }
+}
+
+def get_fake_thrust(velocity: float, voltage: float = 8.4) -> float:
+    return 0.06 * voltage**2 * (1 - (velocity / (2.4*voltage))**2)
+
+def simulate_mass(run_configuration: RunConfiguration, mass: float, thrust_model, terminate_early: bool = False, summary_only: bool = False, capacity: int = TrajectoryBuffer.INITIAL_CAPACITY) -> ConstantMassDynamicsModel:
+    trajectory = TrajectoryBuffer(capacity)
+    try:
+        handle = ConstantMassDynamicsSimulation.simulate_dynamics_given_mass(run_configuration, numpy.float64(mass), thrust_model, terminate_early, lambda: False, WorkerTelemetry(1), 0, trajectory, summary_only)
+        dynamics_model = TrajectoryBuffer.get_model(trajectory.shared_memory, handle)
+    finally:
+        trajectory.close()
+    return dynamics_model
+
+def run_optimizer(run_configuration: RunConfiguration, thrust_cache: ThrustCache, thrust_model=None, n_processes: int = 1, result_history: ResultHistory | None = None, thrust_table_store: ThrustTableStore | None = None, **settings) -> tuple[MaximumTakeOffMassOptimizer, object, ConstantMassDynamicsModel | None]:
+    optimizer = MaximumTakeOffMassOptimizer(
+        n_processes,
+        OptimizerSettings(**{'simulation_engine': SimulationEngine.VECTORIZED, 'masses_per_epoch': 8, 'refresh_rate': 0, 'plot_results': False, **settings}),
+        thrust_cache,
+        thrust_table_store=thrust_table_store,
+        result_history=result_history
+    )
+    try:
+        result_state, optimal_dynamics_model = optimizer.run(run_configuration, thrust_model)
+    finally:
+        optimizer.close()
+    return optimizer, result_state, optimal_dynamics_model
+
+def get_configuration_data(**overrides) -> dict:
+    json_data = copy.deepcopy(EXAMPLE_CONFIGURATION)
+    for key, value in overrides.items():
+        json_data[key] = value
+    return json_data
+
+@pytest.fixture
+def make_run_configuration():
+    def make(identifier: str = 'example', **overrides) -> RunConfiguration:
+        return RunConfiguration(pathlib.Path(f'{identifier}.json'), get_configuration_data(**overrides), identifier)
+    return make
+
+@pytest.fixture
+def run_configuration(make_run_configuration) -> RunConfiguration:
+    return make_run_configuration()
+
+@pytest.fixture(scope='session')
+def thrust_cache_manager():
+    manager = ThrustCacheManager()
+    manager.start()
+    yield manager
+    manager.shutdown()
+
+@pytest.fixture
+def thrust_cache(thrust_cache_manager) -> ThrustCache:
+    return ThrustCache(thrust_cache_manager, numpy.float64(0.001))
+
+@pytest.fixture
+def qprop_calls(tmp_path, monkeypatch):
+    call_log_path = tmp_path / 'qprop_calls'
+    monkeypatch.setenv('FAKE_QPROP_CALL_LOG', str(call_log_path))
+    return lambda: call_log_path.stat().st_size if call_log_path.exists() else 0
+
+@pytest.fixture
+def thrust_table(run_configuration, thrust_cache) -> ThrustTable:
+    return ThrustTable.build(run_configuration, thrust_cache, 4, 100, None)
@@ -0,0 +1,93 @@
+import pytest
+import numpy
+
+from components.DynamicsIntegrator import DynamicsIntegrator
+
+THRUST = 5.0
+MASS = numpy.float64(1.0)
+
+def constant_thrust(velocity, duration):
+    return numpy.full_like(velocity, THRUST)
+
+def get_integration_configuration(make_run_configuration, method: str, **aerodynamic_forces):
+    run_configuration = make_run_configuration(integration={'method': method, 'tolerance': None})
+    return make_run_configuration(
+        integration={'method': method, 'tolerance': None},
+        aerodynamic_forces={**run_configuration.json_data['aerodynamic_forces'], **aerodynamic_forces}
+    )
+
+def integrate(run_configuration, timestep_size: float, end_time: float) -> tuple[numpy.float64, numpy.float64]:
+    position = velocity = duration = numpy.float64(0.0)
+    for _ in range(round(end_time / timestep_size)):
+        position, velocity, _, _, _, _, _ = DynamicsIntegrator.step(run_configuration, constant_thrust, MASS, position, velocity, duration, numpy.float64(timestep_size))
+        duration += timestep_size
+    return position, velocity
+
+def get_exact_state(run_configuration, time: float) -> tuple[float, float]:
+    drag_factor = float(run_configuration.get_drag_force(numpy.float64(1.0)))
+    terminal_velocity = numpy.sqrt(THRUST / drag_factor)
+    time_constant = MASS / numpy.sqrt(THRUST * drag_factor)
+    return terminal_velocity * time_constant * numpy.log(numpy.cosh(time / time_constant)), terminal_velocity * numpy.tanh(time / time_constant)
+
+@pytest.mark.parametrize('method', ['rk4', 'rk45'])
+def test_constant_acceleration_is_integrated_exactly(make_run_configuration, method):
+    run_configuration = get_integration_configuration(make_run_configuration, method, drag_coefficient=0.0)
+    position, velocity = integrate(run_configuration, 0.25, 2.0)
+
+    assert velocity == pytest.approx(THRUST / MASS * 2.0, rel=1e-12)
+    assert position == pytest.approx(0.5 * THRUST / MASS * 2.0**2, rel=1e-12)
+
+@pytest.mark.parametrize('method, order', [('euler', 1), ('rk4', 4), ('rk45', 5)])
+def test_error_shrinks_with_the_method_order(make_run_configuration, method, order):
+    run_configuration = get_integration_configuration(make_run_configuration, method)
+    coarse_position, coarse_velocity = integrate(run_configuration, 0.4, 4.0)
+    fine_position, fine_velocity = integrate(run_configuration, 0.2, 4.0)
+    exact_position, exact_velocity = get_exact_state(run_configuration, 4.0)
+
+    assert DynamicsIntegrator.get_order(run_configuration) == order
+    assert abs(coarse_velocity-exact_velocity) / abs(fine_velocity-exact_velocity) > 2**(order-1)
+    assert abs(coarse_position-exact_position) / abs(fine_position-exact_position) > 2**(order-1)
+
+def test_dormand_prince_last_stage_is_the_next_first_stage(make_run_configuration):
+    run_configuration = get_integration_configuration(make_run_configuration, 'rk45')
+    _, step_velocity, _, _, _, _, end_forces = DynamicsIntegrator.step(run_configuration, constant_thrust, MASS, numpy.float64(0.0), numpy.float64(3.0), numpy.float64(0.0), numpy.float64(0.1))
+
+    for end_force, force in zip(end_forces, DynamicsIntegrator.get_acceleration(run_configuration, constant_thrust, MASS, step_velocity, numpy.float64(0.1))):
+        assert end_force == pytest.approx(force, rel=1e-12)
+
+def test_step_size_adapts_within_its_limits(make_run_configuration):
+    run_configuration = get_integration_configuration(make_run_configuration, 'rk45')
+    timestep_sizes = DynamicsIntegrator.get_next_timestep_size(run_configuration, numpy.full(3, 0.1), numpy.array([0.0, 1.0, 1e6]))
+
+    numpy.testing.assert_allclose(timestep_sizes, [0.1 * DynamicsIntegrator.MAXIMUM_STEP_SCALE, 0.1 * DynamicsIntegrator.SAFETY_FACTOR, 0.1 * DynamicsIntegrator.MINIMUM_STEP_SCALE])
+    assert DynamicsIntegrator.get_next_timestep_size(get_integration_configuration(make_run_configuration, 'rk4'), numpy.float64(0.1), numpy.float64(1e6)) == 0.1
+
+def test_takeoff_crossing_is_located_within_the_step(make_run_configuration):
+    run_configuration = get_integration_configuration(make_run_configuration, 'rk4', drag_coefficient=0.0)
+    acceleration = THRUST / MASS
+    crossing_time = numpy.sqrt(2 * run_configuration.takeoff_displacement / acceleration)
+    start_time = numpy.floor(crossing_time)
+
+    fraction, velocity = DynamicsIntegrator.locate_takeoff(
+        run_configuration,
+        numpy.float64(1.0),
+        numpy.float64(0.5 * acceleration * start_time**2),
+        numpy.float64(acceleration * start_time),
+        numpy.float64(acceleration),
+        numpy.float64(0.5 * acceleration * (start_time+1)**2),
+        numpy.float64(acceleration * (start_time+1)),
+        numpy.float64(acceleration)
+    )
+
+    assert start_time + fraction == pytest.approx(crossing_time, rel=1e-12)
+    assert velocity == pytest.approx(acceleration * crossing_time, rel=1e-12)
+    assert not DynamicsIntegrator.locates_takeoff(get_integration_configuration(make_run_configuration, 'euler'))
+
+def test_unknown_method_is_rejected(make_run_configuration):
+    with pytest.raises(ValueError):
+        make_run_configuration(integration={'method': 'rk8', 'tolerance': None})
+
+@pytest.mark.parametrize('integration', [{'method': 4, 'tolerance': None}, {'method': 'rk4', 'tolerance': 'tight'}])
+def test_mistyped_integration_options_are_rejected(make_run_configuration, integration):
+    with pytest.raises(SyntaxError):
+        make_run_configuration(integration=integration)
@@ -0,0 +1,39 @@
+import pytest
+import numpy
+
+from components.VectorizedDynamicsSimulation import VectorizedDynamicsSimulation
+from components.utils.result_states import ResultState
+from conftest import simulate_mass, run_optimizer
+
+MASSES = numpy.array([0.4, 1.0, 1.3, 1.9])
+
+@pytest.mark.parametrize('mass', MASSES)
+def test_decided_outcome_matches_the_full_trajectory(run_configuration, thrust_table, mass):
+    dynamics_model = simulate_mass(run_configuration, mass, thrust_table)
+    decided_model = simulate_mass(run_configuration, mass, thrust_table, terminate_early=True)
+
+    assert decided_model.is_takeoff_successful() == dynamics_model.is_takeoff_successful()
+    if decided_model.decided_early:
+        assert decided_model.time.size < dynamics_model.time.size
+        assert not decided_model.takeoff_located
+
+def test_lockstep_decides_by_group_bounds(run_configuration, thrust_table):
+    outcomes = VectorizedDynamicsSimulation.get_takeoff_outcomes(run_configuration, MASSES, thrust_table)
+    decided_models = VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, MASSES, thrust_table, terminate_early=True)
+
+    assert [decided_model.is_takeoff_successful() for decided_model in decided_models] == outcomes.tolist()
+    assert any(decided_model.decided_early for decided_model in decided_models)
+
+def test_grid_search_finds_the_same_mtom(run_configuration, thrust_cache, thrust_table):
+    _, full_state, full_model = run_optimizer(run_configuration, thrust_cache, thrust_table, terminate_early=False)
+    _, decided_state, decided_model = run_optimizer(run_configuration, thrust_cache, thrust_table, terminate_early=True)
+
+    assert full_state == decided_state == ResultState.MTOM_FOUND
+    assert decided_model.mass == full_model.mass
+    assert not decided_model.decided_early
+
+def test_time_profiles_are_never_decided_early(make_run_configuration, thrust_cache):
+    run_configuration = make_run_configuration(voltage_profile={'variable': 'time', 'breakpoints': [0.0, 10.0], 'voltages': [8.4, 7.4]})
+    decided_model = simulate_mass(run_configuration, numpy.float64(0.4), thrust_cache, terminate_early=True)
+
+    assert not decided_model.decided_early
@@ -0,0 +1,46 @@
+import subprocess
+import json
+import sys
+import numpy
+
+from components.OptimizationCheckpoint import OptimizationCheckpoint
+from conftest import ROOT, get_configuration_data
+
+HEADLESS_ARGUMENTS = ['--headless', '-e', 'vectorized', '--transport', 'in-process', '-t', 'table', '-m', '8', '--no-checkpoint', '--no-history', '--no-table-store']
+
+def run_main(arguments: list[str], cwd) -> subprocess.CompletedProcess:
+    script = f'import runpy, sys; sys.path.insert(0, {str(ROOT)!r}); sys.argv = ["main.py"] + {arguments!r}; runpy.run_path({str(ROOT / "main.py")!r}, run_name="__main__"); print(sorted(module for module in ("matplotlib", "tqdm") if module in sys.modules), file=sys.stderr)'
+    return subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, cwd=cwd)
+
+def test_headless_run_prints_the_result_and_imports_no_plotting(tmp_path):
+    config_path = tmp_path / 'example.json'
+    config_path.write_text(json.dumps(get_configuration_data()))
+    trajectories_path = tmp_path / 'trajectories.npz'
+
+    completed_process = run_main(['-c', str(config_path), *HEADLESS_ARGUMENTS, '--trajectories', str(trajectories_path)], tmp_path)
+
+    assert completed_process.returncode == 0, completed_process.stderr
+    result_document = json.loads(completed_process.stdout)
+    assert result_document['identifier'] == 'example'
+    assert result_document['result'] == 'MTOM_FOUND'
+    assert 1.0 < result_document['mtom'] < 1.5
+    assert result_document['liftoff_distance'] >= 100.0
+    assert completed_process.stderr.rstrip().endswith('[]')
+
+    with numpy.load(trajectories_path) as columns:
+        dynamics_models = OptimizationCheckpoint.get_results(columns)
+    assert len(dynamics_models) == result_document['simulated_masses']
+    assert result_document['mtom'] in [round(float(dynamics_model.mass), 3) for dynamics_model in dynamics_models]
+
+def test_result_output_is_written_to_a_file(tmp_path):
+    config_path = tmp_path / 'example.json'
+    config_path.write_text(json.dumps(get_configuration_data(mass_range=[1.5, 2.0])))
+    result_path = tmp_path / 'result.json'
+
+    completed_process = run_main(['-c', str(config_path), *HEADLESS_ARGUMENTS, '--result-output', str(result_path)], tmp_path)
+
+    assert completed_process.returncode == 0, completed_process.stderr
+    assert completed_process.stdout == ''
+    result_document = json.loads(result_path.read_text())
+    assert result_document['result'] == 'MASS_LOWERBOUND_BEYOND_MTOM'
+    assert result_document['mtom'] is None
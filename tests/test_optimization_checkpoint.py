@@ -0,0 +1,75 @@
+import pytest
+import numpy
+
+from components.OptimizationCheckpoint import OptimizationCheckpoint
+from components.MaximumTakeOffMassOptimizer import MaximumTakeOffMassOptimizer
+from components.OptimizerSettings import OptimizerSettings
+from components.VectorizedDynamicsSimulation import VectorizedDynamicsSimulation
+from components.utils.simulation_engines import SimulationEngine
+from components.utils.search_methods import SearchMethod
+from conftest import run_optimizer
+
+class Interruption(Exception):
+    pass
+
+def get_settings(search_method: SearchMethod) -> OptimizerSettings:
+    return OptimizerSettings(simulation_engine=SimulationEngine.VECTORIZED, masses_per_epoch=8, search_method=search_method, refresh_rate=0, plot_results=False)
+
+def interrupt_after(optimizer: MaximumTakeOffMassOptimizer, n_epochs: int) -> None:
+    simulate = optimizer.simulate
+    def interrupted_simulate(*arguments):
+        if optimizer.n_epochs == n_epochs:
+            raise Interruption()
+        return simulate(*arguments)
+    optimizer.simulate = interrupted_simulate
+
+def test_saved_epochs_are_loaded_back(run_configuration, thrust_table, tmp_path):
+    checkpoint = OptimizationCheckpoint(tmp_path)
+    checkpoint.open(run_configuration, ['grid'])
+    dynamics_models = VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, numpy.array([0.4, 1.0, 1.9]), thrust_table)
+
+    checkpoint.save(1, {'minimum': 0.4, 'MASS_SPACE': numpy.array([0.5, 0.6])}, {dynamics_model.mass: dynamics_model for dynamics_model in dynamics_models[:2]})
+    checkpoint.save(2, {'minimum': 1.0, 'MASS_SPACE': numpy.array([1.1, 1.2])}, {dynamics_model.mass: dynamics_model for dynamics_model in dynamics_models})
+    with numpy.load(checkpoint.get_path(2)) as columns:
+        assert columns['mass'].tolist() == [1.9]
+
+    completed_epochs, state, results = checkpoint.load()
+    assert completed_epochs == 2
+    assert float(state['minimum']) == 1.0
+    numpy.testing.assert_array_equal(state['MASS_SPACE'], [1.1, 1.2])
+    assert sorted(results) == [0.4, 1.0, 1.9]
+    for dynamics_model in dynamics_models:
+        loaded_model = results[dynamics_model.mass]
+        numpy.testing.assert_array_equal(loaded_model.velocity, dynamics_model.velocity)
+        numpy.testing.assert_array_equal(loaded_model.thrust, dynamics_model.thrust)
+        assert loaded_model.is_takeoff_successful() == dynamics_model.is_takeoff_successful()
+
+def test_checkpoints_are_keyed_by_configuration_and_settings(make_run_configuration, tmp_path):
+    checkpoint = OptimizationCheckpoint(tmp_path)
+    run_configuration = make_run_configuration()
+    key = checkpoint.get_key(run_configuration, ['grid'])
+
+    assert key == checkpoint.get_key(make_run_configuration(), ['grid'])
+    assert key != checkpoint.get_key(run_configuration, ['root'])
+    assert key != checkpoint.get_key(make_run_configuration(timestep_size=0.05), ['grid'])
+
+@pytest.mark.parametrize('search_method', [SearchMethod.GRID, SearchMethod.ROOT])
+def test_interrupted_search_resumes_to_the_same_mtom(run_configuration, thrust_cache, thrust_table, tmp_path, search_method):
+    full_optimizer, _, optimal_dynamics_model = run_optimizer(run_configuration, thrust_cache, thrust_table, search_method=search_method)
+    checkpoint_directory = tmp_path / 'checkpoints'
+
+    interrupted_optimizer = MaximumTakeOffMassOptimizer(1, get_settings(search_method), thrust_cache, checkpoint=OptimizationCheckpoint(checkpoint_directory))
+    interrupt_after(interrupted_optimizer, 1)
+    with pytest.raises(Interruption):
+        interrupted_optimizer.run(run_configuration, thrust_table)
+    interrupted_optimizer.close()
+
+    resumed_optimizer = MaximumTakeOffMassOptimizer(1, get_settings(search_method), thrust_cache, checkpoint=OptimizationCheckpoint(checkpoint_directory))
+    try:
+        _, resumed_dynamics_model = resumed_optimizer.run(run_configuration, thrust_table, resume=True)
+    finally:
+        resumed_optimizer.close()
+
+    assert resumed_dynamics_model.mass == optimal_dynamics_model.mass
+    assert resumed_optimizer.n_epochs == full_optimizer.n_epochs - 1
+    assert not any(checkpoint_directory.iterdir())
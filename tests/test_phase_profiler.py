@@ -0,0 +1,73 @@
+import json
+import pytest
+
+from components.PhaseProfiler import PhaseProfiler
+from components.MaximumTakeOffMassOptimizer import MaximumTakeOffMassOptimizer
+from components.OptimizerSettings import OptimizerSettings
+from components.utils.optimizer_phases import OptimizerPhase
+from components.utils.process_statuses import ProcessStatus
+from components.utils.simulation_engines import SimulationEngine
+
+@pytest.fixture
+def profiler(monkeypatch) -> PhaseProfiler:
+    monkeypatch.setattr(PhaseProfiler, 'current', None)
+    profiler = PhaseProfiler('Optimizer')
+    profiler.activate()
+    return profiler
+
+def test_phases_are_ignored_without_a_profiler(monkeypatch):
+    monkeypatch.setattr(PhaseProfiler, 'current', None)
+
+    assert PhaseProfiler.enter(OptimizerPhase.SEARCHING_MASSES) is None
+    PhaseProfiler.leave(OptimizerPhase.SEARCHING_MASSES)
+
+def test_nested_phases_are_counted_once_per_entry(profiler):
+    PhaseProfiler.enter(OptimizerPhase.SEARCHING_MASSES)
+    for _ in range(3):
+        previous_phase = PhaseProfiler.enter(OptimizerPhase.WRITING_CHECKPOINT)
+        PhaseProfiler.leave(previous_phase)
+    profiler.set_epoch('1')
+    PhaseProfiler.enter(OptimizerPhase.PLOTTING_RESULTS)
+
+    assert profiler.phase == OptimizerPhase.PLOTTING_RESULTS
+    totals = profiler.get_totals_by_label()['Optimizer']
+    assert totals['SEARCHING_MASSES'][1] == 1
+    assert totals['WRITING_CHECKPOINT'][1] == 3
+    assert set(profiler.epoch_totals[PhaseProfiler.SETUP_EPOCH]) == {'SEARCHING_MASSES', 'WRITING_CHECKPOINT'}
+    assert set(profiler.epoch_totals['1']) == {'SEARCHING_MASSES', 'PLOTTING_RESULTS'}
+
+def test_worker_profiles_are_merged_by_label(profiler):
+    worker_profiler = PhaseProfiler('Worker 0')
+    worker_profiler.pid += 1
+    for _ in range(2):
+        worker_profiler.switch(ProcessStatus.EXECUTING_QPROP)
+        worker_profiler.add_event('m = 1.0 kg', 'simulation', 0, 1000)
+        profiler.merge(worker_profiler.drain())
+
+    merged_totals = profiler.get_totals_by_label()['Worker 0']
+    assert merged_totals['EXECUTING_QPROP'][1] == 2
+    assert worker_profiler.totals == dict()
+    assert profiler.process_labels[worker_profiler.pid] == 'Worker 0'
+    assert [event[0] for event in profiler.events] == ['m = 1.0 kg'] * 2
+
+def test_trace_holds_process_names_and_spans(profiler, tmp_path):
+    profiler.add_event('m = 1.0 kg', 'simulation', 5000, 9000, {'epoch': 1})
+    trace_path = tmp_path / 'profile_trace.json'
+    profiler.write_trace(trace_path)
+
+    trace_events = json.loads(trace_path.read_text())['traceEvents']
+    assert trace_events[0] == {'name': 'process_name', 'ph': 'M', 'pid': profiler.pid, 'tid': profiler.pid, 'args': {'name': 'Optimizer'}}
+    assert trace_events[1]['ph'] == 'X' and trace_events[1]['dur'] == 4.0 and trace_events[1]['args'] == {'epoch': 1}
+
+def test_optimizer_profiles_itself_and_its_workers(profiler, run_configuration, thrust_cache, thrust_table):
+    optimizer = MaximumTakeOffMassOptimizer(2, OptimizerSettings(simulation_engine=SimulationEngine.PROCESS, refresh_rate=0, plot_results=False), thrust_cache, profiler=profiler)
+    try:
+        optimizer.run(run_configuration, thrust_table)
+    finally:
+        optimizer.close()
+
+    totals_by_label = profiler.get_totals_by_label()
+    assert {'FORKING_WORKERS', 'SEARCHING_MASSES', 'AWAITING_RESULTS'} <= set(totals_by_label['Optimizer'])
+    assert {'Worker 0', 'Worker 1'} <= set(totals_by_label)
+    assert 'EXECUTING_QPROP' in totals_by_label['Worker 0']
+    assert str(optimizer.n_epochs) in profiler.epoch_totals
@@ -0,0 +1,49 @@
+import subprocess
+import pytest
+import numpy
+
+from components.QpropOutputParser import QpropOutputParser
+from components.utils.qprop_columns import QpropColumn
+from conftest import get_fake_thrust
+
+def get_output(arguments: list[str]) -> str:
+    return subprocess.run(arguments, capture_output=True, text=True).stdout
+
+def test_single_point_ignores_the_radial_distribution(run_configuration):
+    output = get_output(run_configuration.get_run_arguments(numpy.float64(5.0)))
+    data = QpropOutputParser.parse(output, (QpropColumn.THRUST, QpropColumn.VOLTAGE, QpropColumn.VELOCITY))
+
+    assert data.shape == (1, 3)
+    numpy.testing.assert_allclose(data[0], [get_fake_thrust(5.0), 8.4, 5.0], atol=1e-4)
+
+def test_sweep_reads_every_row(run_configuration):
+    output = get_output(run_configuration.get_sweep_run_arguments(numpy.float64(0.0), numpy.float64(10.0), 11))
+    data = QpropOutputParser.parse(output, (QpropColumn.VELOCITY, QpropColumn.THRUST))
+
+    numpy.testing.assert_allclose(data[:, 0], numpy.linspace(0.0, 10.0, 11), atol=1e-4)
+    numpy.testing.assert_allclose(data[:, 1], [get_fake_thrust(velocity) for velocity in data[:, 0]], atol=1e-4)
+    assert QpropOutputParser.parse(output, (QpropColumn.THRUST,), 3).shape == (3, 1)
+
+def test_single_row_is_read_from_the_line_below_the_header(run_configuration):
+    output = get_output(run_configuration.get_run_arguments(numpy.float64(5.0)))
+    columns = (QpropColumn.THRUST, QpropColumn.CURRENT)
+
+    numpy.testing.assert_array_equal(QpropOutputParser.parse(output, columns, 1), QpropOutputParser.parse(output, columns))
+    assert (QpropOutputParser.get_header(output)[0], columns) in QpropOutputParser.column_indices
+
+def test_header_is_found_without_a_comment_prefix():
+    output = 'QPROP\n\n  V(m/s)  rpm  T(N)\n  1.0  100.0  2.5\n  2.0  200.0  2.0\n'
+
+    numpy.testing.assert_array_equal(QpropOutputParser.parse(output, (QpropColumn.THRUST, QpropColumn.RPM)), [[2.5, 100.0], [2.0, 200.0]])
+
+@pytest.mark.parametrize('output, columns, n_rows', [
+    ('QPROP failed to converge\n', (QpropColumn.THRUST,), None),
+    (' # V(m/s)  T(N)\n  1.0  2.5\n', (QpropColumn.CURRENT,), None),
+    (' # V(m/s)  T(N)\n #\n', (QpropColumn.THRUST,), None),
+    (' # V(m/s)  T(N)\n  1.0  2.5\n', (QpropColumn.THRUST,), 2),
+    (' # V(m/s)  T(N)\n #\n', (QpropColumn.THRUST,), 1),
+    (' # V(m/s)  T(N)', (QpropColumn.THRUST,), 1)
+])
+def test_malformed_output_is_rejected(output, columns, n_rows):
+    with pytest.raises(ValueError):
+        QpropOutputParser.parse(output, columns, n_rows)
@@ -0,0 +1,45 @@
+import pytest
+import numpy
+
+from components.ThrustCache import ThrustCache
+from components.QpropPrefetcher import QpropPrefetcher
+from components.QpropThrustSolver import QpropThrustSolver
+from conftest import get_fake_thrust, simulate_mass
+
+MASS = 0.4
+
+def test_prefetched_trajectory_matches_the_plain_cache(run_configuration, thrust_cache_manager, thrust_cache):
+    prefetching_cache = ThrustCache(thrust_cache_manager, numpy.float64(0.001), prefetch_depth=4)
+    dynamics_model = simulate_mass(run_configuration, MASS, thrust_cache)
+    prefetched_model = simulate_mass(run_configuration, MASS, prefetching_cache)
+
+    numpy.testing.assert_array_equal(prefetched_model.time, dynamics_model.time)
+    numpy.testing.assert_array_equal(prefetched_model.velocity, dynamics_model.velocity)
+    numpy.testing.assert_array_equal(prefetched_model.thrust, dynamics_model.thrust)
+
+def test_prefetch_counts_cover_every_cache_miss(run_configuration, thrust_cache_manager):
+    prefetching_cache = ThrustCache(thrust_cache_manager, numpy.float64(0.001), prefetch_depth=4)
+    simulate_mass(run_configuration, MASS, prefetching_cache)
+    _, misses = prefetching_cache.get_counts()
+    prefetch_hits, prefetch_misses, prefetch_runs = prefetching_cache.get_prefetch_counts()
+
+    assert prefetch_hits > 0
+    assert prefetch_hits + prefetch_misses == misses
+    assert prefetch_runs >= prefetch_hits
+
+def test_prefetched_output_is_taken_once(run_configuration):
+    prefetcher = QpropPrefetcher()
+    prefetcher.prefetch(('velocity', 5.0), run_configuration.get_run_arguments(numpy.float64(5.0)))
+    prefetcher.prefetch(('velocity', 5.0), run_configuration.get_run_arguments(numpy.float64(5.0)))
+
+    assert prefetcher.pop_n_runs() == 1
+    assert QpropThrustSolver.parse_thrust(prefetcher.get_output(('velocity', 5.0))) == pytest.approx(get_fake_thrust(5.0), abs=1e-4)
+    assert prefetcher.get_output(('velocity', 5.0)) is None
+    assert prefetcher.get_n_in_flight() == 0
+
+def test_prefetching_needs_a_velocity_quantum(thrust_cache_manager):
+    assert ThrustCache(thrust_cache_manager, numpy.float64(0.0), prefetch_depth=4).prefetch_depth == 0
+
+def test_prefetch_depth_cannot_be_negative(thrust_cache_manager):
+    with pytest.raises(ValueError):
+        ThrustCache(thrust_cache_manager, numpy.float64(0.001), prefetch_depth=-1)
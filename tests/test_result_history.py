@@ -0,0 +1,77 @@
+import pytest
+import numpy
+
+from components.ResultHistory import ResultHistory
+from components.utils.result_states import ResultState
+from conftest import run_optimizer
+
+DRAG_COEFFICIENTS = (0.05, 0.1, 0.2, 0.4)
+
+def get_drag_configuration(make_run_configuration, drag_coefficient: float, **overrides):
+    run_configuration = make_run_configuration()
+    return make_run_configuration(aerodynamic_forces={**run_configuration.json_data['aerodynamic_forces'], 'drag_coefficient': drag_coefficient}, **overrides)
+
+def get_power_law_mtom(drag_coefficient: float) -> float:
+    return 1.2 * (drag_coefficient / 0.1)**-0.25
+
+@pytest.fixture
+def result_history(tmp_path) -> ResultHistory:
+    return ResultHistory(tmp_path / 'history' / 'results.sqlite')
+
+def record(result_history: ResultHistory, run_configuration, mtom: float) -> None:
+    result_history.record(run_configuration, run_configuration.timestep_size, numpy.float64(mtom), numpy.float64(15.0), 10, 1.0)
+
+def test_empty_history_predicts_nothing(run_configuration, result_history):
+    assert result_history.predict(run_configuration) is None
+
+def test_exact_matches_predict_their_median_and_spread(run_configuration, result_history):
+    for mtom in (1.20, 1.21, 1.25):
+        record(result_history, run_configuration, mtom)
+
+    predicted_mtom, half_width, n_neighbours = result_history.predict(run_configuration)
+
+    assert predicted_mtom == pytest.approx(1.21)
+    assert half_width == pytest.approx(0.05)
+    assert n_neighbours == 3
+
+def test_other_setpoints_and_integration_methods_are_not_neighbours(make_run_configuration, run_configuration, result_history):
+    record(result_history, make_run_configuration(integration={'method': 'rk4', 'tolerance': None}), 1.2)
+    record(result_history, make_run_configuration(setpoint_parameters={**run_configuration.json_data['setpoint_parameters'], 'voltage': 7.4}), 1.0)
+
+    assert result_history.predict(run_configuration) is None
+
+def test_power_law_is_fitted_across_neighbours(make_run_configuration, result_history):
+    for drag_coefficient in DRAG_COEFFICIENTS:
+        record(result_history, get_drag_configuration(make_run_configuration, drag_coefficient), get_power_law_mtom(drag_coefficient))
+
+    predicted_mtom, half_width, n_neighbours = result_history.predict(get_drag_configuration(make_run_configuration, 0.15))
+
+    assert predicted_mtom == pytest.approx(get_power_law_mtom(0.15), rel=1e-9)
+    assert half_width == pytest.approx(0.0, abs=1e-9)
+    assert n_neighbours == len(DRAG_COEFFICIENTS)
+
+def test_a_single_neighbour_is_weighted_by_distance(make_run_configuration, result_history):
+    record(result_history, get_drag_configuration(make_run_configuration, 0.2), 1.1)
+
+    predicted_mtom, half_width, n_neighbours = result_history.predict(get_drag_configuration(make_run_configuration, 0.1))
+
+    assert predicted_mtom == pytest.approx(1.1)
+    assert half_width == pytest.approx(1.1 * numpy.log(2))
+    assert n_neighbours == 1
+
+def test_predicted_range_takes_fewer_epochs(run_configuration, thrust_cache, thrust_table, result_history):
+    optimizer, state, dynamics_model = run_optimizer(run_configuration, thrust_cache, thrust_table, result_history=result_history)
+    predicted_optimizer, predicted_state, predicted_model = run_optimizer(run_configuration, thrust_cache, thrust_table, result_history=result_history)
+
+    assert state == predicted_state == ResultState.MTOM_FOUND
+    assert predicted_model.mass == dynamics_model.mass
+    assert predicted_optimizer.n_epochs < optimizer.n_epochs
+    assert result_history.predict(run_configuration)[2] == 2
+
+def test_wrong_prediction_is_widened_to_the_mtom(run_configuration, thrust_cache, thrust_table, result_history):
+    _, state, dynamics_model = run_optimizer(run_configuration, thrust_cache, thrust_table)
+    record(result_history, run_configuration, 0.3)
+    _, predicted_state, predicted_model = run_optimizer(run_configuration, thrust_cache, thrust_table, result_history=result_history)
+
+    assert state == predicted_state == ResultState.MTOM_FOUND
+    assert predicted_model.mass == dynamics_model.mass
@@ -0,0 +1,46 @@
+import numpy
+
+from components.ResultPlotter import ResultPlotter
+from conftest import simulate_mass
+
+def test_short_series_are_not_downsampled():
+    x = numpy.linspace(0.0, 1.0, 10)
+
+    numpy.testing.assert_array_equal(ResultPlotter.get_downsampled_indices(x, x, 10), numpy.arange(10))
+    numpy.testing.assert_array_equal(ResultPlotter.get_downsampled_indices(x, x, 2), numpy.arange(10))
+
+def test_one_point_is_kept_per_bucket_with_both_ends():
+    x = numpy.linspace(0.0, 10.0, 10001)
+    indices = ResultPlotter.get_downsampled_indices(x, numpy.sin(x), 100)
+    edges = numpy.linspace(1, x.size-1, 99).astype(numpy.int64)
+
+    assert indices.size == 100
+    assert indices[0] == 0 and indices[-1] == x.size-1
+    assert numpy.all((indices[1:-1] >= edges[:-1]) & (indices[1:-1] < edges[1:]))
+
+def test_spikes_survive_downsampling():
+    x = numpy.linspace(0.0, 1.0, 5000)
+    y = numpy.zeros_like(x)
+    y[[1234, 3777]] = [5.0, -3.0]
+    indices = ResultPlotter.get_downsampled_indices(x, y, 50)
+
+    assert 1234 in indices and 3777 in indices
+
+def test_downsampled_curve_stays_close_to_the_series():
+    x = numpy.linspace(0.0, 10.0, 20001)
+    y = numpy.tanh(x - 3.0)
+    indices = ResultPlotter.get_downsampled_indices(x, y, 200)
+
+    assert numpy.max(numpy.abs(numpy.interp(x, x[indices], y[indices]) - y)) < 1e-2
+
+def test_plot_data_is_limited_to_the_plot_points(run_configuration, thrust_table, monkeypatch):
+    monkeypatch.setattr(ResultPlotter, 'PLOT_POINTS', 20)
+    dynamics_models = {mass: simulate_mass(run_configuration, mass, thrust_table) for mass in (1.3, 0.4, 1.0)}
+    dynamics_models[0.6] = simulate_mass(run_configuration, 0.6, thrust_table, terminate_early=True)
+    plot_data = ResultPlotter.get_plot_data(dynamics_models[1.0], dynamics_models)
+
+    for series in ResultPlotter.SERIES:
+        assert plot_data[series].size == plot_data[f'{series}_time'].size == 20
+        assert numpy.all(numpy.isin(plot_data[f'{series}_time'], dynamics_models[1.0].time))
+    assert dynamics_models[0.6].decided_early
+    numpy.testing.assert_array_equal(plot_data['masses'], [0.4, 1.0, 1.3])
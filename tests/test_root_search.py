@@ -0,0 +1,34 @@
+import pytest
+
+from components.utils.search_methods import SearchMethod
+from components.utils.result_states import ResultState
+from conftest import run_optimizer
+
+def test_root_search_finds_the_grid_mtom(make_run_configuration, thrust_cache, thrust_table):
+    run_configuration = make_run_configuration(integration={'method': 'rk4', 'tolerance': None})
+    grid_optimizer, grid_state, grid_model = run_optimizer(run_configuration, thrust_cache, thrust_table)
+    root_optimizer, root_state, root_model = run_optimizer(run_configuration, thrust_cache, thrust_table, search_method=SearchMethod.ROOT)
+
+    assert grid_state == root_state == ResultState.MTOM_FOUND
+    assert round(float(root_model.mass), 3) == round(float(grid_model.mass), 3)
+    assert root_optimizer.n_epochs < grid_optimizer.n_epochs
+
+def test_root_search_brackets_a_positive_and_a_negative_margin(run_configuration, thrust_cache, thrust_table):
+    optimizer, _, optimal_dynamics_model = run_optimizer(run_configuration, thrust_cache, thrust_table, search_method=SearchMethod.ROOT)
+    heavier_model = optimizer.results[min(mass for mass in optimizer.results if mass > optimal_dynamics_model.mass)]
+
+    assert optimal_dynamics_model.get_takeoff_margin(run_configuration.takeoff_displacement) > 0
+    assert heavier_model.get_takeoff_margin(run_configuration.takeoff_displacement) <= 0
+    assert heavier_model.mass - optimal_dynamics_model.mass == pytest.approx(0.001)
+
+@pytest.mark.parametrize('mass_range, result_state', [([1.5, 2.0], ResultState.MASS_LOWERBOUND_BEYOND_MTOM), ([0.1, 0.5], ResultState.MASS_UPPERBOUND_BELOW_MTOM)])
+def test_root_search_reports_ranges_missing_the_mtom(make_run_configuration, thrust_cache, thrust_table, mass_range, result_state):
+    _, root_state, _ = run_optimizer(make_run_configuration(mass_range=mass_range), thrust_cache, thrust_table, search_method=SearchMethod.ROOT)
+
+    assert root_state == result_state
+
+def test_root_search_never_terminates_early(run_configuration, thrust_cache, thrust_table):
+    optimizer, _, _ = run_optimizer(run_configuration, thrust_cache, thrust_table, search_method=SearchMethod.ROOT, terminate_early=True)
+
+    assert not optimizer.terminate_early
+    assert not any(dynamics_model.decided_early for dynamics_model in optimizer.results.values())
@@ -0,0 +1,46 @@
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import run_benchmarks
+
+def get_run(wall_time: float, qprop_calls: int = 10, epochs: int = 5, mtom: float = 1.215) -> dict:
+    return {'result': 'MTOM_FOUND', 'mtom': mtom, 'wall_time': wall_time, 'cpu_time': 2*wall_time, 'cpu_utilization': 2.0, 'qprop_calls': qprop_calls, 'epochs': epochs}
+
+def test_every_thrust_source_is_benchmarked():
+    thrust_sources = {thrust_source.value for _, thrust_source, _, _ in run_benchmarks.SCENARIOS.values()}
+
+    assert thrust_sources == {'cache', 'table', 'surrogate'}
+
+def test_summary_takes_median_times_and_maximum_counts():
+    summary = run_benchmarks.get_summary([get_run(1.0, 10, 5), get_run(3.0, 12, 5), get_run(2.0, 11, 6)])
+
+    assert summary['wall_time'] == 2.0
+    assert summary['qprop_calls'] == 12
+    assert summary['epochs'] == 6
+
+def test_regressions_are_reported_against_the_baseline():
+    baseline_summaries = {'a': get_run(1.0), 'b': get_run(1.0), 'c': get_run(1.0)}
+    summaries = {'a': get_run(1.2), 'b': get_run(1.3, qprop_calls=11, mtom=1.214), 'c': get_run(0.5, epochs=4), 'd': get_run(9.0)}
+
+    regressions = run_benchmarks.get_regressions(summaries, baseline_summaries, 0.25)
+
+    assert len(regressions) == 3
+    assert all(regression.startswith('b: ') for regression in regressions)
+
+def test_scenario_counts_qprop_calls(tmp_path, monkeypatch):
+    call_log_path = tmp_path / 'qprop_calls'
+    monkeypatch.setenv('FAKE_QPROP_CALL_LOG', str(call_log_path))
+
+    run = run_benchmarks.run_scenario('surrogate-vectorized-grid-dt=0.1', 1, 8, call_log_path)
+
+    assert run['result'] == 'MTOM_FOUND'
+    assert run['qprop_calls'] == run_benchmarks.get_call_count(call_log_path) > 0
+    assert run['epochs'] > 0 and run['wall_time'] > 0
+
+def test_every_engine_is_benchmarked_with_the_cache():
+    simulation_engines = {simulation_engine.value for _, thrust_source, simulation_engine, _ in run_benchmarks.SCENARIOS.values() if thrust_source.value == 'cache'}
+
+    assert simulation_engines == {'process', 'vectorized'}
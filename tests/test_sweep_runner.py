@@ -0,0 +1,47 @@
+import json
+import csv
+import pytest
+
+from components.SweepRunner import SweepRunner
+from components.OptimizerSettings import OptimizerSettings
+from conftest import ROOT, get_configuration_data
+
+@pytest.fixture
+def write_sweep(tmp_path):
+    def write(axes: dict, **overrides) -> str:
+        template_path = tmp_path / 'template.json'
+        template_path.write_text(json.dumps(get_configuration_data(**overrides)))
+        sweep_path = tmp_path / 'sweep.json'
+        sweep_path.write_text(json.dumps({'template': str(template_path), 'axes': axes}))
+        return sweep_path
+    return write
+
+def test_axes_expand_to_every_combination(write_sweep):
+    sweep_runner = SweepRunner(write_sweep({'takeoff_displacement': [50, 100], 'aerodynamic_forces.drag_coefficient': [0.1, 0.2, 0.3]}))
+    run_configurations = sweep_runner.get_run_configurations()
+
+    assert len(run_configurations) == 6
+    assert run_configurations[0][0].identifier == 'template-takeoff_displacement=50-drag_coefficient=0.1'
+    assert [(run_configuration.takeoff_displacement, run_configuration.aerodynamic_forces_drag_coefficient) for run_configuration, _ in run_configurations][-1] == (100, 0.3)
+    assert len({SweepRunner.get_thrust_key(run_configuration) for run_configuration, _ in run_configurations}) == 1
+
+def test_file_axes_expand_glob_patterns(write_sweep):
+    sweep_runner = SweepRunner(write_sweep({'propeller_file': [str(ROOT / 'propeller_files' / 'apc1*')]}))
+
+    assert sweep_runner.axes['propeller_file'] == sorted(str(path) for path in (ROOT / 'propeller_files').glob('apc1*') if path.is_file())
+    assert all(run_configuration.identifier.startswith('template-apc1') for run_configuration, _ in sweep_runner.get_run_configurations())
+
+@pytest.mark.parametrize('axes, error', [({'aerodynamic_forces.wing_span': [1.0]}, KeyError), ({'takeoff_displacement': []}, SyntaxError), ({'propeller_file': [str(ROOT / 'missing*')]}, ValueError)])
+def test_invalid_axes_are_rejected(write_sweep, axes, error):
+    with pytest.raises(error):
+        SweepRunner(write_sweep(axes))
+
+def test_sweep_writes_one_row_per_run(write_sweep, tmp_path):
+    output_path = tmp_path / 'sweep_results.csv'
+    SweepRunner(write_sweep({'takeoff_displacement': [20, 40], 'arithmetic_precision': [2]})).run(2, output_path, OptimizerSettings(masses_per_epoch=8))
+
+    with open(output_path, newline='') as output_file:
+        rows = list(csv.DictReader(output_file))
+    assert [row['takeoff_displacement'] for row in rows] == ['20', '40']
+    assert all(row['result'] == 'MTOM_FOUND' for row in rows)
+    assert float(rows[0]['mtom']) < float(rows[1]['mtom'])
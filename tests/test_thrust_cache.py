@@ -0,0 +1,56 @@
+import pytest
+import numpy
+
+from components.ThrustCache import ThrustCache
+from conftest import get_fake_thrust
+
+def test_get_thrust_runs_qprop_once_per_velocity(thrust_cache, run_configuration, qprop_calls):
+    thrust = thrust_cache.get_thrust(run_configuration, numpy.float64(5.0))
+    assert thrust == pytest.approx(get_fake_thrust(5.0), abs=1e-4)
+
+    assert thrust_cache.get_thrust(run_configuration, numpy.float64(5.0)) == thrust
+    assert qprop_calls() == 1
+    assert thrust_cache.get_counts() == (1, 1)
+
+def test_velocities_within_a_quantum_share_a_run(thrust_cache, run_configuration, qprop_calls):
+    thrust_cache.get_thrust(run_configuration, numpy.float64(5.0001))
+    thrust_cache.get_thrust(run_configuration, numpy.float64(4.9999))
+    thrust_cache.get_thrust(run_configuration, numpy.float64(5.002))
+
+    assert qprop_calls() == 2
+
+def test_zero_quantum_keys_exact_velocities(thrust_cache_manager, run_configuration, qprop_calls):
+    thrust_cache = ThrustCache(thrust_cache_manager, numpy.float64(0.0))
+    thrust_cache.get_thrust(run_configuration, numpy.float64(5.0001))
+    thrust_cache.get_thrust(run_configuration, numpy.float64(5.0002))
+
+    assert qprop_calls() == 2
+
+def test_cache_is_keyed_by_setpoint(thrust_cache, make_run_configuration, qprop_calls):
+    low_voltage = make_run_configuration(setpoint_parameters={**make_run_configuration().json_data['setpoint_parameters'], 'voltage': 7.4})
+    thrusts = thrust_cache.get_thrusts(low_voltage, numpy.array([0.0, 5.0]))
+
+    numpy.testing.assert_allclose(thrusts, [get_fake_thrust(0.0, 7.4), get_fake_thrust(5.0, 7.4)], atol=1e-4)
+    assert qprop_calls() == 2
+
+def test_negative_quantum_is_rejected(thrust_cache_manager):
+    with pytest.raises(ValueError):
+        ThrustCache(thrust_cache_manager, numpy.float64(-0.001))
+
+def test_batched_lookups_run_each_quantum_once(thrust_cache, run_configuration, qprop_calls):
+    velocities = numpy.array([5.0001, 4.9999, 7.0, 5.0, 7.0002])
+    thrusts = thrust_cache.get_thrusts(run_configuration, velocities)
+
+    assert qprop_calls() == 2
+    assert thrust_cache.get_counts() == (0, 2)
+    numpy.testing.assert_allclose(thrusts, [get_fake_thrust(5.0)] * 2 + [get_fake_thrust(7.0), get_fake_thrust(5.0), get_fake_thrust(7.0)], atol=1e-4)
+    assert thrust_cache.get_thrust(run_configuration, numpy.float64(7.0)) == thrusts[2]
+    assert qprop_calls() == 2
+
+def test_batched_lookups_share_single_lookups(thrust_cache, run_configuration, qprop_calls):
+    thrust = thrust_cache.get_thrust(run_configuration, numpy.float64(3.0), numpy.float64(7.4))
+    thrusts = thrust_cache.get_thrusts(run_configuration, numpy.array([3.0, 3.0, 3.0]), numpy.array([7.4, 7.9, 7.4]))
+
+    assert thrusts[0] == thrusts[2] == thrust
+    assert thrusts[1] == pytest.approx(get_fake_thrust(3.0, 7.9), abs=1e-4)
+    assert qprop_calls() == 2
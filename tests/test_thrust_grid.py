@@ -0,0 +1,75 @@
+import pytest
+import numpy
+
+from components.ThrustGrid import ThrustGrid
+from conftest import get_fake_thrust
+
+TIME_PROFILE = {'variable': 'time', 'breakpoints': [0.0, 10.0], 'voltages': [8.4, 7.4]}
+CURRENT_PROFILE = {'variable': 'current', 'breakpoints': [0.0, 20.0], 'voltages': [8.4, 7.4]}
+
+@pytest.fixture
+def time_configuration(make_run_configuration):
+    return make_run_configuration(voltage_profile=TIME_PROFILE)
+
+@pytest.fixture
+def current_configuration(make_run_configuration):
+    return make_run_configuration(voltage_profile=CURRENT_PROFILE)
+
+@pytest.fixture
+def thrust_grid(time_configuration, thrust_cache) -> ThrustGrid:
+    return ThrustGrid.build(time_configuration, thrust_cache, 4, 100, 5, None)
+
+def test_grid_spans_the_profile_voltages(thrust_grid):
+    numpy.testing.assert_allclose(thrust_grid.voltages, numpy.linspace(7.4, 8.4, 5))
+    assert thrust_grid.thrusts.shape == thrust_grid.currents.shape == (5, thrust_grid.velocities.size)
+    numpy.testing.assert_allclose(thrust_grid.thrusts[-1], [get_fake_thrust(velocity, 8.4) for velocity in thrust_grid.velocities], atol=1e-4)
+
+def test_grid_nodes_are_reproduced(thrust_grid):
+    velocities, voltages = numpy.meshgrid(thrust_grid.velocities, thrust_grid.voltages)
+
+    numpy.testing.assert_allclose(thrust_grid.interpolate(thrust_grid.thrusts, velocities.ravel(), voltages.ravel()), thrust_grid.thrusts.ravel(), atol=1e-12)
+
+def test_thrust_is_bilinearly_interpolated_along_the_profile(time_configuration, thrust_grid, qprop_calls):
+    durations = numpy.linspace(0.0, 10.0, 41)
+    velocities = numpy.linspace(0.0, 0.9 * thrust_grid.velocities[-1], 41)
+    thrusts = thrust_grid.get_thrusts(time_configuration, velocities, durations)
+    voltages = time_configuration.get_profile_voltage(durations)
+
+    assert qprop_calls() == 0
+    numpy.testing.assert_allclose(thrusts, get_fake_thrust(velocities, voltages), atol=1e-2)
+    numpy.testing.assert_allclose([thrust_grid.get_thrust(time_configuration, velocity, duration) for velocity, duration in zip(velocities, durations)], thrusts, rtol=1e-12)
+
+def test_points_beyond_the_grid_are_flagged(thrust_grid):
+    velocities = numpy.array([1.0, thrust_grid.velocities[-1] + 1.0, 1.0, 1.0])
+    voltages = numpy.array([8.0, 8.0, 7.0, 8.5])
+
+    numpy.testing.assert_array_equal(thrust_grid.is_out_of_grid(velocities, voltages), [False, True, True, True])
+
+def test_velocities_beyond_the_grid_fall_back_at_the_profile_voltage(time_configuration, thrust_grid, qprop_calls):
+    beyond_velocity = thrust_grid.velocities[-1] + 1.0
+    voltage = float(time_configuration.get_profile_voltage(numpy.float64(5.0)))
+    thrusts = thrust_grid.get_thrusts(time_configuration, numpy.array([1.0, beyond_velocity]), numpy.array([5.0, 5.0]))
+
+    assert thrusts[1] == pytest.approx(get_fake_thrust(beyond_velocity, voltage), abs=1e-3)
+    assert thrust_grid.get_thrust(time_configuration, beyond_velocity, numpy.float64(5.0)) == thrusts[1]
+    assert qprop_calls() == 1
+
+def test_current_profile_solves_the_sag_voltage(current_configuration, thrust_cache, qprop_calls):
+    thrust_grid = ThrustGrid.build(current_configuration, thrust_cache, 4, 100, 5, None)
+    sag_voltages, sag_thrusts = thrust_grid.get_sag_operating_points(current_configuration)
+    beyond_velocity = thrust_grid.velocities[-1] + 1.0
+    n_calls = qprop_calls()
+
+    numpy.testing.assert_allclose(sag_voltages, current_configuration.get_profile_voltage(thrust_grid.interpolate(thrust_grid.currents, thrust_grid.velocities, sag_voltages)), atol=1e-9)
+    numpy.testing.assert_allclose(thrust_grid.get_thrusts(current_configuration, thrust_grid.velocities, numpy.zeros_like(thrust_grid.velocities)), sag_thrusts)
+    assert thrust_grid.get_thrust(current_configuration, beyond_velocity) == pytest.approx(get_fake_thrust(beyond_velocity, sag_voltages[-1]), abs=1e-3)
+    assert qprop_calls() == n_calls + 1
+
+def test_grid_requires_a_voltage_profile(run_configuration, thrust_cache):
+    with pytest.raises(ValueError):
+        ThrustGrid.build(run_configuration, thrust_cache, 4, 100, 5, None)
+
+@pytest.mark.parametrize('voltages, thrusts', [([7.4, 8.4], numpy.ones((2, 2))), ([8.4], numpy.ones((1, 3))), ([8.4, 7.4], numpy.ones((2, 3)))])
+def test_mismatched_grids_are_rejected(thrust_cache, voltages, thrusts):
+    with pytest.raises(ValueError):
+        ThrustGrid(numpy.array([0.0, 1.0, 2.0]), numpy.array(voltages), thrusts, thrusts, thrust_cache)
@@ -0,0 +1,46 @@
+import pytest
+import numpy
+
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustTable import ThrustTable
+from conftest import get_fake_thrust, run_optimizer
+
+def test_spline_passes_through_its_samples_monotonically():
+    velocities = numpy.array([0.0, 1.0, 3.0, 4.0, 7.0])
+    thrusts = numpy.array([5.0, 4.8, 4.8, 3.0, 0.5])
+    slopes = ThrustSurrogate.get_slopes(velocities, thrusts)
+    query_velocities = numpy.linspace(0.0, 7.0, 701)
+    interpolated_thrusts = ThrustSurrogate.interpolate(velocities, thrusts, slopes, query_velocities)
+
+    numpy.testing.assert_allclose(ThrustSurrogate.interpolate(velocities, thrusts, slopes, velocities), thrusts)
+    assert numpy.all(numpy.diff(interpolated_thrusts) <= 1e-12)
+    numpy.testing.assert_allclose(interpolated_thrusts[(query_velocities >= 1.0) & (query_velocities <= 3.0)], 4.8)
+
+def test_surrogate_is_refined_within_its_tolerance(run_configuration, thrust_cache, qprop_calls):
+    thrust_surrogate = ThrustSurrogate.build(run_configuration, thrust_cache)
+    velocities = numpy.linspace(0.0, thrust_surrogate.velocities[-1], 500)
+    tolerance = ThrustSurrogate.get_tolerance(run_configuration, thrust_surrogate.thrusts)
+
+    assert qprop_calls() == thrust_surrogate.velocities.size - ThrustSurrogate.INITIAL_POINTS + 1
+    assert qprop_calls() <= ThrustSurrogate.MAXIMUM_SAMPLES
+    assert thrust_surrogate.velocities[-1] == pytest.approx(ThrustTable.get_velocity_bound(run_configuration), abs=1e-4)
+    numpy.testing.assert_allclose(thrust_surrogate.get_thrusts(run_configuration, velocities), [get_fake_thrust(velocity) for velocity in velocities], atol=tolerance + 1e-4)
+
+def test_velocities_beyond_the_surrogate_fall_back_to_the_cache(run_configuration, thrust_cache, qprop_calls):
+    thrust_surrogate = ThrustSurrogate.build(run_configuration, thrust_cache)
+    beyond_velocity = thrust_surrogate.velocities[-1] + 1.0
+    n_calls = qprop_calls()
+
+    assert thrust_surrogate.get_thrust(run_configuration, beyond_velocity) == pytest.approx(get_fake_thrust(beyond_velocity), abs=1e-3)
+    assert thrust_surrogate.get_thrusts(run_configuration, numpy.array([1.0, beyond_velocity]))[1] == pytest.approx(get_fake_thrust(beyond_velocity), abs=1e-3)
+    assert qprop_calls() == n_calls + 1
+
+def test_surrogate_and_table_find_the_same_mtom(run_configuration, thrust_cache, thrust_table):
+    _, _, table_model = run_optimizer(run_configuration, thrust_cache, thrust_table)
+    _, _, surrogate_model = run_optimizer(run_configuration, thrust_cache, ThrustSurrogate.build(run_configuration, thrust_cache))
+
+    assert surrogate_model.mass == table_model.mass
+
+def test_surrogate_requires_two_distinct_velocities(thrust_cache):
+    with pytest.raises(ValueError):
+        ThrustSurrogate(numpy.array([1.0, 1.0]), numpy.array([2.0, 2.0]), thrust_cache)
@@ -0,0 +1,68 @@
+import subprocess
+import pytest
+import numpy
+
+from components.ThrustTable import ThrustTable
+from components.QpropThrustSolver import QpropThrustSolver
+from components.MaximumTakeOffMassOptimizer import MaximumTakeOffMassOptimizer
+from components.OptimizerSettings import OptimizerSettings
+from components.utils.qprop_columns import QpropColumn
+from components.utils.thrust_sources import ThrustSource
+from components.utils.simulation_engines import SimulationEngine
+from conftest import get_fake_thrust
+
+def test_sweep_returns_every_requested_velocity(run_configuration, qprop_calls):
+    velocities, thrusts = QpropThrustSolver.get_sweep_thrusts(run_configuration, numpy.float64(0.0), numpy.float64(20.0), 41)
+
+    assert qprop_calls() == 1
+    numpy.testing.assert_allclose(velocities, numpy.linspace(0.0, 20.0, 41), atol=1e-4)
+    numpy.testing.assert_allclose(thrusts, [get_fake_thrust(velocity) for velocity in velocities], atol=1e-4)
+
+def test_truncated_sweep_is_rejected(run_configuration):
+    output = subprocess.run(run_configuration.get_sweep_run_arguments(numpy.float64(0.0), numpy.float64(20.0), 41), capture_output=True, text=True).stdout
+    truncated_output = '\n'.join(output.splitlines()[:-5])
+
+    with pytest.raises(ValueError):
+        QpropThrustSolver.parse_sweep(truncated_output, (QpropColumn.THRUST,), numpy.float64(0.0), numpy.float64(20.0), 41)
+
+def test_table_runs_one_sweep_per_range(run_configuration, thrust_cache, qprop_calls):
+    thrust_table = ThrustTable.build(run_configuration, thrust_cache, 4, 100, None)
+
+    assert qprop_calls() == 4
+    assert thrust_table.velocities[0] == 0.0
+    assert thrust_table.velocities[-1] == pytest.approx(ThrustTable.get_velocity_bound(run_configuration), abs=1e-4)
+    assert numpy.all(numpy.diff(thrust_table.velocities) > 0)
+
+def test_table_matches_cache_and_falls_back_beyond_its_range(run_configuration, thrust_cache, qprop_calls):
+    thrust_table = ThrustTable.build(run_configuration, thrust_cache, 4, 100, None)
+    velocities = numpy.linspace(0.0, thrust_table.velocities[-1], 13)
+
+    numpy.testing.assert_allclose(thrust_table.get_thrusts(run_configuration, velocities), thrust_cache.get_thrusts(run_configuration, velocities), atol=1e-3)
+
+    beyond_velocity = thrust_table.velocities[-1] + 1.0
+    n_calls = qprop_calls()
+    assert thrust_table.get_thrust(run_configuration, beyond_velocity) == pytest.approx(get_fake_thrust(beyond_velocity), abs=1e-3)
+    assert qprop_calls() == n_calls + 1
+
+def test_table_and_cache_find_the_same_mtom(make_run_configuration):
+    mtoms = dict()
+    for thrust_source in (ThrustSource.CACHE, ThrustSource.TABLE):
+        optimizer = MaximumTakeOffMassOptimizer(
+            1,
+            OptimizerSettings(
+                velocity_quantum=numpy.float64(0.01),
+                thrust_source=thrust_source,
+                simulation_engine=SimulationEngine.VECTORIZED,
+                masses_per_epoch=8,
+                summary_trajectories=True,
+                refresh_rate=0,
+                plot_results=False
+            )
+        )
+        try:
+            _, optimal_dynamics_model = optimizer.run(make_run_configuration(takeoff_displacement=20.0, arithmetic_precision=2))
+        finally:
+            optimizer.close()
+        mtoms[thrust_source] = round(float(optimal_dynamics_model.mass), 2)
+
+    assert mtoms[ThrustSource.CACHE] == mtoms[ThrustSource.TABLE]
@@ -0,0 +1,83 @@
+import pytest
+import numpy
+import os
+
+from components.ThrustCache import ThrustCache
+from components.ThrustTable import ThrustTable
+from components.ThrustTableStore import ThrustTableStore
+from conftest import run_optimizer
+
+def test_stored_table_is_reused_without_qprop(run_configuration, thrust_cache, tmp_path, qprop_calls):
+    store = ThrustTableStore(tmp_path / 'store', 2**20)
+    thrust_table = ThrustTable.build(run_configuration, thrust_cache, 4, 100, store)
+    n_calls = qprop_calls()
+
+    stored_table = ThrustTable.build(run_configuration, thrust_cache, 4, 100, store)
+
+    assert qprop_calls() == n_calls
+    numpy.testing.assert_array_equal(stored_table.velocities, thrust_table.velocities)
+    numpy.testing.assert_array_equal(stored_table.thrusts, thrust_table.thrusts)
+
+def test_key_depends_on_setpoint_and_sweeps(make_run_configuration, tmp_path):
+    store = ThrustTableStore(tmp_path, 2**20)
+    run_configuration = make_run_configuration()
+    low_voltage = make_run_configuration(setpoint_parameters={**run_configuration.json_data['setpoint_parameters'], 'voltage': 7.4})
+    key = store.get_key(run_configuration, 4, 100)
+
+    assert key == store.get_key(make_run_configuration(mass_range=[0.5, 1.5], takeoff_displacement=50.0), 4, 100)
+    assert key != store.get_key(low_voltage, 4, 100)
+    assert key != store.get_key(run_configuration, 4, 50)
+
+def test_table_short_of_the_velocity_bound_is_not_loaded(tmp_path):
+    store = ThrustTableStore(tmp_path, 2**20)
+    store.save('short', numpy.linspace(0.0, 10.0, 11), numpy.ones(11))
+
+    assert store.load('short', numpy.float64(20.0)) is None
+    assert store.load('short', numpy.float64(10.0)) is not None
+    assert store.load('missing', numpy.float64(10.0)) is None
+
+def test_least_recently_used_tables_are_evicted(tmp_path):
+    velocities = numpy.linspace(0.0, 10.0, 1000)
+    table_size = velocities.nbytes * 2
+    store = ThrustTableStore(tmp_path, int(2.5 * table_size))
+
+    for i, key in enumerate(('oldest', 'used', 'newest')):
+        store.save(key, velocities, numpy.ones_like(velocities))
+        os.utime(store.get_path(key), (i, i))
+        if key == 'used':
+            assert store.load('oldest', numpy.float64(10.0)) is not None
+
+    assert store.get_path('oldest').exists()
+    assert not store.get_path('used').exists()
+    assert store.get_path('newest').exists()
+
+def test_store_size_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        ThrustTableStore(tmp_path, 0)
+
+def test_cached_thrusts_are_reused_by_a_new_cache(run_configuration, make_run_configuration, thrust_cache_manager, thrust_cache, tmp_path, qprop_calls):
+    store = ThrustTableStore(tmp_path, 2**20)
+    velocities = numpy.array([0.0, 2.5, 7.1234, 12.0])
+    thrusts = thrust_cache.get_thrusts(run_configuration, velocities)
+    low_voltage = make_run_configuration(setpoint_parameters={**run_configuration.json_data['setpoint_parameters'], 'voltage': 7.4})
+    thrust_cache.get_thrust(low_voltage, numpy.float64(1.0))
+    n_calls = qprop_calls()
+
+    assert thrust_cache.save(run_configuration, store) == velocities.size
+    stored_cache = ThrustCache(thrust_cache_manager, numpy.float64(0.001))
+    assert stored_cache.load(run_configuration, store) == velocities.size
+    numpy.testing.assert_array_equal(stored_cache.get_thrusts(run_configuration, velocities), thrusts)
+    assert qprop_calls() == n_calls
+    assert ThrustCache(thrust_cache_manager, numpy.float64(0.01)).load(run_configuration, store) == 0
+
+def test_repeated_default_run_needs_no_qprop(make_run_configuration, thrust_cache_manager, tmp_path, qprop_calls):
+    run_configuration = make_run_configuration(timestep_size=0.5, takeoff_displacement=5.0)
+    store = ThrustTableStore(tmp_path, 2**20)
+    _, state, dynamics_model = run_optimizer(run_configuration, ThrustCache(thrust_cache_manager, numpy.float64(0.001)), thrust_table_store=store)
+    n_calls = qprop_calls()
+    _, stored_state, stored_model = run_optimizer(run_configuration, ThrustCache(thrust_cache_manager, numpy.float64(0.001)), thrust_table_store=store)
+
+    assert n_calls > 0
+    assert qprop_calls() == n_calls
+    assert stored_state == state
+    assert stored_model.mass == dynamics_model.mass
@@ -0,0 +1,52 @@
+import logging
+import pytest
+import re
+
+from components.OptimizerSettings import OptimizerSettings
+from components.utils.result_states import ResultState
+from conftest import run_optimizer
+
+LEVEL_MTOM = re.compile(r'LEVEL_MTOM = ([\d.]+) kg(?: \| ESTIMATED_DISCRETIZATION_ERROR = ([\d.]+) kg)?')
+
+@pytest.fixture
+def rk4_configuration(make_run_configuration):
+    return make_run_configuration(integration={'method': 'rk4', 'tolerance': None})
+
+def test_levels_find_the_configured_timestep_mtom(rk4_configuration, thrust_cache, thrust_table):
+    _, state, dynamics_model = run_optimizer(rk4_configuration, thrust_cache, thrust_table)
+    levels_optimizer, levels_state, levels_model = run_optimizer(rk4_configuration, thrust_cache, thrust_table, timestep_levels=3)
+
+    assert state == levels_state == ResultState.MTOM_FOUND
+    assert abs(float(levels_model.mass) - float(dynamics_model.mass)) <= 0.001
+    assert levels_optimizer.discretization_error <= 0.0005
+    assert levels_optimizer.timestep_size >= rk4_configuration.timestep_size
+
+def test_richardson_estimate_divides_consecutive_level_differences(rk4_configuration, thrust_cache, thrust_table, caplog):
+    with caplog.at_level(logging.INFO):
+        optimizer, _, _ = run_optimizer(rk4_configuration, thrust_cache, thrust_table, timestep_levels=3)
+    levels = [LEVEL_MTOM.search(record.getMessage()).groups() for record in caplog.records if LEVEL_MTOM.search(record.getMessage())]
+
+    assert levels[0][1] is None
+    for (previous_mtom, _), (mtom, estimate) in zip(levels, levels[1:]):
+        assert float(estimate) == pytest.approx(abs(float(mtom)-float(previous_mtom)) / (2**4-1), abs=1e-4)
+    assert float(levels[-1][1]) == pytest.approx(optimizer.discretization_error, abs=1e-4)
+
+def test_result_document_reports_the_estimate_only_with_levels(rk4_configuration, thrust_cache, thrust_table):
+    optimizer, state, dynamics_model = run_optimizer(rk4_configuration, thrust_cache, thrust_table)
+    levels_optimizer, levels_state, levels_model = run_optimizer(rk4_configuration, thrust_cache, thrust_table, timestep_levels=2)
+    result_document = optimizer.get_result_document(rk4_configuration, state, dynamics_model)
+    levels_document = levels_optimizer.get_result_document(rk4_configuration, levels_state, levels_model)
+
+    assert 'estimated_discretization_error' not in result_document
+    assert levels_document['estimated_discretization_error'] == pytest.approx(float(levels_optimizer.discretization_error))
+    assert levels_document['timestep_size'] == pytest.approx(levels_optimizer.timestep_size)
+
+def test_levels_report_a_mass_lowerbound_beyond_the_mtom(make_run_configuration, thrust_cache, thrust_table):
+    _, state, dynamics_model = run_optimizer(make_run_configuration(mass_range=[1.5, 2.0]), thrust_cache, thrust_table, timestep_levels=2)
+
+    assert state == ResultState.MASS_LOWERBOUND_BEYOND_MTOM
+    assert dynamics_model is None
+
+def test_timestep_levels_cannot_be_negative():
+    with pytest.raises(ValueError):
+        OptimizerSettings(timestep_levels=-1)
@@ -0,0 +1,61 @@
+from multiprocessing import shared_memory
+import numpy
+
+from components.TrajectoryBuffer import TrajectoryBuffer
+from conftest import simulate_mass
+
+def test_buffer_grows_without_losing_rows():
+    trajectory = TrajectoryBuffer(4)
+    try:
+        trajectory.reset(0.0, 0.0, 0.0)
+        for step in range(1, 10):
+            trajectory.append(step, 2*step, 3*step, 1.0, 2.0, 3.0)
+        handle = trajectory.get_handle(numpy.float64(1.0), numpy.float64(5.0), False, False, False)
+        dynamics_model = TrajectoryBuffer.get_model(trajectory.shared_memory, handle)
+    finally:
+        trajectory.close()
+
+    assert trajectory.capacity == 16
+    numpy.testing.assert_array_equal(dynamics_model.time, numpy.arange(10))
+    numpy.testing.assert_array_equal(dynamics_model.position, 3*numpy.arange(10))
+    numpy.testing.assert_array_equal(dynamics_model.thrust, numpy.full(9, 2.0))
+
+def test_summary_keeps_only_the_last_two_rows():
+    trajectory = TrajectoryBuffer(4)
+    try:
+        trajectory.reset(0.0, 0.0, 0.0, summary_only=True)
+        for step in range(1, 10):
+            trajectory.append(step, 2*step, 3*step, step, step, step)
+        dynamics_model = TrajectoryBuffer.get_model(trajectory.shared_memory, trajectory.get_handle(numpy.float64(1.0), numpy.float64(5.0), False, False, False))
+    finally:
+        trajectory.close()
+
+    assert trajectory.capacity == 4
+    assert dynamics_model.summary_only
+    numpy.testing.assert_array_equal(dynamics_model.time, [8, 9])
+    numpy.testing.assert_array_equal(dynamics_model.acceleration, [9])
+
+def test_grown_memory_is_readable_by_name():
+    trajectory = TrajectoryBuffer(2)
+    try:
+        trajectory.reset(0.0, 0.0, 0.0)
+        for step in range(1, 5):
+            trajectory.append(step, step, step, step, step, step)
+        handle = trajectory.get_handle(numpy.float64(1.0), numpy.float64(5.0), False, False, False)
+        memory = shared_memory.SharedMemory(name=handle[0])
+        try:
+            dynamics_model = TrajectoryBuffer.get_model(memory, handle)
+        finally:
+            memory.close()
+    finally:
+        trajectory.close()
+
+    numpy.testing.assert_array_equal(dynamics_model.velocity, numpy.arange(5))
+
+def test_small_buffer_matches_the_default_buffer(run_configuration, thrust_table):
+    dynamics_model = simulate_mass(run_configuration, numpy.float64(1.0), thrust_table)
+    grown_model = simulate_mass(run_configuration, numpy.float64(1.0), thrust_table, capacity=2)
+
+    assert dynamics_model.time.size > 2
+    numpy.testing.assert_array_equal(grown_model.position, dynamics_model.position)
+    numpy.testing.assert_array_equal(grown_model.drag, dynamics_model.drag)
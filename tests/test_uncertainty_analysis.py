@@ -0,0 +1,58 @@
+import pytest
+import numpy
+
+from components.UncertaintyAnalysis import UncertaintyAnalysis
+from components.MaximumTakeOffMassOptimizer import MaximumTakeOffMassOptimizer
+from components.OptimizerSettings import OptimizerSettings
+from conftest import run_optimizer
+
+RK4 = {'method': 'rk4', 'tolerance': None}
+
+def get_uncertainty(**spreads) -> dict:
+    return {'samples': 4, 'seed': 7, 'distribution': None, 'fluid_density': None, 'drag_coefficient': None, 'reference_area': None, 'lift_coefficient': None, **spreads}
+
+def test_ensemble_is_seeded_and_positive(make_run_configuration):
+    run_configuration = make_run_configuration(uncertainty=get_uncertainty(samples=1000, drag_coefficient=0.1, distribution='uniform'))
+    ensemble_configuration = UncertaintyAnalysis.get_ensemble_configuration(run_configuration)
+    drag_coefficients = ensemble_configuration.aerodynamic_forces_drag_coefficient
+
+    assert drag_coefficients.shape == (1000,)
+    assert numpy.all(drag_coefficients > 0) and numpy.all(drag_coefficients <= 0.2)
+    numpy.testing.assert_array_equal(UncertaintyAnalysis.get_ensemble_configuration(run_configuration).aerodynamic_forces_drag_coefficient, drag_coefficients)
+    assert numpy.ndim(ensemble_configuration.aerodynamic_forces_lift_coefficient) == 0
+
+def test_sample_mtoms_match_single_runs(make_run_configuration, thrust_cache, thrust_table):
+    ensemble_configuration = UncertaintyAnalysis.get_ensemble_configuration(make_run_configuration(integration=RK4, uncertainty=get_uncertainty(drag_coefficient=0.05)))
+    mtoms, local_mtoms = UncertaintyAnalysis.get_mtoms(ensemble_configuration, thrust_table)
+
+    assert not local_mtoms.any()
+    for drag_coefficient, mtom in zip(ensemble_configuration.aerodynamic_forces_drag_coefficient, mtoms):
+        run_configuration = make_run_configuration(integration=RK4, aerodynamic_forces={**ensemble_configuration.json_data['aerodynamic_forces'], 'drag_coefficient': float(drag_coefficient)})
+        _, _, optimal_dynamics_model = run_optimizer(run_configuration, thrust_cache, thrust_table)
+        assert mtom == pytest.approx(optimal_dynamics_model.mass, abs=1e-9)
+
+def test_samples_beyond_the_mass_range_are_flagged(make_run_configuration, thrust_table):
+    ensemble_configuration = UncertaintyAnalysis.get_ensemble_configuration(make_run_configuration(mass_range=[0.1, 0.5], uncertainty=get_uncertainty(drag_coefficient=0.05)))
+    mtoms, local_mtoms = UncertaintyAnalysis.get_mtoms(ensemble_configuration, thrust_table)
+
+    assert local_mtoms.all()
+    numpy.testing.assert_allclose(mtoms, 0.5)
+
+    ensemble_configuration = UncertaintyAnalysis.get_ensemble_configuration(make_run_configuration(mass_range=[1.5, 2.0], uncertainty=get_uncertainty(drag_coefficient=0.05)))
+    assert numpy.isnan(UncertaintyAnalysis.get_mtoms(ensemble_configuration, thrust_table)[0]).all()
+
+def test_negative_spreads_are_rejected(make_run_configuration):
+    with pytest.raises(ValueError):
+        make_run_configuration(uncertainty=get_uncertainty(drag_coefficient=-0.05))
+
+def test_default_settings_share_a_thrust_table(make_run_configuration, thrust_cache, qprop_calls):
+    run_configuration = make_run_configuration(uncertainty=get_uncertainty(samples=50, drag_coefficient=0.05))
+    optimizer = MaximumTakeOffMassOptimizer(1, OptimizerSettings(plot_results=False, refresh_rate=0), thrust_cache)
+    try:
+        mtoms = optimizer.run_uncertainty_analysis(run_configuration)
+    finally:
+        optimizer.close()
+
+    assert mtoms.shape == (50,)
+    assert numpy.isfinite(mtoms).all()
+    assert qprop_calls() == OptimizerSettings().sweep_count
@@ -0,0 +1,38 @@
+import pytest
+import numpy
+
+from components.VectorizedDynamicsSimulation import VectorizedDynamicsSimulation
+from components.utils.integration_methods import IntegrationMethod
+from conftest import simulate_mass
+
+MASSES = numpy.array([0.4, 1.0, 1.3, 1.9])
+
+@pytest.mark.parametrize('integration_method', [IntegrationMethod.EULER, IntegrationMethod.RK4, IntegrationMethod.RK45])
+def test_lockstep_matches_one_mass_at_a_time(make_run_configuration, thrust_table, integration_method):
+    run_configuration = make_run_configuration(integration={'method': integration_method.value, 'tolerance': None})
+    dynamics_models = VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, MASSES, thrust_table)
+
+    for mass, dynamics_model in zip(MASSES, dynamics_models):
+        process_model = simulate_mass(run_configuration, mass, thrust_table)
+        assert dynamics_model.mass == mass
+        assert dynamics_model.is_takeoff_successful() == process_model.is_takeoff_successful()
+        numpy.testing.assert_allclose(dynamics_model.time, process_model.time, rtol=1e-9)
+        numpy.testing.assert_allclose(dynamics_model.velocity, process_model.velocity, rtol=1e-9)
+        numpy.testing.assert_allclose(dynamics_model.position, process_model.position, rtol=1e-9)
+
+def test_outcomes_match_full_trajectories(run_configuration, thrust_table):
+    outcomes = VectorizedDynamicsSimulation.get_takeoff_outcomes(run_configuration, MASSES, thrust_table)
+    dynamics_models = VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, MASSES, thrust_table)
+
+    assert outcomes.tolist() == [dynamics_model.is_takeoff_successful() for dynamics_model in dynamics_models]
+    assert outcomes[0] and not outcomes[-1]
+
+def test_summary_keeps_the_last_two_states(run_configuration, thrust_table):
+    dynamics_models = VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, MASSES, thrust_table)
+    summary_models = VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, MASSES, thrust_table, summary_only=True)
+
+    for dynamics_model, summary_model in zip(dynamics_models, summary_models):
+        assert summary_model.summary_only
+        numpy.testing.assert_array_equal(summary_model.time, dynamics_model.time[-2:])
+        numpy.testing.assert_array_equal(summary_model.velocity, dynamics_model.velocity[-2:])
+        numpy.testing.assert_array_equal(summary_model.thrust, dynamics_model.thrust[-1:])
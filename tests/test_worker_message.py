@@ -0,0 +1,112 @@
+from multiprocessing.connection import Client
+import multiprocessing
+import signal
+import socket
+import pickle
+import sys
+import pytest
+import numpy
+
+from components.WorkerMessage import WorkerMessage
+from components.WorkerDaemon import WorkerDaemon
+from components.ThrustTable import ThrustTable
+from components.ThrustSurrogate import ThrustSurrogate
+from components.ThrustGrid import ThrustGrid
+from components.VectorizedDynamicsSimulation import VectorizedDynamicsSimulation
+from components.utils.thrust_sources import ThrustSource
+from components.utils.worker_transports import WorkerTransport
+from components.utils.simulation_engines import SimulationEngine
+from conftest import run_optimizer
+
+AUTHKEY = b'test-key'
+
+def serve(address: tuple[str, int]) -> None:
+    worker_daemon = WorkerDaemon(address, AUTHKEY, 4)
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+    try:
+        worker_daemon.serve_forever()
+    finally:
+        worker_daemon.close()
+
+@pytest.fixture
+def daemon_address():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        address = probe.getsockname()
+    daemon = multiprocessing.Process(target=serve, args=(address,))
+    daemon.start()
+    yield address
+    daemon.terminate()
+    daemon.join()
+
+def connect(address: tuple[str, int]):
+    for _ in range(200):
+        try:
+            return Client(address, authkey=AUTHKEY)
+        except ConnectionRefusedError:
+            multiprocessing.Event().wait(0.05)
+    raise ConnectionError(f'worker daemon at {address} did not start')
+
+def test_messages_round_trip_as_json():
+    sending_connection, receiving_connection = multiprocessing.Pipe()
+    WorkerMessage.send(sending_connection, ['simulate', 3, 1.25])
+    WorkerMessage.send(sending_connection, None)
+
+    assert WorkerMessage.receive(receiving_connection) == ['simulate', 3, 1.25]
+    assert WorkerMessage.receive(receiving_connection) is None
+
+@pytest.mark.parametrize('payload', [pickle.dumps(['simulate', 3, 1.25]), b'{"simulate": 3}', b'[]', b'[3, 1.25]'])
+def test_pickles_and_malformed_messages_are_rejected(payload):
+    sending_connection, receiving_connection = multiprocessing.Pipe()
+    sending_connection.send_bytes(payload)
+
+    with pytest.raises(ValueError):
+        WorkerMessage.receive(receiving_connection)
+
+def test_thrust_models_are_rebuilt_from_whitelisted_types(make_run_configuration):
+    run_configuration = make_run_configuration()
+    time_profile_configuration = make_run_configuration(voltage_profile={'variable': 'time', 'breakpoints': [0.0, 10.0], 'voltages': [8.4, 7.4]})
+
+    assert WorkerMessage.get_thrust_model_type(ThrustSource.CACHE, run_configuration) is None
+    assert WorkerMessage.get_thrust_model_type(ThrustSource.TABLE, run_configuration) is ThrustTable
+    assert WorkerMessage.get_thrust_model_type(ThrustSource.SURROGATE, run_configuration) is ThrustSurrogate
+    assert WorkerMessage.get_thrust_model_type(ThrustSource.TABLE, time_profile_configuration) is ThrustGrid
+    with pytest.raises(ValueError):
+        ThrustSource('builtins.eval')
+    with pytest.raises(ValueError):
+        WorkerMessage.get_thrust_arrays(ThrustTable, [[0.0, 1.0]])
+
+def test_configure_message_rebuilds_the_run(run_configuration, thrust_table):
+    refined_configuration = run_configuration.get_refinement(numpy.float64(0.05), (numpy.float64(1.0), numpy.float64(1.5)))
+    _, identifier, document, thrust_specification, terminate_early, summary_only = WorkerMessage.get_configure_message(refined_configuration, thrust_table, True, False)
+    received_configuration = WorkerMessage.get_run_configuration(identifier, document)
+    received_table = ThrustTable(*WorkerMessage.get_thrust_arrays(ThrustTable, thrust_specification['arrays']), thrust_table.fallback)
+
+    assert received_configuration.timestep_size == 0.05
+    assert received_configuration.mass_range == (1.0, 1.5)
+    assert thrust_specification['source'] == 'table' and terminate_early and not summary_only
+    numpy.testing.assert_array_equal(received_table.thrusts, thrust_table.thrusts)
+
+def test_result_message_rebuilds_the_dynamics_model(run_configuration, thrust_table):
+    dynamics_model = VectorizedDynamicsSimulation.simulate_dynamics_given_masses(run_configuration, numpy.array([1.0]), thrust_table)[0]
+    _, task_id, columns = WorkerMessage.get_result_message(7, dynamics_model)
+    received_model = WorkerMessage.get_dynamics_model(columns)
+
+    assert task_id == 7
+    assert received_model.mass == dynamics_model.mass
+    numpy.testing.assert_array_equal(received_model.velocity, dynamics_model.velocity)
+    assert WorkerMessage.get_dynamics_model(None) is None
+    with pytest.raises(TypeError):
+        WorkerMessage.get_dynamics_model([1.0])
+
+def test_daemon_survives_a_pickled_message(daemon_address, run_configuration, thrust_cache, thrust_table):
+    with connect(daemon_address) as connection:
+        assert WorkerMessage.receive(connection) == ['hello', 4]
+        connection.send(['configure', 'example', {}, {}, False, False])
+        with pytest.raises(EOFError):
+            connection.recv_bytes()
+
+    _, _, socket_model = run_optimizer(run_configuration, thrust_cache, thrust_table, simulation_engine=SimulationEngine.PROCESS, worker_transport=WorkerTransport.SOCKET, worker_addresses=(daemon_address,), worker_authkey=AUTHKEY)
+    _, _, vectorized_model = run_optimizer(run_configuration, thrust_cache, thrust_table, masses_per_epoch=4)
+
+    assert socket_model.mass == vectorized_model.mass
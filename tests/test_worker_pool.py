@@ -0,0 +1,59 @@
+import dataclasses
+import pytest
+import numpy
+
+from components.WorkerPool import WorkerPool
+from components.OptimizerSettings import OptimizerSettings
+from components.utils.simulation_engines import SimulationEngine
+from conftest import simulate_mass, run_optimizer
+
+def collect_epoch(worker_pool: WorkerPool, epoch_id: int, n_masses: int) -> dict:
+    dynamics_models = dict()
+    while len(dynamics_models) < n_masses:
+        result = worker_pool.get_result(timeout=10)
+        assert result is not None
+        result_epoch_id, worker_index, dynamics_model = result
+        if result_epoch_id == epoch_id:
+            dynamics_models[worker_index] = dynamics_model
+    return dynamics_models
+
+@pytest.fixture
+def worker_pool():
+    worker_pool = WorkerPool(2)
+    yield worker_pool
+    worker_pool.close()
+
+def test_workers_persist_across_epochs(worker_pool, run_configuration, thrust_table):
+    process_ids = [worker.pid for worker in worker_pool.workers]
+    worker_pool.configure(run_configuration, thrust_table, False)
+
+    for MASS_SPACE in (numpy.array([0.4, 1.9]), numpy.array([1.0, 1.3])):
+        dynamics_models = collect_epoch(worker_pool, worker_pool.submit(MASS_SPACE), len(MASS_SPACE))
+        for i, mass in enumerate(MASS_SPACE):
+            numpy.testing.assert_array_equal(dynamics_models[i].velocity, simulate_mass(run_configuration, mass, thrust_table).velocity)
+
+    assert [worker.pid for worker in worker_pool.workers] == process_ids
+    assert all(worker.is_alive() for worker in worker_pool.workers)
+
+def test_pool_rejects_more_masses_than_workers(worker_pool):
+    with pytest.raises(ValueError):
+        worker_pool.submit(numpy.array([0.4, 1.0, 1.9]))
+
+def test_pool_requires_a_worker():
+    with pytest.raises(ValueError):
+        WorkerPool(0)
+
+def test_process_engine_finds_the_vectorized_mtom(run_configuration, thrust_cache, thrust_table):
+    _, _, process_model = run_optimizer(run_configuration, thrust_cache, thrust_table, n_processes=4, simulation_engine=SimulationEngine.PROCESS)
+    _, _, vectorized_model = run_optimizer(run_configuration, thrust_cache, thrust_table, masses_per_epoch=4)
+
+    assert process_model.mass == vectorized_model.mass
+
+@pytest.mark.parametrize('settings', [{'timestep_levels': -1}, {'refresh_rate': -1.0}])
+def test_settings_reject_negative_values(settings):
+    with pytest.raises(ValueError):
+        OptimizerSettings(**settings)
+
+def test_settings_are_immutable():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        OptimizerSettings().masses_per_epoch = 8
@@ -0,0 +1,47 @@
+import multiprocessing
+import numpy
+
+from components.WorkerTelemetry import WorkerTelemetry
+from components.utils.process_statuses import ProcessStatus
+
+N_UPDATES = 20000
+
+def write_updates(telemetry: WorkerTelemetry) -> None:
+    for step in range(1, N_UPDATES+1):
+        telemetry.update(1, step, step, step, step, step, step)
+
+def test_update_is_read_back_with_an_even_version():
+    telemetry = WorkerTelemetry(2)
+    telemetry.reset(1, ProcessStatus.FORKING_PROCESS)
+    telemetry.update(1, 0.5, 1.0, 2.0, 3.0, 4.0, 5.0)
+    telemetry.set_status(1, ProcessStatus.CHECKING_LIMITS)
+
+    record = telemetry.read(1)
+    assert int(record['version']) % 2 == 0
+    assert int(record['steps']) == 1
+    assert ProcessStatus.get(int(record['status'])) == ProcessStatus.CHECKING_LIMITS
+    assert [float(record[field]) for field in ('time', 'position', 'velocity', 'acceleration', 'thrust', 'drag')] == [0.5, 1.0, 2.0, 3.0, 4.0, 5.0]
+    assert int(telemetry.read(0)['steps']) == 0
+
+def test_reads_never_see_a_torn_update(monkeypatch):
+    monkeypatch.setattr(WorkerTelemetry, 'MAXIMUM_READ_ATTEMPTS', 10**6)
+    telemetry = WorkerTelemetry(2)
+    writer = multiprocessing.Process(target=write_updates, args=(telemetry,))
+    writer.start()
+
+    snapshots = list()
+    while writer.is_alive():
+        snapshots.append(telemetry.read(1))
+    writer.join()
+
+    assert writer.exitcode == 0
+    for snapshot in snapshots:
+        assert int(snapshot['version']) % 2 == 0
+        numpy.testing.assert_array_equal([snapshot[field] for field in ('time', 'position', 'velocity', 'acceleration', 'thrust', 'drag')], float(snapshot['steps']))
+    assert int(telemetry.read(1)['steps']) == N_UPDATES
+
+def test_unfinished_update_falls_back_to_a_copy():
+    telemetry = WorkerTelemetry(1)
+    telemetry.records['version'][0] = 1
+
+    assert int(telemetry.read(0)['version']) == 1
@@ -0,0 +1,49 @@
+import argparse
+import pathlib
+import logging
+import timeit
+import sys
+import io
+import numpy
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from components.QpropOutputParser import QpropOutputParser
+from components.utils.qprop_columns import QpropColumn
+
+HEADER_LINES = 17
+
+def get_qprop_output(n_rows: int) -> str:
+    lines = [' '] + [f' #  QPROP output header line {i}' for i in range(HEADER_LINES-2)]
+    lines.append(' #  ' + '  '.join(column.value for column in QpropColumn))
+    for i in range(n_rows):
+        velocity = 20.0 * i / max(n_rows-1, 1)
+        lines.append(' ' + ' '.join(f'{value:10.4f}' for value in [velocity, 8000.0, 0.0, 5.0-0.01*velocity**2, 0.12, 100.0, 8.4, 14.0, 0.8, 0.6, 0.1, 0.1, 0.05, 1.0, 0.5, 117.6, 60.0, 0.5, 0.02]))
+    return '\n'.join(lines) + '\n'
+
+def parse_with_loadtxt(output: str) -> numpy.ndarray[numpy.float64]:
+    data = numpy.loadtxt(io.StringIO(output), skiprows=HEADER_LINES, ndmin=2)
+    return data[:, [0, 3]]
+
+def parse_with_parser(output: str, n_rows: int) -> numpy.ndarray[numpy.float64]:
+    return QpropOutputParser.parse(output, (QpropColumn.VELOCITY, QpropColumn.THRUST), n_rows)
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    
+    argparser = argparse.ArgumentParser(add_help=False)
+    argparser.add_argument('-n', '--rows', type=int, nargs='+', default=[1, 25, 100, 400], help='Amounts of QPROP output rows benchmarked')
+    argparser.add_argument('-r', '--repeats', type=int, default=2000, help='Amount of parses timed per approach and amount of rows')
+    args = argparser.parse_args()
+    
+    for n_rows in args.rows:
+        output = get_qprop_output(n_rows)
+        if not numpy.array_equal(parse_with_loadtxt(output), parse_with_parser(output, n_rows)):
+            raise RuntimeError(f'parsers disagree on QPROP output of {n_rows} row(s)')
+        
+        loadtxt_time = min(timeit.repeat(lambda: parse_with_loadtxt(output), number=args.repeats, repeat=3)) / args.repeats
+        parser_time = min(timeit.repeat(lambda: parse_with_parser(output, n_rows), number=args.repeats, repeat=3)) / args.repeats
+        logging.info(f'ROWS = {n_rows} | LOADTXT = {1e6*loadtxt_time:.1f} us | PARSER = {1e6*parser_time:.1f} us | SPEEDUP = {loadtxt_time/parser_time:.1f}x')
+
+if __name__ == '__main__':
+    main()